@@ -0,0 +1,107 @@
+"""
+Step many headless matches with BatchMatches and compare with the scalar Match path.
+
+    python -m benchmarks.bench_batch_physics [--matches 1000] [--ticks 600] [--verify 50]
+"""
+import argparse
+import random
+import time
+import numpy as np
+from models.batch_physics import BatchMatches
+from models.controls import ATTACK
+from models.match import create_match
+
+
+def random_masks(rng, matches, ticks):
+    """
+    One random action bitmask per fighter and tick, biased towards attacking.
+    """
+    masks = rng.integers(0, 64, size=(ticks, matches, 2), dtype=np.int64)
+    return masks | (rng.random(masks.shape) < 0.5) * ATTACK
+
+
+def make_matches(count, seed):
+    """
+    Matches with the fighters spawned at random spots, so that many of them actually fight.
+    """
+    rng = random.Random(seed)
+    matches = []
+    for _ in range(count):
+        match = create_match()
+        spawn = rng.randrange(100, 1100)
+        for player in match.players:
+            player.rect.x = spawn + rng.randrange(-60, 60)
+        matches.append(match)
+    return matches
+
+
+def scalar_state(match):
+    return [(player.rect.x, player.rect.y, float(player.y_velocity), bool(player.on_ground), player.health,
+             bool(player.facing_left), bool(player.is_attacking), player.last_attack_time)
+            for player in match.players] + [match.winner or 0, match.tick]
+
+
+def batch_state(batch, index):
+    state = []
+    for fighter in (2 * index, 2 * index + 1):
+        state.append((int(batch.x[fighter]), int(batch.y[fighter]), float(batch.y_velocity[fighter]),
+                      bool(batch.on_ground[fighter]), int(batch.health[fighter]),
+                      bool(batch.facing_left[fighter]), bool(batch.is_attacking[fighter]),
+                      int(batch.last_attack_time[fighter])))
+    return state + [int(batch.winner[index]), int(batch.ticks[index])]
+
+
+def verify(matches, ticks, seed):
+    """
+    Run the scalar and batched paths side by side and compare the full state every tick.
+    """
+    rng = np.random.default_rng(seed)
+    scalar = make_matches(matches, seed)
+    batch = BatchMatches(make_matches(matches, seed))
+    masks = random_masks(rng, matches, ticks)
+    for tick in range(ticks):
+        for index, match in enumerate(scalar):
+            match.step(masks[tick, index].tolist())
+        batch.step(masks[tick])
+        for index, match in enumerate(scalar):
+            if scalar_state(match) != batch_state(batch, index):
+                raise AssertionError(f"match {index} diverged at tick {tick}: "
+                                     f"{scalar_state(match)} != {batch_state(batch, index)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--verify", type=int, default=50, help="matches checked against the scalar path (0 = skip)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.verify:
+        verify(args.verify, args.ticks, args.seed)
+        print(f"verified {args.verify} matches x {args.ticks} ticks against Match.step")
+
+    rng = np.random.default_rng(args.seed)
+    masks = random_masks(rng, args.matches, args.ticks)
+
+    scalar_count = min(args.matches, 50)
+    scalar = make_matches(scalar_count, args.seed)
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        for index, match in enumerate(scalar):
+            match.step(masks[tick, index].tolist())
+    scalar_rate = scalar_count * args.ticks / (time.perf_counter() - start)
+
+    batch = BatchMatches(make_matches(args.matches, args.seed))
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        batch.step(masks[tick])
+    batch_rate = args.matches * args.ticks / (time.perf_counter() - start)
+
+    print(f"scalar: {scalar_rate:,.0f} match-ticks/s")
+    print(f"batch:  {batch_rate:,.0f} match-ticks/s ({args.matches} matches, {batch_rate / scalar_rate:.1f}x)")
+    print(f"finished: {int((batch.winner != 0).sum())}/{args.matches} matches with a winner")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compare the linear collider scan with the LevelGeometry grid as stages grow.
+
+    python -m benchmarks.bench_level_geometry [--ticks 2000] [--sizes 7 50 200 800]
+"""
+import argparse
+import random
+import time
+import pygame
+from models.DiagonalPlatform import DiagonalPlatform
+from models.match import create_match
+from models import stage
+
+
+def build_stage(size, seed=0):
+    """
+    Default stage plus `size` random floors and as many slopes.
+    """
+    rng = random.Random(seed)
+    colliders = list(stage.colliders)
+    diagonal_platforms = list(stage.diagonal_platforms)
+    for _ in range(size):
+        colliders.append(pygame.Rect(rng.randrange(10, 1200), rng.randrange(100, 700), rng.randrange(20, 200), 20))
+        x1 = rng.randrange(10, 1100)
+        diagonal_platforms.append(DiagonalPlatform(x1, rng.randrange(100, 700), x1 + rng.randrange(40, 160),
+                                                   rng.randrange(100, 700)))
+    return colliders, diagonal_platforms
+
+
+def run(size, ticks, spatial_index):
+    colliders, diagonal_platforms = build_stage(size)
+    match = create_match(colliders=colliders, diagonal_platforms=diagonal_platforms, spatial_index=spatial_index)
+    rng = random.Random(1)
+    inputs = [[rng.getrandbits(6) for _ in match.players] for _ in range(ticks)]
+
+    start = time.perf_counter()
+    for masks in inputs:
+        match.step(masks)
+    elapsed = time.perf_counter() - start
+
+    state = [(tuple(player.rect), player.y_velocity, player.on_ground, player.health) for player in match.players]
+    return elapsed, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 50, 200, 800])
+    args = parser.parse_args()
+
+    print(f"{'colliders':>10} {'linear t/s':>12} {'grid t/s':>12} {'speedup':>8}  same")
+    for size in args.sizes:
+        linear_time, linear_state = run(size, args.ticks, spatial_index=False)
+        grid_time, grid_state = run(size, args.ticks, spatial_index=True)
+        print(f"{len(stage.colliders) + size:>10} {args.ticks / linear_time:>12.0f} {args.ticks / grid_time:>12.0f} "
+              f"{linear_time / grid_time:>8.2f}  {linear_state == grid_state}")
+
+
+if __name__ == "__main__":
+    main()
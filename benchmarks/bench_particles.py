@@ -0,0 +1,98 @@
+"""
+Cost of the particle system (core.particles) with thousands of live particles, on the SDL dummy driver.
+
+    python -m benchmarks.bench_particles [--live 1000 2000 4000 8000] [--frames 300] [--scale 1]
+
+Keeps about `--live` particles alive by triggering bursts of every effect each frame, then times
+update() and draw() per frame against the 16.7 ms budget of a 60 FPS frame. A second, untimed pass
+under tracemalloc reports the memory still allocated after the steady-state frames (it should stay
+near zero: the pool never grows) and the peak of the per-frame temporaries.
+"""
+import argparse
+import itertools
+import os
+import statistics
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+from core.display import LOGICAL_SIZE
+from core.particles import EFFECTS, MAX_PARTICLES, ParticleSystem
+
+
+class Emitter:
+    """
+    Stand-in for a Player: just the rect and facing the listener reads.
+    """
+    def __init__(self, x, y, facing_left):
+        self.rect = pygame.Rect(x, y, 86, 96)
+        self.facing_left = facing_left
+
+
+def run(screen, live, frames, scale):
+    particles = ParticleSystem(scale, capacity=max(MAX_PARTICLES, live * 2), seed=live)
+    emitters = [Emitter(100 + 180 * index, 200 + 50 * (index % 5), index % 2 == 1) for index in range(6)]
+    events = itertools.cycle(itertools.product(EFFECTS, emitters))
+    mean_life = statistics.mean(sum(effect.lifetime) / 2 for effect in EFFECTS.values())
+    per_frame = live / mean_life  # Partículas a emitir por fotograma para sostener `live`
+    mean_burst = statistics.mean(effect.count for effect in EFFECTS.values())
+
+    def frame(owed):
+        owed += per_frame
+        while owed >= mean_burst:
+            particles.trigger(*next(events))
+            owed -= mean_burst
+        screen.fill((0, 0, 0))
+        began = time.perf_counter()
+        particles.update(1)
+        updated = time.perf_counter()
+        particles.draw(screen)
+        drawn = time.perf_counter()
+        return owed, updated - began, drawn - updated
+
+    owed = 0.0
+    for _ in range(60):  # Hasta llegar al régimen estable
+        owed, _, _ = frame(owed)
+
+    update_times, draw_times, counts = [], [], []
+    for _ in range(frames):
+        owed, update, draw = frame(owed)
+        update_times.append(update)
+        draw_times.append(draw)
+        counts.append(particles.count)
+
+    # Memoria en una pasada aparte: tracemalloc ralentiza cada asignación
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(frames):
+        owed, _, _ = frame(owed)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return update_times, draw_times, counts, after - before, peak - before, particles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--live", type=int, nargs="+", default=[1000, 2000, 4000, 8000])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--scale", type=float, default=1)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((round(LOGICAL_SIZE[0] * args.scale), round(LOGICAL_SIZE[1] * args.scale)))
+    print(f"{'target':>7} {'live':>6} {'update ms':>10} {'draw ms':>8} {'p99 ms':>7} {'kept kB':>8} "
+          f"{'peak kB':>8} {'dropped':>8}")
+    for live in args.live:
+        update_times, draw_times, counts, kept, peak, particles = run(screen, live, args.frames, args.scale)
+        totals = sorted(update + draw for update, draw in zip(update_times, draw_times))
+        print(f"{live:>7} {statistics.mean(counts):>6.0f} {statistics.mean(update_times) * 1000:>10.3f} "
+              f"{statistics.mean(draw_times) * 1000:>8.3f} {totals[int(len(totals) * 0.99)] * 1000:>7.3f} "
+              f"{kept / 1024:>8.1f} {peak / 1024:>8.1f} {particles.dropped:>8}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
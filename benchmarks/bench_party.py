@@ -0,0 +1,73 @@
+"""
+Cost of a free-for-all tick as the number of fighters grows.
+
+    python -m benchmarks.bench_party [--ticks 1200] [--sizes 2 4 8 16]
+
+Reports the simulation time per tick with scripted bots, and how long the sort-and-sweep
+broad phase takes compared with testing every attacker against every other fighter.
+"""
+import argparse
+import random
+import time
+import timeit
+from models.bots import create_bot
+from models.combat import attack_hitbox, hurtbox, find_hits
+from models.party import create_party
+
+
+def all_pairs_hits(players):
+    """
+    Reference O(n²) version of models.combat.find_hits.
+    """
+    hits = []
+    for attacker, player in enumerate(players):
+        if player.is_defeated() or not player.is_attacking:
+            continue
+        hitbox = attack_hitbox(player)
+        for target, other in enumerate(players):
+            if target != attacker and not other.is_defeated() and hitbox.colliderect(hurtbox(other)):
+                hits.append((attacker, target))
+    return hits
+
+
+def run(size, ticks):
+    match = create_party(size)
+    bots = [create_bot(("aggressive", "hit-and-run")[index % 2], seed=index) for index in range(size)]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if match.is_over():
+            break
+        match.step([bot.act(match, index) for index, bot in enumerate(bots)])
+    return (time.perf_counter() - start) / max(match.tick, 1)
+
+
+def broad_phase(size, number=2000):
+    match = create_party(size)
+    rng = random.Random(size)
+    for player in match.players:
+        player.rect.x = rng.randrange(10, 1180)
+        player.is_attacking = rng.random() < 0.5
+        player.facing_left = rng.random() < 0.5
+    players = match.players
+    if sorted(find_hits(players)) != sorted(all_pairs_hits(players)):
+        raise AssertionError(f"sort-and-sweep and all-pairs disagree with {size} fighters")
+    sweep = min(timeit.repeat(lambda: find_hits(players), repeat=5, number=number)) / number
+    pairs = min(timeit.repeat(lambda: all_pairs_hits(players), repeat=5, number=number)) / number
+    return sweep, pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=1200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 4, 8, 16])
+    args = parser.parse_args()
+
+    print(f"{'fighters':>8} {'ms/tick':>8} {'sweep us':>9} {'pairs us':>9}")
+    for size in args.sizes:
+        tick = run(size, args.ticks)
+        sweep, pairs = broad_phase(size)
+        print(f"{size:>8} {tick * 1000:>8.3f} {sweep * 1e6:>9.1f} {pairs * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
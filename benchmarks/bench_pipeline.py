@@ -0,0 +1,89 @@
+"""
+Tick timing and input latency of the threaded simulation (core.pipeline) while the render thread stalls.
+
+    python -m benchmarks.bench_pipeline [--seconds 3] [--fighters 2] [--stall-ms 0 50 200]
+
+Runs a bot match on a SimulationThread while the main thread "renders" at about 60 fps and
+sleeps for `--stall-ms` every STALL_EVERY frames, then reports the interval between ticks.
+With the simulation on its own thread the intervals stay at the tick period whatever the stall.
+
+The input latency does not. Key presses arrive at random instants, but, as in
+views.game.render_pipelined, SDL events are only read by the main thread between frames: a press
+is handed to the simulation when the current frame ends and sampled by the next tick. The "in"
+columns report that delay in ms; it is bounded only by the longest frame plus one tick, so it
+grows with the stall.
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from core.pipeline import SimulationThread
+from core.profiler import percentile
+from models.bots import create_bot
+from models.match import create_match
+from models.party import create_party
+
+STALL_EVERY = 10  # Cada cuántos fotogramas se detiene el dibujo
+PRESSES_PER_SECOND = 20  # Pulsaciones simuladas para medir la latencia de entrada
+
+
+def run(seconds, fighters, stall_ms):
+    match = create_match() if fighters == 2 else create_party(fighters)
+    bots = [create_bot(("aggressive", "hit-and-run")[index % 2], seed=index) for index in range(fighters)]
+    ticks = []  # Instante en que empieza cada tick
+    handled = []  # Pulsaciones ya leídas por el hilo principal y aún no muestreadas
+    latencies = []  # ms entre cada pulsación y el tick que la ve
+
+    def next_masks():
+        now = time.perf_counter()
+        ticks.append(now)
+        latencies.extend((now - pressed) * 1000 for pressed in handled)
+        handled.clear()
+        return [bot.act(match, index) for index, bot in enumerate(bots)]
+
+    input_lock = threading.Lock()
+    simulation = SimulationThread(match, next_masks, input_lock)
+    rng = random.Random(stall_ms)
+    simulation.start()
+    began = time.perf_counter()
+    end = began + seconds
+    presses = sorted(rng.uniform(began, end) for _ in range(int(seconds * PRESSES_PER_SECOND)))
+    frame = 0
+    while time.perf_counter() < end and not simulation.finished:
+        frame += 1
+        # Como pygame.event.get(): solo se ven las pulsaciones ocurridas antes de este punto
+        now = time.perf_counter()
+        with input_lock:
+            while presses and presses[0] <= now:
+                handled.append(presses.pop(0))
+        simulation.buffer.latest()
+        time.sleep(stall_ms / 1000 if frame % STALL_EVERY == 0 else rng.uniform(0.012, 0.017))
+    simulation.stop()
+    simulation.join()
+
+    intervals = sorted((after - before) * 1000 for before, after in zip(ticks, ticks[1:]))
+    return match, intervals, sorted(latencies), simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--fighters", type=int, default=2)
+    parser.add_argument("--stall-ms", type=int, nargs="+", default=[0, 50, 200])
+    args = parser.parse_args()
+
+    print(f"{'stall ms':>8} {'ticks':>6} {'tick ms':>8} {'mean':>7} {'p99':>7} {'max':>7} {'step us':>8} {'late':>5} "
+          f"{'in p50':>7} {'in p99':>7} {'in max':>7}")
+    for stall_ms in args.stall_ms:
+        match, intervals, latencies, simulation = run(args.seconds, args.fighters, stall_ms)
+        p99 = intervals[int(len(intervals) * 0.99)]
+        step = statistics.mean(simulation.step_times) * 1e6
+        print(f"{stall_ms:>8} {match.tick:>6} {match.tick_ms:>8.2f} {statistics.mean(intervals):>7.2f} "
+              f"{p99:>7.2f} {intervals[-1]:>7.2f} {step:>8.1f} {simulation.late_ticks:>5} "
+              f"{percentile(latencies, 0.5):>7.1f} {percentile(latencies, 0.99):>7.1f} "
+              f"{percentile(latencies, 1.0):>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Decisions per second and decision latency of the lookahead CPU (models.bots.SearchBot).
+
+    python -m benchmarks.bench_search_bot [--matches 4] [--max-ticks 1800] [--opponent aggressive]
+
+Plays headless matches of each difficulty against a scripted bot, timing every act() call.
+Reports decisions per second of search time, the p50/p99/max time of one decision against the
+per-tick budget (a 60 FPS frame is 16.7 ms) and how many decisions went over that budget,
+the search depth reached at step boundaries,
+the transposition table hit rate and the results.
+"""
+import argparse
+import statistics
+import time
+from models.bots import SEARCH_BUDGETS, SEARCH_STEP_TICKS, SearchBot, create_bot
+from models.match import create_match
+
+
+def play(difficulty, opponent, seed, max_ticks):
+    match = create_match()
+    side = seed % 2  # Se alterna el lado del escenario
+    bot = SearchBot(difficulty)
+    bots = [None, None]
+    bots[side] = bot
+    bots[1 - side] = create_bot(opponent, seed=seed)
+    times, depths = [], []
+    while not match.is_over() and match.tick < max_ticks:
+        masks = []
+        for index, player_bot in enumerate(bots):
+            if player_bot is bot:
+                began = time.perf_counter()
+                masks.append(bot.act(match, index))
+                times.append(time.perf_counter() - began)
+                if match.tick % SEARCH_STEP_TICKS == 0:
+                    depths.append(bot.depth)
+            else:
+                masks.append(player_bot.act(match, index))
+        match.step(masks)
+    result = "win" if match.winner == side + 1 else "draw" if match.winner in (None, 0) else "loss"
+    return result, times, depths, bot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=4)
+    parser.add_argument("--max-ticks", type=int, default=1800)
+    parser.add_argument("--opponent", default="aggressive")
+    parser.add_argument("--difficulties", nargs="+", choices=list(SEARCH_BUDGETS), default=list(SEARCH_BUDGETS))
+    args = parser.parse_args()
+
+    print(f"{'level':>7} {'budget ms':>9} {'dec/s':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} "
+          f"{'over':>11} {'depth':>6} {'hits %':>7}  results")
+    for difficulty in args.difficulties:
+        times, depths, results = [], [], []
+        hits = lookups = 0
+        for seed in range(args.matches):
+            result, match_times, match_depths, bot = play(difficulty, args.opponent, seed, args.max_ticks)
+            times += match_times
+            depths += match_depths
+            results.append(result)
+            hits += bot.hits
+            lookups += bot.hits + bot.steps
+        times.sort()
+        budget = SEARCH_BUDGETS[difficulty]
+        over = sum(elapsed > budget for elapsed in times)
+        summary = ", ".join(f"{results.count(name)} {name}" for name in ("win", "draw", "loss"))
+        print(f"{difficulty:>7} {budget * 1000:>9.1f} {len(times) / sum(times):>8.0f} "
+              f"{times[len(times) // 2] * 1000:>7.2f} {times[int(len(times) * 0.99)] * 1000:>7.2f} "
+              f"{times[-1] * 1000:>7.2f} {over:>5} {100 * over / len(times):>4.1f}% {statistics.mean(depths):>6.2f} "
+              f"{100 * hits / max(lookups, 1):>7.1f}  "
+              f"{summary}")
+
+
+if __name__ == "__main__":
+    main()
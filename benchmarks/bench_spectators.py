@@ -0,0 +1,146 @@
+"""
+Load test of the spectator broadcast server (net.spectator) on localhost.
+
+    python -m benchmarks.bench_spectators [--clients 200] [--websocket-share 0.5] [--slow 5] [--seconds 10] [--max-buffer 1024]
+
+A child process runs bot matches at the tick rate and broadcasts them with SpectatorServer
+(a new match starts when one ends). This process connects `--clients` headless viewers, mixing
+TCP and WebSocket, plus `--slow` viewers that never read, and reports the bandwidth and ticks
+received per viewer, the messages dropped by backpressure and the server's CPU use. The server
+runs with a small `--max-buffer` and the slow viewers with a tiny receive buffer, so within
+seconds they are backed up and only get the newest deltas while the others keep every tick.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+SLOW_RECEIVE_BUFFER = 1024  # Bytes del búfer de recepción de un espectador lento (el núcleo impone un mínimo)
+
+
+def serve(connection, seconds, max_client_buffer):
+    """
+    Child process: broadcast bot matches for `seconds` after the parent says go, then send back the stats.
+    """
+    from models.bots import create_bot
+    from models.match import TICK_RATE, create_match
+    from net.spectator import SpectatorServer
+
+    async def run():
+        match = create_match()
+        server = await SpectatorServer(match.players[0].banks.states, TICK_RATE,
+                                               max_client_buffer=max_client_buffer).start()
+        connection.send(server.port)
+        await asyncio.get_running_loop().run_in_executor(None, connection.recv)  # Los clientes ya están conectados
+
+        bots = [create_bot("aggressive", seed=1), create_bot("hit-and-run", seed=2)]
+        tick_seconds = match.tick_ms / 1000
+        cpu, began = time.process_time(), time.perf_counter()
+        deadline = began
+        matches = 1
+        while time.perf_counter() - began < seconds:
+            if match.is_over():
+                match = create_match()
+                matches += 1
+            match.step([bot.act(match, index) for index, bot in enumerate(bots)])
+            server.publish(match)
+            deadline += tick_seconds
+            await asyncio.sleep(max(0.0, deadline - time.perf_counter()))
+        elapsed = time.perf_counter() - began
+        stats = server.stats()
+        stats.update(cpu=(time.process_time() - cpu) / elapsed, elapsed=elapsed, matches=matches)
+        connection.send(stats)
+        await server.close()
+
+    asyncio.run(run())
+
+
+async def viewer(port, websocket, received, stop):
+    from net.spectator import SpectatorClient
+    client = await SpectatorClient.connect("127.0.0.1", port, websocket)
+    ticks = 0
+    try:
+        async for _ in client.frames():
+            ticks += 1
+            if stop.is_set():
+                break
+    finally:
+        received.append((websocket, client.received_bytes, ticks))
+        client.close()
+
+
+async def slow_viewer(port):
+    """
+    Connects and never reads, so the server's buffer for it fills up.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SLOW_RECEIVE_BUFFER)  # Antes de conectar: fija la ventana
+    sock.connect(("127.0.0.1", port))
+    reader, writer = await asyncio.open_connection(sock=sock, limit=1024)
+    from net.spectator import HELLO
+    writer.write(HELLO)
+    writer.transport.pause_reading()
+    return writer
+
+
+async def load(port, connection, clients, websocket_share, slow, seconds):
+    received, stop = [], asyncio.Event()
+    websocket_clients = round(clients * websocket_share)
+    viewers = [asyncio.ensure_future(viewer(port, index < websocket_clients, received, stop))
+               for index in range(clients)]
+    slow_writers = [await slow_viewer(port) for _ in range(slow)]
+    await asyncio.sleep(0.5)
+    connection.send("go")
+    stats = await asyncio.get_running_loop().run_in_executor(None, connection.recv)
+    stop.set()
+    await asyncio.wait(viewers, timeout=2)
+    for writer in slow_writers:
+        writer.close()
+    return stats, received
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--websocket-share", type=float, default=0.5, help="fraction of viewers using WebSocket")
+    parser.add_argument("--slow", type=int, default=5, help="extra viewers that never read")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--max-buffer", type=int, default=1024,
+                        help="server bytes pending per viewer before dropping deltas (max_client_buffer)")
+    args = parser.parse_args()
+
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=serve, args=(child, args.seconds, args.max_buffer), daemon=True)
+    process.start()
+    port = parent.recv()
+    stats, received = asyncio.run(load(port, parent, args.clients, args.websocket_share, args.slow, args.seconds))
+    process.join(timeout=5)
+
+    elapsed = stats["elapsed"]
+    print(f"{args.clients} viewers ({round(args.clients * args.websocket_share)} WebSocket) + {args.slow} slow, "
+          f"{elapsed:.1f} s, {stats['broadcasts']} ticks, {stats['matches']} matches")
+    print(f"server CPU {stats['cpu'] * 100:.1f} % of one core, encode {stats['encode_us']:.1f} us/tick, "
+          f"sent {stats['sent_bytes'] / elapsed / 1024:.1f} kB/s total, {stats['dropped']} messages dropped")
+    # Los que leen reciben todos los ticks, así que los descartes son de los espectadores lentos
+    missed = sum(max(0, stats["broadcasts"] - ticks) for _, _, ticks in received)
+    if args.slow:
+        print(f"slow viewers: {stats['dropped'] / args.slow:.0f} messages dropped each "
+              f"({100 * stats['dropped'] / args.slow / max(1, stats['broadcasts']):.0f} % of the ticks); "
+              f"reading viewers: {missed} ticks missed")
+    print(f"{'transport':>9} {'viewers':>7} {'kB/s':>7} {'ticks/s':>8} {'min ticks/s':>11}")
+    for websocket, name in ((False, "tcp"), (True, "websocket")):
+        rows = [(total, ticks) for is_websocket, total, ticks in received if is_websocket == websocket]
+        if not rows:
+            continue
+        rates = [ticks / elapsed for _, ticks in rows]
+        print(f"{name:>9} {len(rows):>7} {statistics.mean(total for total, _ in rows) / elapsed / 1024:>7.2f} "
+              f"{statistics.mean(rates):>8.1f} {min(rates):>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare the overlap landing test (Player.apply_gravity) with the swept one (Player.apply_gravity_swept).
+
+    python -m benchmarks.bench_swept_collision [--number 20000]
+
+Reports the cost per call on the default stage and, for increasing fall speeds, whether a
+player dropped onto a 20 px floor lands on it or tunnels through.
+"""
+import argparse
+import timeit
+import pygame
+from models.match import create_match
+
+FLOOR = pygame.Rect(0, 600, 1280, 20)
+
+
+def lands(fall_speed, swept, body_height=10):
+    """
+    Drop a short body from y=100 at a constant speed and report where its feet end up.
+    """
+    match = create_match(colliders=[FLOOR], diagonal_platforms=[])
+    player = match.players[0]
+    player.rect.height = body_height
+    player.rect.y = 100
+    player.gravity = 0
+    player.y_velocity = fall_speed
+    apply_gravity = player.apply_gravity_swept if swept else player.apply_gravity
+    for _ in range(2000 // fall_speed + 2):
+        apply_gravity([FLOOR], [])
+    return player.rect.bottom == FLOOR.top
+
+
+def cost(swept, number):
+    match = create_match()
+    player = match.players[0]
+    apply_gravity = player.apply_gravity_swept if swept else player.apply_gravity
+    start_y = player.rect.y
+
+    def fall():
+        player.rect.y = start_y
+        player.y_velocity = 3
+        player.on_ground = False
+        apply_gravity(match.colliders, match.diagonal_platforms)
+
+    return min(timeit.repeat(fall, repeat=5, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"overlap: {cost(False, args.number) * 1e6:.2f} us per call")
+    print(f"swept:   {cost(True, args.number) * 1e6:.2f} us per call")
+    print(f"{'fall px/tick':>12} {'overlap':>8} {'swept':>8}")
+    for speed in (5, 15, 30, 60, 120, 400):
+        overlap, swept = ("lands" if lands(speed, mode) else "tunnels" for mode in (False, True))
+        print(f"{speed:>12} {overlap:>8} {swept:>8}")
+
+
+if __name__ == "__main__":
+    main()
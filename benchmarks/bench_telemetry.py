@@ -0,0 +1,151 @@
+"""
+Recording cost and query speed of the match telemetry (core.telemetry, tools.telemetry).
+
+    python -m benchmarks.bench_telemetry [--matches 100] [--events 2000000] [--output /tmp/telemetry.db]
+
+Simulates `--matches` headless matches between scripted bots with a MatchTelemetry on every
+fighter, keeping the events they really produce (jumps, landings, hits, damage taken and
+blocked, KOs) and their results, draws at the time limit included. Those matches are then
+recorded again and again through a TelemetryStore as fast as possible, to report the cost of
+record() on the producing thread, how many events the ring had to drop and the background
+write rate. A second pass feeds the same store while backing off when the ring is full, to
+build a database of `--events` events, and then times every report of tools.telemetry on it.
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections import Counter
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from core.telemetry import MatchTelemetry, TelemetryStore
+from models.bots import create_bot
+from models.match import TICK_RATE, create_match
+from tools.telemetry import REPORTS
+
+BOT_NAMES = ("aggressive", "hit-and-run", "random")  # Bots rápidos: la búsqueda de la CPU no cambia los eventos
+MAX_TICKS = 99 * TICK_RATE  # Límite de tools.tournament antes de declarar empate
+
+
+class CapturedMatch:
+    """
+    Stand-in for a TelemetryStore that keeps the events and result of one match in memory.
+    """
+
+    def begin_match(self, mode, fighters, tick_rate, level=None, started=None):
+        self.fighters = fighters
+        self.events = []
+        return 0
+
+    def record(self, match_id, tick, event, player, value=0):
+        self.events.append((tick, event, player, value))
+        return True
+
+    def end_match(self, match_id, winner, ticks):
+        self.winner = winner
+        self.ticks = ticks
+
+
+def simulate(count, seed):
+    """
+    (fighters, events, winner, ticks) of `count` simulated matches between random pairs of BOT_NAMES.
+    """
+    rng = random.Random(seed)
+    matches = []
+    for index in range(count):
+        match = create_match()
+        names = rng.sample(BOT_NAMES, 2)
+        bots = [create_bot(name, seed=seed + 2 * index + side) for side, name in enumerate(names)]
+        captured = CapturedMatch()
+        match_telemetry = MatchTelemetry(captured, match, names, "tournament")
+        for player in match.players:
+            player.listener = match_telemetry.listener
+        winner = match.run(lambda match: [bot.act(match, side) for side, bot in enumerate(bots)], MAX_TICKS)
+        match_telemetry.finish(timed_out=winner is None)
+        matches.append((captured.fighters, captured.events, captured.winner, captured.ticks))
+    return matches
+
+
+def feed(store, matches, count, back_off):
+    """
+    Record the simulated `matches` over and over until about `count` events; returns the seconds
+    of every record() call.
+    """
+    timings = []
+    recorded = 0
+    for fighters, events, winner, ticks in itertools.cycle(matches):
+        match_id = store.begin_match("tournament", fighters, TICK_RATE)
+        for tick, kind, player, value in events:
+            began = time.perf_counter()
+            stored = store.record(match_id, tick, kind, player, value)
+            timings.append(time.perf_counter() - began)
+            while back_off and not stored:
+                time.sleep(0.001)
+                stored = store.record(match_id, tick, kind, player, value)
+        store.end_match(match_id, winner, ticks)
+        recorded += len(events)
+        if recorded >= count:
+            return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=100, help="distinct simulated matches")
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--burst", type=int, default=500_000, help="events of the unthrottled pass")
+    parser.add_argument("--output", help="database to build (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    matches = simulate(args.matches, args.seed)
+    kinds = Counter(event[1] for _, events, _, _ in matches for event in events)
+    print(f"simulated {len(matches)} matches in {time.perf_counter() - began:.1f} s: "
+          f"{sum(winner == 0 for _, _, winner, _ in matches)} draws at the time limit, "
+          f"{statistics.mean(len(events) for _, events, _, _ in matches):.0f} events per match "
+          f"({', '.join(f'{kind} {count}' for kind, count in kinds.most_common())})")
+
+    directory = tempfile.TemporaryDirectory()
+    path = args.output or os.path.join(directory.name, "telemetry.db")
+
+    store = TelemetryStore(path, flush_interval=0.1)
+    began = time.perf_counter()
+    timings = sorted(feed(store, matches, args.burst, back_off=False))
+    produced = time.perf_counter() - began
+    store.close()
+    stats = store.stats()
+    print(f"burst: {len(timings)} events in {produced:.2f} s, record() p50 {timings[len(timings) // 2] * 1e6:.2f} us "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.2f} us max {timings[-1] * 1e3:.2f} ms, "
+          f"{stats['dropped']} dropped (ring full)")
+    print(f"writer: {stats['committed']} events in {stats['batches']} batches, {stats['write_ms']:.1f} ms per batch")
+
+    store = TelemetryStore(path, flush_interval=0.1)
+    began = time.perf_counter()
+    feed(store, matches, args.events, back_off=True)
+    store.close()
+    elapsed = time.perf_counter() - began
+    connection = sqlite3.connect(path)
+    total = connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    connection.close()
+    print(f"database: {total} events, {store.stats()['committed'] / elapsed:,.0f} events/s sustained, "
+          f"{os.path.getsize(path) / 2 ** 20:.0f} MB")
+
+    from core.telemetry import connect
+    for name, report in REPORTS.items():
+        connection = connect(path)
+        began = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            report(connection, None)
+        print(f"tools.telemetry {name}: {time.perf_counter() - began:.2f} s")
+        connection.close()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Benchmark suite for the game loop and the asset pipeline, run on the SDL dummy drivers.
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --output new.json --compare bench.json --threshold 0.15
+
+Measures the cold start of main.py (including the module-level asset loads of the views),
+Player._load_frames throughput, the per-tick cost of Player.move, Player.apply_gravity,
+handle_combat and of saving and loading the packed match state, and the per-frame render
+cost of render_game. With --compare, exits with status 1 when any result is slower than
+the baseline by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Arranca main.py y lo cierra tras el primer fotograma, informando los tiempos por stdout.
+# Solo se envuelve display.flip para anotar cuándo se presenta el primer fotograma.
+COLD_START_SCRIPT = """
+import json, os, runpy, sys, time
+start = time.perf_counter()
+import pygame
+pygame.init()
+imports = {}
+for module in ("views.menu", "views.instructions", "views.game"):
+    began = time.perf_counter()
+    __import__(module)
+    imports[module] = time.perf_counter() - began
+first_frame = []
+flip = pygame.display.flip
+def timed_flip():
+    if not first_frame:
+        first_frame.append(time.perf_counter() - start)
+    flip()
+pygame.display.flip = timed_flip
+pygame.time.set_timer(pygame.QUIT, 1, 1)
+runpy.run_path("main.py", run_name="__main__")
+print(json.dumps({"first_frame": first_frame[0], "total": time.perf_counter() - start, "imports": imports}))
+"""
+
+
+def median_time(function, repeat=5, number=1):
+    """
+    Median seconds per call over `repeat` rounds of `number` calls.
+    """
+    return statistics.median(timeit.repeat(function, repeat=repeat, number=number)) / number
+
+
+def bench_cold_start(runs):
+    first_frames, totals, imports = [], [], {}
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", COLD_START_SCRIPT], cwd=ROOT_DIR, env=os.environ,
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        first_frames.append(result["first_frame"])
+        totals.append(result["total"])
+        for module, seconds in result["imports"].items():
+            imports.setdefault(module, []).append(seconds)
+
+    results = {
+        "cold_start.main_first_frame": {"value": statistics.median(first_frames) * 1000, "unit": "ms"},
+        "cold_start.main_first_frame_and_exit": {"value": statistics.median(totals) * 1000, "unit": "ms"},
+    }
+    for module, values in imports.items():
+        results[f"cold_start.import.{module}"] = {"value": statistics.median(values) * 1000, "unit": "ms"}
+    return results
+
+
+def load_sheets():
+    from core.assets import SAMURAI_SHEETS
+    return {state: pygame.image.load(path).convert_alpha() for state, path in SAMURAI_SHEETS.items()}
+
+
+def bench_load_frames(sheets):
+    from models.player import Player
+    player = Player(0, 0, sheets, {}, 96, 96, 5)
+    frame_count = sum(len(frames) for frames in player.animations.values())
+
+    def load_all():
+        for sheet in sheets.values():
+            player._load_frames(sheet)
+
+    seconds = median_time(load_all, repeat=5, number=3)
+    return {"player.load_frames": {"value": frame_count / seconds, "unit": "frames/s", "higher_is_better": True}}
+
+
+def bench_tick():
+    from models.controls import LEFT, RIGHT, ATTACK
+    from models.match import create_match, handle_combat
+
+    match = create_match()
+    player1, player2 = match.players
+    # Jugadores en el suelo y frente a frente, como a mitad de un combate
+    for _ in range(120):
+        match.step([0, 0])
+    player2.rect.x = player1.rect.x - 40
+    mask = LEFT | ATTACK
+    start_x = player1.rect.x
+
+    def move():
+        player1.rect.x = start_x
+        player1.move(mask, match.colliders)
+
+    def apply_gravity():
+        player1.apply_gravity(match.colliders, match.diagonal_platforms)
+
+    def combat():
+        player1.is_attacking = True
+        player2.health = 100
+        handle_combat(player1, player2)
+
+    idle = [0, 0]
+
+    def match_ticks():
+        # Un combate nuevo cada vez para no acumular caídas infinitas
+        fresh = create_match()
+        for _ in range(600):
+            fresh.step(idle)
+
+    from models.state_ring import StateRing
+    ring = StateRing(match, 16)
+
+    def save_state():
+        ring.save()
+
+    def load_state():
+        ring.load(match.tick)
+
+    number = 20000
+    return {
+        "tick.state_save": {"value": median_time(save_state, number=number) * 1e6, "unit": "us"},
+        "tick.state_load": {"value": median_time(load_state, number=number) * 1e6, "unit": "us"},
+        "tick.player_move": {"value": median_time(move, number=number) * 1e6, "unit": "us"},
+        "tick.player_apply_gravity": {"value": median_time(apply_gravity, number=number) * 1e6, "unit": "us"},
+        "tick.handle_combat": {"value": median_time(combat, number=number) * 1e6, "unit": "us"},
+        "tick.match_step": {"value": median_time(match_ticks, number=10) / 600 * 1e6, "unit": "us"},
+    }
+
+
+def bench_render(seconds):
+    """
+    Run render_game for a while with the profiler on and report the time per frame spent outside the frame cap.
+    """
+    from core.assets import load_samurai
+    from core.profiler import profiler
+
+    results = {}
+    for mode, options in (("full", {}), ("dirty_rects", {"dirty_rects": True})):
+        pygame.init()
+        screen = pygame.display.set_mode((1280, 720))
+        import views.game as game
+        game.game_active = True
+        samurai = load_samurai()
+
+        profiler.phases.clear()
+        profiler.frame_times.clear()
+        profiler.frames = profiler.dropped_frames = 0
+        profiler.set_enabled(True)
+        pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), 1)
+        try:
+            game.render_game(screen, samurai, samurai, **options)
+        except SystemExit:
+            pass  # render_game cierra pygame al recibir QUIT
+        stats = profiler.stats()["phases"]
+        profiler.set_enabled(False)
+
+        frame = sum(values["p50"] for name, values in stats.items() if name != "frame")
+        results[f"render_game.{mode}.frame_p50"] = {"value": frame, "unit": "ms"}
+        for phase in ("background", "draw", "flip"):
+            if phase in stats:
+                results[f"render_game.{mode}.{phase}_p50"] = {"value": stats[phase]["p50"], "unit": "ms"}
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of every shared result and return the names that regressed.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]["value"], result["value"]
+        if not old:
+            continue
+        change = (new - old) / old
+        worse = -change if result.get("higher_is_better") else change
+        flag = "REGRESSION" if worse > threshold else ""
+        print(f"{name:45} {old:12.3f} -> {new:12.3f} {result['unit']:9} {change:+7.1%} {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Game loop and asset pipeline benchmarks.")
+    parser.add_argument("--output", default="bench.json", help="JSON results file")
+    parser.add_argument("--compare", help="baseline JSON written by a previous run")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown before failing")
+    parser.add_argument("--cold-start-runs", type=int, default=5)
+    parser.add_argument("--render-seconds", type=float, default=3)
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT_DIR)
+    results = {}
+    results.update(bench_cold_start(args.cold_start_runs))
+
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    results.update(bench_load_frames(load_sheets()))
+    results.update(bench_tick())
+    results.update(bench_render(args.render_seconds))
+
+    report = {
+        "revision": git_revision(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    for name, result in results.items():
+        print(f"{name:45} {result['value']:12.3f} {result['unit']}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        print(f"\ncompared with {args.compare}:")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
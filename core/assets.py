@@ -0,0 +1,307 @@
+import hashlib
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from models.animation import AnimationBanks
+
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+ASSETS_DIR = os.path.join(ROOT_DIR, "assets")
+
+# Caché en disco opcional de tiras ya escaladas (p. ej. FIGHTING_GAME_ASSET_CACHE=.cache/assets)
+DISK_CACHE_ENV = "FIGHTING_GAME_ASSET_CACHE"
+
+_STRIP_MAGIC = b"SWST"
+_STRIP_HEADER = struct.Struct("<4sHHHH")  # magic, versión, ancho y alto del fotograma, número de fotogramas
+_STRIP_VERSION = 1
+
+
+def asset_path(*parts):
+    """
+    Absolute path of a file inside the assets directory.
+    """
+    return os.path.join(ASSETS_DIR, *parts)
+
+
+def _prepare(surface, alpha=True):
+    """
+    Convert a surface to the display format when a display exists (headless surfaces are kept as is).
+    Only on the main thread: the prefetch thread keeps surfaces in their decoded format.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+# Un único hilo de precarga: las cargas van en orden y no compiten con el bucle principal por varios núcleos
+_prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset-prefetch")
+
+
+class LazyAsset:
+    def __init__(self, load, finalize=None):
+        """
+        Asset loaded on first use, or ahead of time on the background prefetch thread.
+        `finalize(value)` runs once on the thread that calls get(), e.g. to convert a
+        surface to the display format.
+        """
+        self._load = load
+        self._finalize = finalize
+        self._future = None
+        self._value = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def prefetch(self):
+        """
+        Start loading in the background; returns self so it can be chained.
+        """
+        with self._lock:
+            if self._future is None and not self._loaded:
+                self._future = _prefetch_pool.submit(self._load)
+        return self
+
+    def ready(self):
+        """
+        True when get() would not block.
+        """
+        return self._loaded or (self._future is not None and self._future.done())
+
+    def get(self):
+        """
+        The loaded asset; waits for the prefetch, or loads synchronously if it was never prefetched.
+        """
+        if not self._loaded:
+            with self._lock:
+                future = self._future
+            value = future.result() if future is not None else self._load()
+            if self._finalize is not None:
+                value = self._finalize(value)
+            self._value = value
+            self._loaded = True
+        return self._value
+
+
+def load_scaled_image(path, size):
+    """
+    Decode an image and scale it, without converting it (safe on the prefetch thread).
+    """
+    return pygame.transform.scale(pygame.image.load(path), size)
+
+
+class ScaledFont:
+    def __init__(self, path, size):
+        """
+        A font of `size` logical pixels, opened once per render scale.
+        The scale 1 font is a LazyAsset, so it can be prefetched like the other assets.
+        """
+        self.path = path
+        self.size = size
+        self.base = LazyAsset(lambda: pygame.font.Font(path, size))
+        self._fonts = {}  # tamaño en píxeles -> Font
+
+    def prefetch(self):
+        self.base.prefetch()
+        return self
+
+    def ready(self):
+        return self.base.ready()
+
+    def get(self, scale=1):
+        if scale == 1:
+            return self.base.get()
+        pixels = max(1, round(self.size * scale))
+        font = self._fonts.get(pixels)
+        if font is None:
+            font = self._fonts[pixels] = pygame.font.Font(self.path, pixels)
+        return font
+
+
+class AssetManager:
+    def __init__(self, disk_cache_dir=None):
+        """
+        Decode and scale every image once and hand out shared results.
+        Entries are keyed by file content (SHA-1) plus the requested size, so the same sheet
+        loaded through two names or by two players is only processed once.
+        """
+        self.disk_cache_dir = disk_cache_dir
+        self._lock = threading.RLock()  # Las vistas y el hilo de precarga comparten el gestor
+        self._digests = {}  # ruta -> (mtime, digest)
+        self._images = {}  # (digest, size, alpha) -> Surface
+        self._strips = {}  # (digest, frame_width, frame_height, scale) -> (derecha, izquierda) sin convertir
+        self._converted = {}  # Misma clave -> las tiras convertidas al formato de la pantalla
+
+    def digest(self, path):
+        """
+        Content hash of a file, recomputed only when its modification time changes.
+        """
+        mtime = os.path.getmtime(path)
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with open(path, "rb") as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+        self._digests[path] = (mtime, digest)
+        return digest
+
+    def image(self, path, size=None, alpha=True):
+        """
+        Load an image, optionally scaled to `size`, once.
+        """
+        with self._lock:
+            key = (self.digest(path), size, alpha)
+            surface = self._images.get(key)
+            if surface is None:
+                surface = pygame.image.load(path)
+                if size is not None:
+                    surface = pygame.transform.scale(surface, size)
+                surface = _prepare(surface, alpha)
+                self._images[key] = surface
+            return surface
+
+    def frames(self, path, frame_width, frame_height, scale=2, convert=True):
+        """
+        Slice a horizontal sprite sheet into scaled frames.
+        Returns (right-facing, left-facing) tuples shared by every caller, converted to the display
+        format once per strip. With `convert` False they are left as decoded (for the prefetch thread).
+        """
+        with self._lock:
+            key = (self.digest(path), frame_width, frame_height, scale)
+            strip = self._strips.get(key)
+            if strip is None:
+                strip = self._load_strip_from_disk(key)
+                if strip is None:
+                    strip = self._build_strip(path, frame_width, frame_height, scale)
+                    self._save_strip_to_disk(key, strip)
+                self._strips[key] = strip
+            if not convert or pygame.display.get_surface() is None:
+                return strip
+            converted = self._converted.get(key)
+            if converted is None:
+                converted = self._converted[key] = tuple(tuple(_prepare(frame) for frame in side) for side in strip)
+            return converted
+
+    def animations(self, sheets, frame_width, frame_height, scale=2, convert=True):
+        """
+        Build the AnimationBanks of a character from a state -> sprite sheet path mapping.
+        """
+        right, left = {}, {}
+        for state, path in sheets.items():
+            right[state], left[state] = self.frames(path, frame_width, frame_height, scale, convert)
+        return AnimationBanks(right, left)
+
+    def evict(self, path=None):
+        """
+        Drop the cached results of one file, or of every file when `path` is None.
+        Surfaces already handed out stay valid for their holders.
+        """
+        with self._lock:
+            if path is None:
+                self._digests.clear()
+                self._images.clear()
+                self._strips.clear()
+                self._converted.clear()
+                return
+            cached = self._digests.pop(path, None)
+            if cached is None:
+                return
+            digest = cached[1]
+            self._images = {key: value for key, value in self._images.items() if key[0] != digest}
+            self._strips = {key: value for key, value in self._strips.items() if key[0] != digest}
+            self._converted = {key: value for key, value in self._converted.items() if key[0] != digest}
+
+    def _build_strip(self, path, frame_width, frame_height, scale):
+        sheet = pygame.image.load(path)
+        right = []
+        for x in range(0, sheet.get_width(), frame_width):
+            frame = sheet.subsurface((x, 0, frame_width, frame_height))
+            frame = pygame.transform.scale(frame, (round(frame_width * scale), round(frame_height * scale)))
+            right.append(frame)
+        left = [pygame.transform.flip(frame, True, False) for frame in right]
+        return tuple(right), tuple(left)
+
+    def _strip_cache_path(self, key):
+        digest, frame_width, frame_height, scale = key
+        return os.path.join(self.disk_cache_dir, f"{digest}-{frame_width}x{frame_height}@{scale:g}.strip")
+
+    def _load_strip_from_disk(self, key):
+        """
+        Read a pre-scaled strip: one RGBA texture, right-facing frames on the first row and mirrored ones on the second.
+        """
+        if self.disk_cache_dir is None:
+            return None
+        try:
+            with open(self._strip_cache_path(key), "rb") as file:
+                header = file.read(_STRIP_HEADER.size)
+                magic, version, width, height, count = _STRIP_HEADER.unpack(header)
+                if magic != _STRIP_MAGIC or version != _STRIP_VERSION:
+                    return None
+                pixels = file.read()
+        except (OSError, struct.error):
+            return None
+        if len(pixels) != width * count * height * 2 * 4:
+            return None
+
+        texture = pygame.image.frombytes(pixels, (width * count, height * 2), "RGBA")
+        right = tuple(texture.subsurface((i * width, 0, width, height)) for i in range(count))
+        left = tuple(texture.subsurface((i * width, height, width, height)) for i in range(count))
+        return right, left
+
+    def _save_strip_to_disk(self, key, strip):
+        if self.disk_cache_dir is None:
+            return
+        right, left = strip
+        width, height = right[0].get_size()
+        texture = pygame.Surface((width * len(right), height * 2), pygame.SRCALPHA)
+        for i, (frame, mirrored) in enumerate(zip(right, left)):
+            texture.blit(frame, (i * width, 0))
+            texture.blit(mirrored, (i * width, height))
+
+        os.makedirs(self.disk_cache_dir, exist_ok=True)
+        path = self._strip_cache_path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(_STRIP_HEADER.pack(_STRIP_MAGIC, _STRIP_VERSION, width, height, len(right)))
+            file.write(pygame.image.tobytes(texture, "RGBA"))
+        os.replace(temp_path, path)
+
+
+# Gestor compartido por todas las vistas y partidas
+asset_manager = AssetManager(os.environ.get(DISK_CACHE_ENV))
+
+SAMURAI_SHEETS = {
+    "idle": asset_path("game", "samurai", "IDLE.png"),
+    "running": asset_path("game", "samurai", "RUN.png"),
+    "jumping": asset_path("game", "samurai", "RUN.png"),
+    "attacking": asset_path("game", "samurai", "ATTACK.png"),
+    "hurt": asset_path("game", "samurai", "HURT.png"),
+}
+
+
+def load_samurai(scale=1, convert=True):
+    """
+    Shared animation banks of the samurai: 96x96 frames scaled 2x, times the render `scale`.
+    """
+    frame_scale = 2 * scale
+    if frame_scale == int(frame_scale):
+        frame_scale = int(frame_scale)  # Misma clave de caché (y mismo archivo en disco) que la escala entera
+    return asset_manager.animations(SAMURAI_SHEETS, 96, 96, frame_scale, convert)
+
+
+_samurai_animations = {}  # escala de dibujo -> LazyAsset
+
+
+def samurai_animations_at(scale):
+    """
+    LazyAsset with the samurai banks for one render scale, created once per scale.
+    The prefetch decodes and scales the frames; get() converts them on the main thread.
+    """
+    asset = _samurai_animations.get(scale)
+    if asset is None:
+        asset = _samurai_animations[scale] = LazyAsset(lambda: load_samurai(scale, convert=False),
+                                                       finalize=lambda banks: load_samurai(scale))
+    return asset
+
+
+# Animaciones del samurái, precargadas en segundo plano mientras se muestra el menú
+samurai_animations = samurai_animations_at(1)
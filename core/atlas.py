@@ -0,0 +1,40 @@
+import math
+import pygame
+
+MAX_ATLAS_WIDTH = 4096  # Ancho máximo de la textura en píxeles
+
+
+class SpriteAtlas:
+    def __init__(self, banks):
+        """
+        Pack several frame banks into a single surface.
+        `banks` maps a key (e.g. (state, facing_left)) to a list of equally sized frames;
+        `area(key, index)` returns the source rect to blit from `surface`.
+        """
+        frames = [frame for bank in banks.values() for frame in bank]
+        if not frames:
+            raise ValueError("Cannot build an atlas without frames")
+
+        self.frame_width, self.frame_height = frames[0].get_size()
+        columns = max(1, min(len(frames), MAX_ATLAS_WIDTH // self.frame_width))
+        rows = math.ceil(len(frames) / columns)
+
+        self.surface = pygame.Surface((columns * self.frame_width, rows * self.frame_height), pygame.SRCALPHA)
+        self.areas = {}
+
+        slot = 0
+        for key, bank in banks.items():
+            areas = []
+            for frame in bank:
+                x = (slot % columns) * self.frame_width
+                y = (slot // columns) * self.frame_height
+                self.surface.blit(frame, (x, y))
+                areas.append(pygame.Rect(x, y, self.frame_width, self.frame_height))
+                slot += 1
+            self.areas[key] = areas
+
+    def area(self, key, index):
+        """
+        Source rect of one frame inside the atlas surface.
+        """
+        return self.areas[key][index]
@@ -0,0 +1,175 @@
+import math
+import os
+import random
+import time
+from array import array
+from collections import deque
+import pygame
+from core.assets import LazyAsset, asset_path
+from core.profiler import percentile
+
+# Formato del mezclador; main.py lo fija con pygame.mixer.pre_init antes de pygame.init()
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+MIXER_BUFFER = 512  # Muestras por bloque: fija la latencia mínima del dispositivo
+
+SOUNDS_DIR = asset_path("sounds")
+
+# Prioridad de cada efecto: uno nuevo solo puede robar la voz de otro de prioridad menor o igual
+SFX_PRIORITY = {"jump": 1, "hurt": 2, "block": 3, "hit": 3}
+
+
+def _tone(duration, volume, wave):
+    """
+    Synthesized mono samples of `duration` seconds; `wave(t, progress)` returns a value in [-1, 1].
+    """
+    count = int(MIXER_FREQUENCY * duration)
+    samples = array("h")
+    for index in range(count):
+        progress = index / count
+        envelope = (1 - progress) ** 2  # Caída rápida para que el golpe suene seco
+        samples.append(int(32767 * volume * envelope * wave(index / MIXER_FREQUENCY, progress)))
+    return samples
+
+
+def synthesize(name):
+    """
+    Fallback samples for the effects without a file in assets/sounds.
+    """
+    noise = random.Random(name)
+    if name == "jump":
+        return _tone(0.12, 0.4, lambda t, p: math.sin(2 * math.pi * (300 + 500 * p) * t))
+    if name == "hit":
+        return _tone(0.09, 0.6, lambda t, p: noise.uniform(-1, 1) * 0.7 + math.sin(2 * math.pi * 110 * t) * 0.3)
+    if name == "block":
+        return _tone(0.08, 0.4, lambda t, p: 1.0 if math.sin(2 * math.pi * 880 * t) > 0 else -1.0)
+    if name == "hurt":
+        return _tone(0.15, 0.5, lambda t, p: math.sin(2 * math.pi * (220 - 120 * p) * t))
+    raise ValueError(f"Unknown sound effect '{name}'")
+
+
+def load_sfx():
+    """
+    Decode every effect into memory: assets/sounds/<name>.wav or .ogg when present, synthesized otherwise.
+    Returns None when there is no mixer (e.g. no audio device).
+    """
+    if not pygame.mixer.get_init():
+        return None
+    frequency, size, channels = pygame.mixer.get_init()
+    sounds = {}
+    for name in SFX_PRIORITY:
+        path = next((os.path.join(SOUNDS_DIR, name + extension) for extension in (".wav", ".ogg")
+                     if os.path.exists(os.path.join(SOUNDS_DIR, name + extension))), None)
+        if path is not None:
+            sounds[name] = pygame.mixer.Sound(path)
+        elif (frequency, size) == (MIXER_FREQUENCY, MIXER_SIZE):
+            samples = synthesize(name)
+            if channels > 1:
+                samples = array("h", (sample for sample in samples for _ in range(channels)))
+            sounds[name] = pygame.mixer.Sound(buffer=samples)
+    return sounds
+
+
+class AudioManager:
+    def __init__(self, voices=8, window=256):
+        """
+        Sound effects played on a fixed pool of mixer channels.
+        trigger() only queues the effect, so the simulation can call it at any point of the tick;
+        flush() plays the queue once per frame. When every voice is busy, the effect steals the
+        voice playing the lowest-priority (then oldest) effect, or is dropped if all of them matter more.
+        The delay between trigger() and the actual Channel.play() is kept for the last `window` effects.
+        """
+        self.voices = voices
+        self.sfx = LazyAsset(load_sfx)
+        self.channels = None
+        self.playing = []  # Por voz: (prioridad, instante de inicio) o None
+        self.pending = deque()
+        self.latencies = deque(maxlen=window)  # ms entre trigger() y play()
+        self.played = self.stolen = self.dropped = 0
+
+    def prefetch(self):
+        """
+        Decode the effects on the background prefetch thread.
+        """
+        self.sfx.prefetch()
+        return self
+
+    def ready(self):
+        return self.sfx.ready()
+
+    def _open(self):
+        if self.channels is None:
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.voices))
+            pygame.mixer.set_reserved(self.voices)  # Sound.play() sin canal no puede quitarnos voces
+            self.channels = [pygame.mixer.Channel(index) for index in range(self.voices)]
+            self.playing = [None] * self.voices
+
+    def trigger(self, name, player=None):
+        """
+        Queue an effect; never blocks. Usable directly as a Player.listener.
+        """
+        self.pending.append((name, time.perf_counter()))
+
+    def flush(self):
+        """
+        Play the queued effects (the same effect queued twice in one frame plays once).
+        Effects are dropped while the sounds are still loading.
+        """
+        if not self.pending:
+            return
+        if not self.sfx.ready() or not pygame.mixer.get_init():
+            self.pending.clear()
+            return
+        sounds = self.sfx.get()
+        if sounds is None:
+            self.pending.clear()
+            return
+        self._open()
+
+        seen = set()
+        while self.pending:
+            name, queued = self.pending.popleft()
+            if name in seen or name not in sounds:
+                continue
+            seen.add(name)
+            voice = self._voice(SFX_PRIORITY[name])
+            if voice is None:
+                self.dropped += 1
+                continue
+            self.channels[voice].play(sounds[name])
+            now = time.perf_counter()
+            self.playing[voice] = (SFX_PRIORITY[name], now)
+            self.latencies.append((now - queued) * 1000)
+            self.played += 1
+
+    def _voice(self, priority):
+        # Una voz libre, o la de menor prioridad y más antigua si no supera a la nueva
+        victim = None
+        for voice, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return voice
+            if victim is None or (self.playing[voice] or (0, 0)) < (self.playing[victim] or (0, 0)):
+                victim = voice
+        if (self.playing[victim] or (0, 0))[0] > priority:
+            return None
+        self.stolen += 1
+        return victim
+
+    def stats(self):
+        """
+        Effect counts and the trigger-to-play latency, plus the device buffer latency the mixer adds on top.
+        """
+        latencies = sorted(self.latencies)
+        init = pygame.mixer.get_init()
+        return {
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+            "queue_ms": {"p50": percentile(latencies, 0.5), "p99": percentile(latencies, 0.99),
+                         "max": latencies[-1] if latencies else 0.0},
+            "buffer_ms": MIXER_BUFFER / init[0] * 1000 if init else None,
+        }
+
+
+audio = AudioManager()
@@ -0,0 +1,131 @@
+import os
+import pygame
+
+# Coordenadas lógicas: la simulación, los escenarios y la maquetación de las vistas usan siempre 1280x720
+LOGICAL_SIZE = (1280, 720)
+
+# Configuración por entorno, p. ej. FIGHTING_GAME_WINDOW_SIZE=1920x1080 FIGHTING_GAME_RENDER_SIZE=640x360
+WINDOW_SIZE_ENV = "FIGHTING_GAME_WINDOW_SIZE"
+RENDER_SIZE_ENV = "FIGHTING_GAME_RENDER_SIZE"
+SMOOTH_SCALE_ENV = "FIGHTING_GAME_SMOOTH_SCALE"  # 1 para escalar con filtrado en lugar de por múltiplos enteros
+
+
+def parse_size(text):
+    """
+    "WIDTHxHEIGHT" -> (width, height).
+    """
+    try:
+        width, height = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Expected a size like 1280x720, got {text!r}") from None
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Expected a positive size, got {text!r}")
+    return width, height
+
+
+def display_settings(environ=os.environ):
+    """
+    (window_size, render_size, smooth) from the environment; the render size defaults to the window size.
+    """
+    window_size = parse_size(environ[WINDOW_SIZE_ENV]) if environ.get(WINDOW_SIZE_ENV) else LOGICAL_SIZE
+    render_size = parse_size(environ[RENDER_SIZE_ENV]) if environ.get(RENDER_SIZE_ENV) else window_size
+    return window_size, render_size, environ.get(SMOOTH_SCALE_ENV, "") not in ("", "0")
+
+
+def view_scale(size):
+    """
+    Pixels per logical unit for a surface of `size` (layouts keep the 16:9 logical aspect).
+    """
+    return min(size[0] / LOGICAL_SIZE[0], size[1] / LOGICAL_SIZE[1])
+
+
+def scale_rect(rect, scale):
+    """
+    A rect in logical coordinates converted to the pixels of a surface drawn at `scale`.
+    """
+    x, y, width, height = rect
+    return pygame.Rect(round(x * scale), round(y * scale), round(width * scale), round(height * scale))
+
+
+class Display:
+    def __init__(self, window, render_size=None, smooth=False):
+        """
+        Internal render target of `render_size` presented on `window` (the display surface) with
+        one scale pass per frame. Views draw on `surface` at `scale` pixels per logical unit.
+        When both sizes match the window itself is the target and presenting costs nothing extra.
+        Otherwise the image is scaled by the largest integer factor that fits (sharp pixels) or,
+        with `smooth` or when it does not fit even once, filtered to fill the window; the rest
+        of the window is letterboxed.
+        """
+        self.window = window
+        window_size = window.get_size()
+        self.render_size = tuple(render_size or window_size)
+        self.scale = view_scale(self.render_size)
+        if self.render_size == window_size:
+            self.surface = window
+            self.target = window.get_rect()
+            self.factor = 1
+            self.smooth = False
+            return
+
+        self.surface = pygame.Surface(self.render_size).convert(window)
+        fit = min(window_size[0] / self.render_size[0], window_size[1] / self.render_size[1])
+        self.factor = int(fit) if not smooth and fit >= 1 else fit
+        self.smooth = smooth or fit < 1 or self.factor != int(self.factor)
+        width, height = round(self.render_size[0] * self.factor), round(self.render_size[1] * self.factor)
+        self.target = pygame.Rect((window_size[0] - width) // 2, (window_size[1] - height) // 2, width, height)
+        self._target_surface = window.subsurface(self.target)
+        window.fill((0, 0, 0))
+
+    @classmethod
+    def open(cls, window_size=LOGICAL_SIZE, render_size=None, smooth=False, flags=0):
+        """
+        Create the game window and its render target.
+        """
+        window = pygame.display.set_mode(window_size, flags)
+        return cls(window, render_size, smooth)
+
+    def to_render(self, pos):
+        """
+        A window position (e.g. a mouse click) in the pixels of `surface`, or None over the letterbox.
+        """
+        x, y = pos[0] - self.target.x, pos[1] - self.target.y
+        if not (0 <= x < self.target.width and 0 <= y < self.target.height):
+            return None
+        return int(x / self.factor), int(y / self.factor)
+
+    def present(self, dirty=None):
+        """
+        Show the frame drawn on `surface`; `dirty` limits the update to those rects of `surface`.
+        """
+        if self.surface is self.window:
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)
+            return
+
+        if self.smooth:
+            # El filtrado mezcla píxeles vecinos, así que se escala siempre la imagen completa
+            pygame.transform.smoothscale(self.surface, self.target.size, self._target_surface)
+            pygame.display.update(self.target)
+            return
+
+        if dirty is None:
+            pygame.transform.scale(self.surface, self.target.size, self._target_surface)
+            pygame.display.update(self.target)
+            return
+
+        # Con un factor entero cada zona se puede escalar por separado sin costuras
+        factor = self.factor
+        bounds = self.surface.get_rect()
+        updated = []
+        for rect in dirty:
+            rect = pygame.Rect(rect).clip(bounds)
+            if not rect:
+                continue
+            destination = pygame.Rect(rect.x * factor, rect.y * factor, rect.width * factor, rect.height * factor)
+            pygame.transform.scale(self.surface.subsurface(rect), destination.size,
+                                   self._target_surface.subsurface(destination))
+            updated.append(destination.move(self.target.topleft))
+        pygame.display.update(updated)
@@ -0,0 +1,172 @@
+from collections import deque
+import pygame
+from models.controls import UP, DOWN, LEFT, RIGHT, DEFEND, ATTACK, ACTIONS, player1_controls, player2_controls
+
+# Mando: botones (numeración SDL de un mando tipo Xbox) y dirección por cruceta o stick izquierdo
+GAMEPAD_BUTTONS = {0: UP, 1: DEFEND, 2: ATTACK, 3: ATTACK}
+AXIS_DEADZONE = 0.5
+COMBO_HISTORY = 32  # Pulsaciones recordadas por jugador para detectar combos
+
+
+class InputState:
+    def __init__(self, controls):
+        """
+        Per-player input bitmasks fed by KEYDOWN/KEYUP and joystick events instead of polling.
+        `controls` is one keyboard binding (action -> key code) per player; gamepads are given
+        to players in the order they are connected.
+        A key pressed and released between two ticks still counts as held for the next tick.
+        """
+        self.gamepads = {}  # instance_id -> (Joystick, jugador)
+        self.tick_count = 0
+        self.rebind(controls)
+
+    def rebind(self, controls):
+        """
+        Switch to another set of players (e.g. a party with more fighters); held input is cleared
+        and gamepads keep their player when it still exists.
+        """
+        self.controls = controls
+        self.key_bits = {}  # código de tecla -> (jugador, bit)
+        for player, binding in enumerate(controls):
+            for bit, action in enumerate(ACTIONS):
+                self.key_bits[binding[action]] = (player, 1 << bit)
+
+        count = len(controls)
+        self.keyboard = [0] * count
+        self.pad_buttons = [0] * count
+        self.pad_hat = [0] * count
+        self.pad_axes = [0] * count
+        self.taps = [0] * count  # Pulsado desde el último tick, aunque ya se haya soltado
+        self.held = [0] * count  # Máscaras del último tick
+        self.pressed = [0] * count  # Bits que se activaron en el último tick
+        self.released = [0] * count  # Bits que se desactivaron en el último tick
+        self.history = [deque(maxlen=COMBO_HISTORY) for _ in range(count)]  # (tick, pulsados)
+        self.gamepads = {instance: pad for instance, pad in self.gamepads.items() if pad[1] < count}
+
+    def handle_event(self, event):
+        """
+        Update the masks from one pygame event; returns True when the event was an input event.
+        """
+        if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+            binding = self.key_bits.get(event.key)
+            if binding is None:
+                return False
+            player, bit = binding
+            if event.type == pygame.KEYDOWN:
+                self.keyboard[player] |= bit
+                self.taps[player] |= bit
+            else:
+                self.keyboard[player] &= ~bit
+            return True
+
+        if event.type == pygame.JOYDEVICEADDED:
+            self._add_gamepad(event.device_index)
+            return True
+        if event.type == pygame.JOYDEVICEREMOVED:
+            self._remove_gamepad(event.instance_id)
+            return True
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.release_all()  # Los KEYUP no llegan mientras la ventana no tiene el foco
+            return False
+
+        pad = self.gamepads.get(getattr(event, "instance_id", None))
+        if pad is None:
+            return False
+        player = pad[1]
+        if event.type in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+            bit = GAMEPAD_BUTTONS.get(event.button, 0)
+            if event.type == pygame.JOYBUTTONDOWN:
+                self.pad_buttons[player] |= bit
+                self.taps[player] |= bit
+            else:
+                self.pad_buttons[player] &= ~bit
+        elif event.type == pygame.JOYHATMOTION:
+            x, y = event.value
+            self.pad_hat[player] = (LEFT if x < 0 else RIGHT if x > 0 else 0) | (UP if y > 0 else DOWN if y < 0 else 0)
+            self.taps[player] |= self.pad_hat[player]
+        elif event.type == pygame.JOYAXISMOTION and event.axis in (0, 1):
+            negative, positive = (LEFT, RIGHT) if event.axis == 0 else (UP, DOWN)
+            mask = self.pad_axes[player] & ~(negative | positive)
+            if event.value <= -AXIS_DEADZONE:
+                mask |= negative
+            elif event.value >= AXIS_DEADZONE:
+                mask |= positive
+            self.pad_axes[player] = mask
+            self.taps[player] |= mask
+        else:
+            return False
+        return True
+
+    def _add_gamepad(self, device_index):
+        joystick = pygame.joystick.Joystick(device_index)
+        taken = {player for _, player in self.gamepads.values()}
+        free = [player for player in range(len(self.controls)) if player not in taken]
+        if free:
+            self.gamepads[joystick.get_instance_id()] = (joystick, free[0])
+
+    def _remove_gamepad(self, instance_id):
+        pad = self.gamepads.pop(instance_id, None)
+        if pad is not None:
+            player = pad[1]
+            self.pad_buttons[player] = self.pad_hat[player] = self.pad_axes[player] = 0
+
+    def sync_keyboard(self, pressed=None):
+        """
+        Take the keys already held (e.g. from the menu) from one pygame.key.get_pressed() call.
+        """
+        if pressed is None:
+            pressed = pygame.key.get_pressed()
+        self.keyboard = [0] * len(self.controls)
+        for key, (player, bit) in self.key_bits.items():
+            if pressed[key]:
+                self.keyboard[player] |= bit
+
+    def release_all(self):
+        """
+        Forget every held key and button (the gamepads stay assigned).
+        """
+        count = len(self.controls)
+        self.keyboard = [0] * count
+        self.pad_buttons = [0] * count
+        self.pad_hat = [0] * count
+        self.pad_axes = [0] * count
+        self.taps = [0] * count
+
+    def tick(self):
+        """
+        Close one simulation tick: returns the mask of each player and updates the pressed/released edges.
+        """
+        self.tick_count += 1
+        for player in range(len(self.controls)):
+            mask = (self.keyboard[player] | self.pad_buttons[player] | self.pad_hat[player] | self.pad_axes[player]
+                    | self.taps[player])
+            previous = self.held[player]
+            self.pressed[player] = mask & ~previous
+            self.released[player] = previous & ~mask
+            self.held[player] = mask
+            if self.pressed[player]:
+                self.history[player].append((self.tick_count, self.pressed[player]))
+        self.taps = [0] * len(self.controls)
+        return list(self.held)
+
+    def combo(self, player, sequence, window=20):
+        """
+        True when `player` pressed the masks of `sequence` in order (other presses may come in
+        between) within the last `window` ticks, ending with the press of this tick.
+        """
+        if not self.pressed[player] & sequence[-1]:
+            return False
+        oldest = self.tick_count - window
+        remaining = list(sequence)
+        for tick, pressed in reversed(self.history[player]):
+            if tick <= oldest:
+                return False
+            if pressed & remaining[-1]:
+                remaining.pop()
+                if not remaining:
+                    return True
+        return False
+
+
+# Estado de entrada compartido por el menú y el combate, para no perder los mandos conectados antes de jugar
+player_input = InputState([player1_controls, player2_controls])
@@ -0,0 +1,218 @@
+import json
+import mmap
+import os
+import struct
+import pygame
+from core.assets import DISK_CACHE_ENV, ROOT_DIR, asset_path
+from models.DiagonalPlatform import DiagonalPlatform
+from models.level_geometry import CELL_SIZE, LevelGeometry
+
+LEVELS_DIR = asset_path("levels")
+# Escenarios compilados al cargarlos porque su .json es más nuevo que el .lvl del repositorio
+LEVEL_CACHE_DIR = os.path.join(os.environ.get(DISK_CACHE_ENV) or os.path.join(ROOT_DIR, ".cache"), "levels")
+
+LEVEL_MAGIC = b"SWLV"
+LEVEL_VERSION = 1
+# magic, versión, tamaño de celda, opciones, puntos de aparición, colliders, plataformas,
+# celdas de colliders, celdas de plataformas, índices de colliders, índices de plataformas, bytes de texto
+LEVEL_HEADER = struct.Struct("<4sHHBBHHHHHHH")
+SPAWN = struct.Struct("<ii")
+COLLIDER = struct.Struct("<iiii")
+PLATFORM = struct.Struct("<iiiidd")  # extremos, pendiente y ordenada en el origen ya calculadas
+CELL = struct.Struct("<hhHH")  # columna, fila, primer índice, cantidad
+INDEX = struct.Struct("<H")
+
+SHOW_GEOMETRY = 1  # Opción: dibujar la geometría (escenarios sin arte propio)
+
+_levels = {}
+
+
+class Level:
+    def __init__(self, name, background, spawns, colliders, diagonal_platforms, geometry, show_geometry=False):
+        """
+        A stage: its background image (relative to assets/), fighter spawn points,
+        collision geometry and the LevelGeometry index over it.
+        `key` is the name it was loaded by (see load_level), e.g. for replays; None if built otherwise.
+        """
+        self.name = name
+        self.key = None
+        self.background = background
+        self.spawns = spawns
+        self.colliders = colliders
+        self.diagonal_platforms = diagonal_platforms
+        self.geometry = geometry
+        self.show_geometry = show_geometry
+
+
+def level_names():
+    """
+    Names of the stages shipped in assets/levels, in menu order.
+    """
+    return sorted(os.path.splitext(file)[0] for file in os.listdir(LEVELS_DIR) if file.endswith(".json"))
+
+
+def merge_rects(rects):
+    """
+    Merge rects that touch or overlap along a full edge (same row band or same column band)
+    into one, so the collision loops see fewer, larger colliders.
+    The order is kept except that a merged rect takes the place of its first part, so the parts
+    that came later move ahead of the rects between them. Collisions take the first collider hit,
+    but the merged parts share the edge a fighter is pushed to, so they resolve the same (the
+    shipped stages are checked against their unmerged JSON in tests/test_levels.py).
+    """
+    rects = [pygame.Rect(rect) for rect in rects]
+    merged = True
+    while merged:
+        merged = False
+        for i, a in enumerate(rects):
+            for j in range(i + 1, len(rects)):
+                b = rects[j]
+                same_row = a.top == b.top and a.height == b.height and a.left <= b.right and b.left <= a.right
+                same_column = a.left == b.left and a.width == b.width and a.top <= b.bottom and b.top <= a.bottom
+                if same_row or same_column:
+                    rects[i] = a.union(b)
+                    del rects[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return rects
+
+
+def build_level(source):
+    """
+    Build a Level from its authoring form (the parsed JSON document), doing all the preprocessing.
+    """
+    colliders = merge_rects(source["colliders"])
+    diagonal_platforms = [DiagonalPlatform(*points) for points in source["slopes"]]
+    geometry = LevelGeometry(colliders, diagonal_platforms, source.get("cell_size", CELL_SIZE))
+    return Level(source["name"], source["background"], [tuple(spawn) for spawn in source["spawns"]], colliders,
+                 diagonal_platforms, geometry, source.get("show_geometry", False))
+
+
+def _pack_cells(cells):
+    entries, indices = bytearray(), bytearray()
+    count = 0
+    for (column, row), members in sorted(cells.items()):
+        entries += CELL.pack(column, row, count, len(members))
+        for index in members:
+            indices += INDEX.pack(index)
+        count += len(members)
+    return bytes(entries), bytes(indices), len(cells), count
+
+
+def level_to_bytes(level):
+    """
+    Compiled form of a level: fixed-size records behind a header, ready to be memory-mapped.
+    """
+    geometry = level.geometry
+    text = f"{level.name}\n{level.background}".encode("utf-8")
+    collider_cells, collider_indices, collider_cell_count, collider_index_count = _pack_cells(geometry.collider_cells)
+    platform_cells, platform_indices, platform_cell_count, platform_index_count = _pack_cells(geometry.platform_cells)
+    parts = [LEVEL_HEADER.pack(LEVEL_MAGIC, LEVEL_VERSION, geometry.cell_size,
+                               SHOW_GEOMETRY if level.show_geometry else 0, len(level.spawns), len(level.colliders),
+                               len(level.diagonal_platforms), collider_cell_count, platform_cell_count,
+                               collider_index_count, platform_index_count, len(text))]
+    parts += [SPAWN.pack(*spawn) for spawn in level.spawns]
+    parts += [COLLIDER.pack(*collider) for collider in level.colliders]
+    parts += [PLATFORM.pack(platform.x1, platform.y1, platform.x2, platform.y2, platform.slope, platform.y_intercept)
+              for platform in level.diagonal_platforms]
+    parts += [collider_cells, platform_cells, collider_indices, platform_indices, text]
+    return b"".join(parts)
+
+
+def _read_records(data, offset, record, count):
+    return list(record.iter_unpack(data[offset:offset + record.size * count])), offset + record.size * count
+
+
+def _read_cells(data, offset, cell_count, indices_offset):
+    cells = {}
+    records, offset = _read_records(data, offset, CELL, cell_count)
+    for column, row, start, count in records:
+        cells[(column, row)] = [index for (index,) in INDEX.iter_unpack(
+            data[indices_offset + start * INDEX.size:indices_offset + (start + count) * INDEX.size])]
+    return cells, offset
+
+
+def level_from_bytes(data, path="<level>"):
+    """
+    Rebuild a Level from its compiled form; nothing is parsed or recomputed, only unpacked.
+    """
+    (magic, version, cell_size, options, spawn_count, collider_count, platform_count, collider_cell_count,
+     platform_cell_count, collider_index_count, platform_index_count, text_size) = LEVEL_HEADER.unpack_from(data)
+    if magic != LEVEL_MAGIC or version != LEVEL_VERSION:
+        raise ValueError(f"'{path}' is not a compiled level (version {LEVEL_VERSION})")
+
+    offset = LEVEL_HEADER.size
+    spawns, offset = _read_records(data, offset, SPAWN, spawn_count)
+    colliders, offset = _read_records(data, offset, COLLIDER, collider_count)
+    colliders = [pygame.Rect(collider) for collider in colliders]
+    platforms, offset = _read_records(data, offset, PLATFORM, platform_count)
+    diagonal_platforms = [DiagonalPlatform(*platform) for platform in platforms]
+
+    indices_offset = offset + CELL.size * (collider_cell_count + platform_cell_count)
+    platform_indices_offset = indices_offset + INDEX.size * collider_index_count
+    collider_cells, offset = _read_cells(data, offset, collider_cell_count, indices_offset)
+    platform_cells, offset = _read_cells(data, offset, platform_cell_count, platform_indices_offset)
+    offset = platform_indices_offset + INDEX.size * platform_index_count
+
+    name, background = bytes(data[offset:offset + text_size]).decode("utf-8").split("\n")
+    geometry = LevelGeometry.from_cells(colliders, diagonal_platforms, cell_size, collider_cells, platform_cells)
+    return Level(name, background, spawns, colliders, diagonal_platforms, geometry, bool(options & SHOW_GEOMETRY))
+
+
+def compile_level(source_path, output_path):
+    """
+    Compile an authoring JSON level into its binary form; returns the built Level.
+    """
+    with open(source_path, encoding="utf-8") as file:
+        level = build_level(json.load(file))
+    with open(output_path, "wb") as file:
+        file.write(level_to_bytes(level))
+    return level
+
+
+def read_compiled_level(path):
+    """
+    Load a compiled level through a read-only memory map.
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        view = memoryview(data)
+        try:
+            return level_from_bytes(view, path)
+        finally:
+            view.release()
+
+
+def _up_to_date(compiled, source):
+    return os.path.exists(compiled) and (not os.path.exists(source)
+                                         or os.path.getmtime(compiled) >= os.path.getmtime(source))
+
+
+def load_level(name):
+    """
+    Load a stage by name from assets/levels, once per process.
+    The compiled `.lvl` next to it (written by tools.compile_levels) is used when it is at least as new
+    as its `.json` source. Otherwise the source is built and compiled into LEVEL_CACHE_DIR, never into
+    the assets tree, and later runs read it from there (if the cache cannot be written it is only built).
+    """
+    level = _levels.get(name)
+    if level is not None:
+        return level
+    source = os.path.join(LEVELS_DIR, name + ".json")
+    shipped = os.path.join(LEVELS_DIR, name + ".lvl")
+    cached = os.path.join(LEVEL_CACHE_DIR, name + ".lvl")
+    if _up_to_date(shipped, source):
+        level = read_compiled_level(shipped)
+    elif _up_to_date(cached, source):
+        level = read_compiled_level(cached)
+    else:
+        try:
+            os.makedirs(LEVEL_CACHE_DIR, exist_ok=True)
+            level = compile_level(source, cached)
+        except OSError:
+            with open(source, encoding="utf-8") as file:
+                level = build_level(json.load(file))
+    level.key = name
+    _levels[name] = level
+    return level
@@ -0,0 +1,210 @@
+import math
+from collections import deque, namedtuple
+from itertools import repeat
+import numpy as np
+import pygame
+
+MAX_PARTICLES = 8192  # Capacidad fija del depósito; las ráfagas que no caben se descartan
+FADE_LEVELS = 8  # Sprites por efecto, del recién nacido al que se apaga
+
+# Filas del estado: cada partícula es una columna
+X, Y, VX, VY, AGE, LIFE, GRAVITY, KIND = range(8)
+FIELDS = 8
+
+# Ráfaga de un evento: partículas, color, velocidad (px/tick), dirección y apertura en grados (0 = hacia
+# donde mira el luchador, -90 = arriba), vida en ticks, gravedad (px/tick²), radio en px y punto de origen
+ParticleEffect = namedtuple("ParticleEffect", "count color speed angle spread lifetime gravity size anchor")
+
+EFFECTS = {
+    "hit": ParticleEffect(24, (255, 190, 70), (3.0, 8.0), 0, 70, (10, 22), 0.3, 4, "front"),
+    "block": ParticleEffect(18, (90, 160, 255), (2.0, 6.0), 0, 80, (8, 16), 0.0, 4, "front"),
+    "hurt": ParticleEffect(12, (255, 50, 40), (1.0, 4.0), -90, 140, (14, 26), 0.2, 3, "center"),
+    "land": ParticleEffect(16, (120, 100, 80), (0.5, 3.0), -90, 170, (18, 30), 0.08, 5, "feet"),
+    "jump": ParticleEffect(8, (100, 85, 70), (0.5, 2.0), -90, 150, (12, 20), 0.05, 4, "feet"),
+}
+EFFECT_NAMES = tuple(EFFECTS)
+
+_sprites = {}  # escala -> (sprites por tipo y nivel, mitad de su tamaño)
+
+
+def effect_sprites(scale=1):
+    """
+    Pre-tinted glow sprites of every effect at `scale`, FADE_LEVELS per effect (dimmer and smaller
+    as they fade), plus half their size in pixels. Black is transparent under additive blending.
+    """
+    cached = _sprites.get(scale)
+    if cached is not None:
+        return cached
+    sprites = []
+    half = np.zeros(len(EFFECTS) * FADE_LEVELS, dtype=np.float32)
+    converted = pygame.display.get_surface() is not None
+    for effect in EFFECTS.values():
+        for level in range(FADE_LEVELS):
+            strength = (level + 1) / FADE_LEVELS
+            radius = max(1, round(effect.size * scale * (0.4 + 0.6 * strength)))
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+            # Círculos concéntricos: el centro brilla más que el borde
+            for ring in range(radius, 0, -1):
+                glow = strength * (1 - (ring - 1) / radius)
+                pygame.draw.circle(sprite, [round(channel * glow) for channel in effect.color],
+                                   (radius, radius), ring)
+            half[len(sprites)] = radius
+            sprites.append(sprite.convert() if converted else sprite)
+    _sprites[scale] = sprites, half
+    return sprites, half
+
+
+class ParticleSystem:
+    def __init__(self, scale=1, capacity=MAX_PARTICLES, seed=None):
+        """
+        Hit sparks, block flashes and dust from the fighters' events ("hit", "block", "hurt", "land", "jump").
+        Particles live in preallocated arrays (one column each, the live ones packed at the front):
+        update() moves them all in one vectorized pass and draw() blits cached sprites additively.
+        Nothing is allocated per particle and the pool never grows, so the cost is flat in steady state.
+        trigger() only queues the event, so the simulation may call it from any thread (e.g. as a
+        Player.listener on core.pipeline's simulation thread); update() spawns the queued bursts.
+        """
+        self.scale = scale
+        self.capacity = capacity
+        self.state = np.zeros((FIELDS, capacity), dtype=np.float32)
+        self._spare = np.zeros_like(self.state)  # Destino de la compactación, se intercambia con state
+        self._scratch = np.zeros((2, capacity), dtype=np.float32)
+        self._keep = np.zeros(capacity, dtype=bool)
+        self._sprite = np.zeros(capacity, dtype=np.intp)
+        self._position = np.zeros((2, capacity), dtype=np.int32)
+        self._random = np.random.default_rng(seed)
+        self.count = 0
+        self.pending = deque()
+        self.spawned = self.dropped = 0
+
+    def trigger(self, event, player):
+        """
+        Queue the burst of `event` at `player`'s current position; never blocks. Usable as a Player.listener.
+        """
+        if event in EFFECTS:
+            rect = player.rect
+            self.pending.append((event, rect.left, rect.right, rect.centery, rect.bottom, player.facing_left))
+
+    def update(self, ticks=1):
+        """
+        Spawn the queued bursts and advance every particle `ticks` simulation ticks at once.
+        """
+        while self.pending:
+            self._spawn(*self.pending.popleft())
+        count = self.count
+        if count == 0 or ticks <= 0:
+            return
+
+        x, y, vx, vy, age, life, gravity, kind = self.state[:, :count]
+        step = self._scratch[0, :count]
+        # Euler semiimplícito (v += g; p += v) de `ticks` ticks en forma cerrada
+        np.multiply(vx, ticks, out=step)
+        x += step
+        np.multiply(vy, ticks, out=step)
+        y += step
+        np.multiply(gravity, ticks * (ticks + 1) / 2, out=step)
+        y += step
+        np.multiply(gravity, ticks, out=step)
+        vy += step
+        age += ticks
+
+        # Compactar las vivas al principio copiando a la matriz de reserva
+        keep = self._keep[:count]
+        np.less(age, life, out=keep)
+        alive = int(np.count_nonzero(keep))
+        if alive < count:
+            np.compress(keep, self.state[:, :count], axis=1, out=self._spare[:, :alive])
+            self.state, self._spare = self._spare, self.state
+            self.count = alive
+
+    def _spawn(self, event, left, right, center_y, bottom, facing_left):
+        effect = EFFECTS[event]
+        start = self.count
+        count = min(effect.count, self.capacity - start)
+        self.dropped += effect.count - count
+        if count <= 0:
+            return
+        if effect.anchor == "front":
+            origin = (left if facing_left else right), center_y
+        elif effect.anchor == "feet":
+            origin = (left + right) / 2, bottom
+        else:
+            origin = (left + right) / 2, center_y
+
+        x, y, vx, vy, age, life, gravity, kind = self.state[:, start:start + count]
+        angle, speed = self._scratch[:, :count]
+        direction = math.radians(effect.angle)
+        if facing_left:
+            direction = math.pi - direction
+        self._random.random(out=angle, dtype=np.float32)
+        angle -= 0.5
+        angle *= math.radians(effect.spread)
+        angle += direction
+        self._random.random(out=speed, dtype=np.float32)
+        speed *= effect.speed[1] - effect.speed[0]
+        speed += effect.speed[0]
+        np.cos(angle, out=vx)
+        vx *= speed
+        np.sin(angle, out=vy)
+        vy *= speed
+        self._random.random(out=life, dtype=np.float32)
+        life *= effect.lifetime[1] - effect.lifetime[0]
+        life += effect.lifetime[0]
+        x.fill(origin[0])
+        y.fill(origin[1])
+        age.fill(0)
+        gravity.fill(effect.gravity)
+        kind.fill(EFFECT_NAMES.index(event))
+        self.count += count
+        self.spawned += count
+
+    def bounds(self):
+        """
+        Screen rect covering every live particle at this system's scale, or None when there are none.
+        """
+        if self.count == 0:
+            return None
+        x, y = self.state[X, :self.count], self.state[Y, :self.count]
+        margin = max(effect.size for effect in EFFECTS.values()) * self.scale + 1
+        left, top = math.floor(x.min() * self.scale - margin), math.floor(y.min() * self.scale - margin)
+        right, bottom = math.ceil(x.max() * self.scale + margin), math.ceil(y.max() * self.scale + margin)
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    def draw(self, screen):
+        """
+        Blit every live particle additively, with the sprite of its effect and fade level.
+        """
+        count = self.count
+        if count == 0:
+            return
+        sprites, half = effect_sprites(self.scale)
+        x, y, vx, vy, age, life, gravity, kind = self.state[:, :count]
+        level, offset = self._scratch[:, :count]
+        sprite = self._sprite[:count]
+
+        # Nivel de desvanecimiento: FADE_LEVELS - 1 al nacer, 0 al final de la vida
+        np.divide(age, life, out=level)
+        np.subtract(1, level, out=level)
+        level *= FADE_LEVELS
+        np.clip(level, 0, FADE_LEVELS - 1, out=level)
+        np.floor(level, out=level)
+        np.multiply(kind, FADE_LEVELS, out=offset)
+        level += offset
+        np.copyto(sprite, level, casting="unsafe")
+
+        # Esquina superior izquierda de cada sprite en píxeles de la pantalla
+        position_x, position_y = self._position[:, :count]
+        np.take(half, sprite, out=offset)
+        np.multiply(x, self.scale, out=level)
+        level -= offset
+        np.copyto(position_x, level, casting="unsafe")
+        np.multiply(y, self.scale, out=level)
+        level -= offset
+        np.copyto(position_y, level, casting="unsafe")
+
+        screen.blits(zip(map(sprites.__getitem__, sprite.tolist()), zip(position_x.tolist(), position_y.tolist()),
+                         repeat(None), repeat(pygame.BLEND_RGB_ADD)), doreturn=False)
+
+    def clear(self):
+        self.pending.clear()
+        self.count = 0
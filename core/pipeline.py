@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+# Estado visible de un luchador en un tick: todo lo que necesita Player.render()
+FighterFrame = namedtuple("FighterFrame", "x y facing_left animation frame health")
+
+# Fotograma publicado por la simulación: el tick, cuándo se publicó, el ganador y los luchadores
+# antes y después del tick, para que el hilo de dibujo interpole entre ambos
+FrameSnapshot = namedtuple("FrameSnapshot", "tick published winner previous fighters")
+
+MAX_CATCH_UP = 0.25  # s de retraso a partir de los cuales la simulación deja de intentar recuperarlos
+
+
+def fighter_frames(match):
+    """
+    Immutable visible state of every fighter of `match`.
+    """
+    return tuple(FighterFrame(player.rect.x, player.rect.y, player.facing_left, player.current_animation,
+                              player.current_frame, player.health) for player in match.players)
+
+
+class TripleBuffer:
+    def __init__(self, initial=None):
+        """
+        Latest-value hand-off between one writer and one reader thread.
+        The writer always has a free slot to publish into and the reader keeps the slot it
+        is using, so neither ever waits for the other; the lock only guards an index swap.
+        """
+        self.slots = [initial, initial, initial]
+        self.write_index, self.ready_index, self.read_index = 0, 1, 2
+        self.fresh = False
+        self.published = 0
+        self._lock = threading.Lock()
+
+    def publish(self, value):
+        self.slots[self.write_index] = value
+        with self._lock:
+            self.write_index, self.ready_index = self.ready_index, self.write_index
+            self.fresh = True
+            self.published += 1
+
+    def latest(self):
+        """
+        The most recently published value (the same as last time if nothing new arrived).
+        """
+        with self._lock:
+            if self.fresh:
+                self.read_index, self.ready_index = self.ready_index, self.read_index
+                self.fresh = False
+        return self.slots[self.read_index]
+
+
+class SimulationThread(threading.Thread):
+    def __init__(self, match, next_masks, input_lock=None, on_tick=None):
+        """
+        Steps `match` at its fixed tick rate on its own thread and publishes a FrameSnapshot per tick.
+        `next_masks()` returns the input masks for the next tick, or None to stop (e.g. a replay ran out);
+        it is called while holding `input_lock`, which the thread handling events must also take.
+        Ticks are scheduled against absolute deadlines, so a stalled renderer neither delays nor
+        bunches them up; if the thread itself falls more than MAX_CATCH_UP behind, it skips ahead.
+        `on_tick(match)` runs on this thread after every tick (e.g. SpectatorServer.publish).
+        """
+        super().__init__(name="simulation", daemon=True)
+        self.match = match
+        self.next_masks = next_masks
+        self.input_lock = input_lock or threading.Lock()
+        self.on_tick = on_tick
+        fighters = fighter_frames(match)
+        self.buffer = TripleBuffer(FrameSnapshot(match.tick, time.perf_counter(), match.winner, fighters, fighters))
+        self.step_times = deque(maxlen=600)  # s de CPU de los últimos ticks, para medir el coste de la simulación
+        self.late_ticks = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    @property
+    def finished(self):
+        return not self.is_alive()
+
+    def run(self):
+        match = self.match
+        tick_seconds = match.tick_ms / 1000
+        previous = fighter_frames(match)
+        deadline = time.perf_counter()
+        while not self._stop_event.is_set() and not match.is_over():
+            with self.input_lock:
+                masks = self.next_masks()
+            if masks is None:
+                break
+            began = time.perf_counter()
+            match.step(masks)
+            if self.on_tick is not None:
+                self.on_tick(match)
+            fighters = fighter_frames(match)
+            now = time.perf_counter()
+            self.buffer.publish(FrameSnapshot(match.tick, now, match.winner, previous, fighters))
+            self.step_times.append(now - began)
+            previous = fighters
+
+            deadline += tick_seconds
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            elif delay < -MAX_CATCH_UP:
+                self.late_ticks += 1
+                deadline = time.perf_counter()
+
+
+def interpolate(previous, current, alpha):
+    """
+    Fighter positions between two ticks (`alpha` from 0 to 1); everything else comes from `current`.
+    """
+    return tuple(fighter._replace(x=round(before.x + (fighter.x - before.x) * alpha),
+                                  y=round(before.y + (fighter.y - before.y) * alpha))
+                 for before, fighter in zip(previous, current))
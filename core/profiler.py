@@ -0,0 +1,157 @@
+import json
+import os
+import time
+from collections import deque
+import pygame
+
+# Ruta del volcado JSON; si está definida, el perfilador se activa al arrancar
+PROFILE_ENV = "FIGHTING_GAME_PROFILE"
+
+HUD_KEY = pygame.K_F3
+HUD_REFRESH_FRAMES = 15  # El HUD se vuelve a renderizar cada tantos fotogramas
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    def __init__(self, window=600, target_fps=60):
+        """
+        Per-phase frame timer with rolling p50/p95/p99 over the last `window` frames.
+        Phases are timed with lap(name), which adds the time since the previous lap;
+        every call returns immediately while the profiler is disabled.
+        """
+        self.enabled = False
+        self.hud_visible = False
+        self.window = window
+        self.budget_ms = 1000 / target_fps
+        self.phases = {}  # fase -> deque de ms por fotograma
+        self.frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.dropped_frames = 0
+        self._current = {}
+        self._frame_start = None
+        self._last_lap = 0.0
+        self._hud = None
+        self._hud_age = 0
+        self._font = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            frame_ms = (now - self._frame_start) * 1000
+            self.frame_times.append(frame_ms)
+            self.frames += 1
+            # Un intervalo de más de 1,5 presupuestos significa que se perdió al menos un refresco
+            if frame_ms > self.budget_ms * 1.5:
+                self.dropped_frames += 1
+            for name, elapsed in self._current.items():
+                self.phases.setdefault(name, deque(maxlen=self.window)).append(elapsed)
+        self._current = {}
+        self._frame_start = now
+        self._last_lap = now
+
+    def lap(self, name):
+        """
+        Charge the time since the previous lap (or the start of the frame) to phase `name`.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._current[name] = self._current.get(name, 0.0) + (now - self._last_lap) * 1000
+        self._last_lap = now
+
+    def skip(self):
+        """
+        Restart the lap timer without charging the elapsed time to any phase (e.g. the frame-cap wait).
+        """
+        if self.enabled:
+            self._last_lap = time.perf_counter()
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self._frame_start = None
+
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
+        if self.hud_visible:
+            self.set_enabled(True)
+        elif not os.environ.get(PROFILE_ENV):
+            self.set_enabled(False)
+        self._hud = None
+
+    def handle_event(self, event):
+        """
+        Toggle the HUD on F3; returns True when the event was consumed.
+        """
+        if event.type == pygame.KEYDOWN and event.key == HUD_KEY:
+            self.toggle_hud()
+            return True
+        return False
+
+    def stats(self):
+        """
+        Rolling statistics per phase and for the whole frame, in milliseconds.
+        """
+        result = {"frames": self.frames, "dropped_frames": self.dropped_frames, "phases": {}}
+        for name, values in list(self.phases.items()) + [("frame", self.frame_times)]:
+            ordered = sorted(values)
+            result["phases"][name] = {
+                "p50": round(percentile(ordered, 0.50), 3),
+                "p95": round(percentile(ordered, 0.95), 3),
+                "p99": round(percentile(ordered, 0.99), 3),
+                "max": round(ordered[-1], 3) if ordered else 0.0,
+            }
+        return result
+
+    def dump(self, path=None):
+        """
+        Write the current statistics as JSON, by default to the path in FIGHTING_GAME_PROFILE.
+        """
+        path = path or os.environ.get(PROFILE_ENV)
+        if not path or not self.frames:
+            return
+        with open(path, "w") as file:
+            json.dump(self.stats(), file, indent=2)
+
+    def hud_overlay(self, x=10, y=10):
+        """
+        (surface, rect) of the HUD, or None when hidden. The text is only re-rendered every few frames.
+        """
+        if not self.hud_visible:
+            return None
+        if self._font is None:
+            self._font = pygame.font.Font(None, 20)
+        font = self._font
+        self._hud_age += 1
+        if self._hud is None or self._hud_age >= HUD_REFRESH_FRAMES:
+            self._hud_age = 0
+            stats = self.stats()
+            lines = [f"frames {stats['frames']}  dropped {stats['dropped_frames']}", "phase  p50 / p95 / p99 ms"]
+            for name, values in stats["phases"].items():
+                lines.append(f"{name}  {values['p50']:.2f} / {values['p95']:.2f} / {values['p99']:.2f}")
+            rendered = [font.render(line, True, (255, 255, 255)) for line in lines]
+            width = max(surface.get_width() for surface in rendered) + 12
+            height = sum(surface.get_height() for surface in rendered) + 12
+            hud = pygame.Surface((width, height), pygame.SRCALPHA)
+            hud.fill((0, 0, 0, 170))
+            offset = 6
+            for surface in rendered:
+                hud.blit(surface, (6, offset))
+                offset += surface.get_height()
+            self._hud = hud
+        return self._hud, self._hud.get_rect(topleft=(x, y))
+
+
+# Perfilador compartido por el bucle principal y la vista del juego
+profiler = FrameProfiler()
+profiler.set_enabled(bool(os.environ.get(PROFILE_ENV)))
@@ -0,0 +1,137 @@
+import struct
+import zlib
+from core.levels import load_level
+from models.match import Match, create_players
+from models.party import create_party
+from models.stage import DEFAULT_LEVEL
+
+REPLAY_MAGIC = b"SWRP"
+REPLAY_VERSION = 2
+LEVEL_NAME_SIZE = 32  # Bytes para el nombre del escenario en la cabecera
+# magic, versión, ticks por segundo, jugadores, ticks grabados, opciones y escenario (nombre de load_level)
+REPLAY_HEADER = struct.Struct(f"<4sHHBIB{LEVEL_NAME_SIZE}s")
+SWEPT_COLLISION = 1  # Opción: el combate caía con Player.apply_gravity_swept
+
+
+def _level_field(level):
+    """
+    The level name as stored in the header.
+    """
+    if level is None:
+        raise ValueError("Replays need a level loaded by name (core.levels.load_level)")
+    field = level.encode("utf-8")
+    if len(field) > LEVEL_NAME_SIZE:
+        raise ValueError(f"Level name '{level}' is too long for a replay header")
+    return field
+
+
+class ReplayRecorder:
+    def __init__(self, tick_rate, player_count=2, level=DEFAULT_LEVEL, swept_collision=False):
+        """
+        Collect one input bitmask byte per player and tick; save() writes them zlib-compressed.
+        The header also keeps what replay_match() needs to rebuild the match: the `level` name,
+        the fighter count (two for a versus match, more for a free-for-all) and the collision mode.
+        """
+        self.tick_rate = tick_rate
+        self.player_count = player_count
+        self.level = level
+        self.swept_collision = swept_collision
+        self._level_field = _level_field(level)
+        self.inputs = bytearray()
+
+    @classmethod
+    def for_match(cls, match, level):
+        """
+        Recorder for `match`, played on `level` (a core.levels.Level).
+        """
+        return cls(match.tick_rate, len(match.players), level.key, match.swept_collision)
+
+    @property
+    def ticks(self):
+        return len(self.inputs) // self.player_count
+
+    def record(self, masks):
+        """
+        Append the masks of one tick (one per player, in player order).
+        """
+        if len(masks) != self.player_count:
+            raise ValueError(f"Expected {self.player_count} input masks, got {len(masks)}")
+        self.inputs.extend(masks)
+
+    def save(self, path):
+        flags = SWEPT_COLLISION if self.swept_collision else 0
+        with open(path, "wb") as file:
+            file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.tick_rate, self.player_count, self.ticks,
+                                          flags, self._level_field))
+            file.write(zlib.compress(bytes(self.inputs), 9))
+
+
+class Replay:
+    def __init__(self, tick_rate, player_count, inputs, level=DEFAULT_LEVEL, swept_collision=False):
+        """
+        Recorded per-tick input bitmasks of a match, with the level and rules it was played with.
+        """
+        self.tick_rate = tick_rate
+        self.player_count = player_count
+        self.inputs = inputs
+        self.level = level
+        self.swept_collision = swept_collision
+
+    @property
+    def ticks(self):
+        return len(self.inputs) // self.player_count
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < REPLAY_HEADER.size:
+            raise ValueError(f"'{path}' is not a replay file (version {REPLAY_VERSION})")
+        magic, version, tick_rate, player_count, ticks, flags, level = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"'{path}' is not a replay file (version {REPLAY_VERSION})")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"'{path}' is a version {version} replay, expected version {REPLAY_VERSION}")
+        inputs = zlib.decompress(data[REPLAY_HEADER.size:])
+        if len(inputs) != ticks * player_count:
+            raise ValueError(f"'{path}' is truncated: expected {ticks} ticks")
+        return cls(tick_rate, player_count, inputs, level.rstrip(b"\0").decode("utf-8"),
+                   bool(flags & SWEPT_COLLISION))
+
+    def masks(self, tick):
+        """
+        Input bitmasks of every player for one tick.
+        """
+        start = tick * self.player_count
+        return self.inputs[start:start + self.player_count]
+
+    def next_masks(self, match):
+        """
+        Recorded masks for the next tick of `match`.
+        """
+        return self.masks(match.tick)
+
+
+def replay_match(replay, player1_animations=None, player2_animations=None, use_atlas=False):
+    """
+    Rebuild the match a replay was recorded in: same level, fighters and collision mode.
+    Without animations it is headless; a free-for-all gives every fighter the animations of player 1.
+    """
+    level = load_level(replay.level)
+    if replay.player_count == 2:
+        players = create_players(player1_animations, player2_animations, use_atlas, level.spawns)
+        return Match(players, level.colliders, level.diagonal_platforms, replay.tick_rate, level.geometry,
+                     replay.swept_collision)
+    return create_party(replay.player_count, player1_animations, use_atlas, level, tick_rate=replay.tick_rate,
+                        swept_collision=replay.swept_collision)
+
+
+def run_replay(replay, match):
+    """
+    Re-simulate a replay headlessly as fast as possible; returns the winner (None if it did not finish).
+    """
+    if match.tick_rate != replay.tick_rate:
+        raise ValueError(f"Replay recorded at {replay.tick_rate} ticks/s, match runs at {match.tick_rate}")
+    if len(match.players) != replay.player_count:
+        raise ValueError(f"Replay recorded with {replay.player_count} fighters, match has {len(match.players)}")
+    return match.run(replay.next_masks, replay.ticks)
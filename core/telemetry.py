@@ -0,0 +1,279 @@
+import atexit
+import os
+import random
+import sqlite3
+import struct
+import threading
+import time
+from collections import deque
+from models.combat import DAMAGE
+
+TELEMETRY_ENV = "FIGHTING_GAME_TELEMETRY"  # Ruta de la base de datos; sin ella no se guarda nada
+
+EVENT_CAPACITY = 1 << 16  # Eventos en memoria a la espera del hilo de escritura
+FLUSH_INTERVAL = 1.0  # s entre escrituras a disco
+
+# Evento empaquetado: combate, tick, tipo, luchador (índice) y valor (daño recibido o bloqueado)
+EVENT = struct.Struct("<qIBBh")
+EVENT_NAMES = ("jump", "land", "hit", "hurt", "block", "ko")
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_NAMES)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY, started REAL, mode TEXT, level TEXT, fighters INTEGER, tick_rate INTEGER,
+    winner INTEGER, ticks INTEGER
+);
+CREATE TABLE IF NOT EXISTS fighters (match INTEGER, player INTEGER, name TEXT);
+CREATE TABLE IF NOT EXISTS events (match INTEGER, tick INTEGER, event INTEGER, player INTEGER, value INTEGER);
+"""
+
+
+class EventRing:
+    def __init__(self, capacity=EVENT_CAPACITY):
+        """
+        Preallocated ring of packed EVENT records between one or more producers and one consumer.
+        Appending packs into the next free slot; when the consumer falls a whole ring behind,
+        new events are dropped (and counted) instead of waiting for it.
+        """
+        self.capacity = capacity
+        self.buffer = bytearray(EVENT.size * capacity)
+        self.head = 0  # Eventos escritos desde el principio
+        self.tail = 0  # Eventos ya entregados al consumidor
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, match_id, tick, event, player, value):
+        with self._lock:
+            if self.head - self.tail >= self.capacity:
+                self.dropped += 1
+                return False
+            EVENT.pack_into(self.buffer, self.head % self.capacity * EVENT.size, match_id, tick, event, player, value)
+            self.head += 1
+        return True
+
+    def drain(self):
+        """
+        The pending records as bytes, oldest first, and the event count up to them. The copy is made
+        outside the lock: producers only write past `head`, which never reaches the slots being copied
+        until `tail` moves.
+        """
+        with self._lock:
+            tail, head = self.tail, self.head
+        if head == tail:
+            return b"", head
+        start, end = tail % self.capacity * EVENT.size, head % self.capacity * EVENT.size
+        if start < end:
+            data = bytes(self.buffer[start:end])
+        else:
+            data = bytes(self.buffer[start:]) + bytes(self.buffer[:end])
+        with self._lock:
+            self.tail = head
+        return data, head
+
+
+class TelemetryStore:
+    def __init__(self, path=None, capacity=EVENT_CAPACITY, flush_interval=FLUSH_INTERVAL):
+        """
+        Match telemetry saved to the SQLite database at `path` (in WAL mode); without a path it is disabled.
+        Events go into an EventRing and matches into a queue, so recording never touches the disk:
+        a background thread, started with the first match, writes them in one transaction every
+        `flush_interval` seconds.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.ring = EventRing(capacity)
+        self.matches = deque()  # ("begin" | "end", fila, luchadores) en orden
+        self.queued_matches = 0  # Filas de combates encoladas desde el principio
+        self.committed = 0  # Eventos ya guardados
+        self.committed_matches = 0
+        self.batches = 0
+        self.write_seconds = 0.0
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._closing = False
+        self._written = threading.Condition()
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def open(self, path):
+        """
+        Start saving to `path` (e.g. from a --telemetry option).
+        """
+        if self._thread is not None:
+            self.close()
+        self.path = path
+        return self
+
+    def begin_match(self, mode, fighters, tick_rate, level=None, started=None):
+        """
+        Register a match with the names of its `fighters` ("human" or a bot name); returns its id.
+        `started` is when it began (time.time(), now by default).
+        """
+        if not self.enabled:
+            return None
+        self._start()
+        match_id = random.getrandbits(63)
+        started = time.time() if started is None else started
+        self.matches.append(("begin", (match_id, started, mode, level, len(fighters), tick_rate),
+                             [(match_id, player, name) for player, name in enumerate(fighters)]))
+        self.queued_matches += 1
+        return match_id
+
+    def record(self, match_id, tick, event, player, value=0):
+        """
+        Queue one fighter event; never blocks on I/O. Returns False when it was dropped (ring full).
+        """
+        return self.ring.append(match_id, tick, EVENT_CODES[event], player, value)
+
+    def end_match(self, match_id, winner, ticks):
+        """
+        Store the result: the winner (0 for a draw, None if it was left unfinished) and its length in ticks.
+        """
+        if match_id is None:
+            return
+        self.matches.append(("end", (winner, ticks, match_id), None))
+        self.queued_matches += 1
+
+    def flush(self, timeout=None):
+        """
+        Wait until everything recorded so far is on disk; returns False on timeout.
+        """
+        if self._thread is None:
+            return True
+        target, target_matches = self.ring.head, self.queued_matches
+        self._wakeup.set()
+        with self._written:
+            return self._written.wait_for(
+                lambda: self.committed >= target and self.committed_matches >= target_matches, timeout)
+
+    def close(self, timeout=5.0):
+        """
+        Write what is left and stop the background thread.
+        """
+        if self._thread is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self._closing = False
+
+    def stats(self):
+        return {
+            "recorded": self.ring.head,
+            "committed": self.committed,
+            "dropped": self.ring.dropped,
+            "batches": self.batches,
+            "write_ms": self.write_seconds / max(1, self.batches) * 1000,
+        }
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)  # Lo pendiente se escribe también al salir con exit()
+
+    def _run(self):
+        connection = connect(self.path)
+        try:
+            while True:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                closing = self._closing
+                self._write(connection)
+                if closing:
+                    break
+        finally:
+            connection.close()
+
+    def _write(self, connection):
+        began = time.perf_counter()
+        data, head = self.ring.drain()
+        matches = [self.matches.popleft() for _ in range(len(self.matches))]
+        if data or matches:
+            with connection:
+                for kind, row, fighters in matches:
+                    if kind == "begin":
+                        connection.execute("INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, NULL, NULL)", row)
+                        connection.executemany("INSERT INTO fighters VALUES (?, ?, ?)", fighters)
+                    else:
+                        connection.execute("UPDATE matches SET winner = ?, ticks = ? WHERE id = ?", row)
+                connection.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?)", EVENT.iter_unpack(data))
+            self.batches += 1
+            self.write_seconds += time.perf_counter() - began
+        with self._written:
+            self.committed = head
+            self.committed_matches += len(matches)
+            self._written.notify_all()
+
+
+def connect(path):
+    """
+    Open (and create if needed) a telemetry database in WAL mode: readers such as tools.telemetry
+    never block the writer.
+    """
+    connection = sqlite3.connect(path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class MatchTelemetry:
+    def __init__(self, store, match, fighters, mode="versus", level=None):
+        """
+        Records one match into `store`: listener() is a Player.listener for every fighter and
+        finish() stores the result and who was knocked out. `fighters` names each player.
+        Every hit deals models.combat.DAMAGE, which is what a block stops.
+        The match is only registered with its first event or result, so one that never ran a tick
+        leaves no row behind.
+        """
+        self.store = store
+        self.match = match
+        self.index = {id(player): index for index, player in enumerate(match.players)}
+        self.health = [player.health for player in match.players]
+        self.details = (mode, fighters, match.tick_rate, level, time.time())
+        self.match_id = None
+        self.finished = False
+
+    def _begin(self):
+        if self.match_id is None:
+            self.match_id = self.store.begin_match(*self.details)
+        return self.match_id
+
+    def listener(self, event, player):
+        self._begin()
+        index = self.index[id(player)]
+        value = 0
+        if event == "hurt":
+            value = self.health[index] - player.health
+            self.health[index] = player.health
+        elif event == "block":
+            value = DAMAGE
+        self.store.record(self.match_id, self.match.tick, event, index, value)
+
+    def finish(self, timed_out=False):
+        """
+        Store the result once. Without a winner the match counts as a draw if it was stopped at its
+        tick limit (`timed_out`) and as unfinished otherwise (e.g. the game was closed). Nothing is
+        stored for a match that never ran a tick.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        match = self.match
+        if match.tick == 0 and self.match_id is None:
+            return
+        self._begin()
+        for index, player in enumerate(match.players):
+            if player.is_defeated():
+                self.store.record(self.match_id, match.tick, "ko", index)
+        winner = match.winner
+        if winner is None and timed_out:
+            winner = 0
+        self.store.end_match(self.match_id, winner, match.tick)
+
+
+telemetry = TelemetryStore(os.environ.get(TELEMETRY_ENV) or None)
@@ -1,77 +1,125 @@
 import pygame
 import os
-from views.menu import render_menu
-from views.instructions import render_instructions
-from views.game import render_game
+from views.menu import (render_menu, render_loading, menu_button_at, selected_level, next_stage, opponent_bot,
+                        next_opponent)
+from views.instructions import render_instructions, instructions_button_at
+from views.game import render_game, start_game, prefetch_game_assets, game_assets_ready, game_settings, PARTY_BOTS
+from core.assets import LazyAsset, samurai_animations_at
+from core.display import Display, display_settings
+from core.input import player_input
+from core.audio import MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER
+from core.profiler import profiler
 
-# Inicializar Pygame
+# Inicializar Pygame (con un búfer de audio corto para que los efectos suenen con poca latencia)
+pygame.mixer.pre_init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
 pygame.init()
-screen = pygame.display.set_mode((1280, 720))
+# Resolución interna de dibujo y de la ventana (ver core.display), p. ej. baja en equipos modestos
+window_size, render_size, smooth_scale = display_settings()
+display = Display.open(window_size, render_size, smooth_scale)
+screen = display.surface
 pygame.display.set_caption("Fighting Game")
 clock = pygame.time.Clock()
 
-# Cargar música de fondo
+# Música de fondo (el archivo no se distribuye con el repositorio)
 music_path = os.path.join(os.path.dirname(__file__), "assets/musica.mp3")
-pygame.mixer.music.load(music_path)
-pygame.mixer.music.set_volume(0.5)  # Ajustar el volumen (0.0 a 1.0)
-pygame.mixer.music.play(-1)  # Reproducir en bucle infinito
-
-# Cargar recursos (sprites, sonidos, etc.)
-current_dir = os.path.dirname(__file__)
-
-# Cargar hojas de sprites para los diferentes estados de los jugadores
-player1_sprites = {
-    "idle": pygame.image.load(os.path.join(current_dir, "assets/game/samurai/IDLE.png")).convert_alpha(),
-    "running": pygame.image.load(os.path.join(current_dir, "assets/game/samurai/RUN.png")).convert_alpha(),
-    "jumping": pygame.image.load(os.path.join(current_dir, "assets/game/samurai/RUN.png")).convert_alpha(),
-    "attacking": pygame.image.load(os.path.join(current_dir, "assets/game/samurai/ATTACK.png")).convert_alpha(),
-}
-
-player2_sprites = {
-    "idle": pygame.image.load(os.path.join(current_dir, "assets/game/samurai/IDLE.png")).convert_alpha(),
-    "running": pygame.image.load(os.path.join(current_dir, "assets/game/samurai/RUN.png")).convert_alpha(),
-    "jumping": pygame.image.load(os.path.join(current_dir, "assets/game/samurai/RUN.png")).convert_alpha(),
-    "attacking": pygame.image.load(os.path.join(current_dir, "assets/game/samurai/ATTACK.png")).convert_alpha(),
-}
+
+
+def load_music():
+    """
+    Cargar la música si existe; devuelve si quedó lista para reproducirse.
+    """
+    if not os.path.exists(music_path):
+        return False
+    pygame.mixer.music.load(music_path)
+    return True
+
+
+# Solo el menú se carga de forma síncrona; la música, el fondo del combate y las animaciones
+# (compartidas por ambos jugadores) se precargan en segundo plano mientras se muestra el menú
+music = LazyAsset(load_music).prefetch()
+music_started = False
+prefetch_game_assets(size=display.render_size)
 
 # Control del estado del juego
 running = True
 current_view = "menu"
+RESULT_SCREEN_MS = 2000  # Tiempo que queda a la vista el último fotograma del combate antes de volver al menú
+result_until = 0
 
 while running:
+    profiler.begin_frame()
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
 
+        # F3 muestra u oculta el HUD de rendimiento; los mandos se registran ya desde el menú
+        profiler.handle_event(event)
+        player_input.handle_event(event)
+
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_pos = event.pos
+            # Los botones están en píxeles de la resolución interna; fuera de la imagen no hay nada
+            mouse_pos = display.to_render(event.pos)
+            if mouse_pos is None:
+                continue
 
             if current_view == "menu":
-                buttons = render_menu(screen)
-                for button in buttons:
-                    if button["rect"].collidepoint(mouse_pos):
-                        if button["text"] == "Jugar":
-                            current_view = "game"
-                        elif button["text"] == "Cómo se juega":
-                            current_view = "instructions"
-                        elif button["text"] == "Salir":
-                            running = False
+                button = menu_button_at(screen, mouse_pos)
+                if button == "Jugar":
+                    start_game()
+                    # Mostrar un aviso de carga si los recursos del combate aún no están listos
+                    current_view = "game" if game_assets_ready(selected_level(), display.render_size) else "loading"
+                elif button == "Escenario":
+                    prefetch_game_assets(next_stage(), display.render_size)
+                elif button == "Rival":
+                    next_opponent()
+                elif button == "Cómo se juega":
+                    current_view = "instructions"
+                elif button == "Salir":
+                    running = False
 
             elif current_view == "instructions":
-                back_button = render_instructions(screen)
-                if back_button.collidepoint(mouse_pos):
+                if instructions_button_at(screen, mouse_pos) == "Volver":
                     current_view = "menu"
 
+    profiler.lap("events")
+
+    if not music_started and music.ready():
+        music_started = True
+        if music.get():
+            pygame.mixer.music.set_volume(0.5)  # Ajustar el volumen (0.0 a 1.0)
+            pygame.mixer.music.play(-1)  # Reproducir en bucle infinito
+
+    if current_view == "loading" and game_assets_ready(selected_level(), display.render_size):
+        current_view = "game"
+
     # Renderizar la vista actual
     if current_view == "menu":
         render_menu(screen)
+    elif current_view == "loading":
+        render_loading(screen)
     elif current_view == "instructions":
         render_instructions(screen)
     elif current_view == "game":
-        # Pasar las hojas de sprites de todos los estados a render_game
-        render_game(screen, player1_sprites, player2_sprites)
+        # Pasar las animaciones compartidas (ya escaladas a la resolución interna) a render_game
+        # Contra la CPU el jugador 2 lo controla el bot elegido en el menú; el resto de opciones, del entorno
+        samurai = samurai_animations_at(display.scale).get()
+        bot = opponent_bot()
+        render_game(screen, samurai, samurai, level=selected_level(), display=display, humans=1 if bot else 2,
+                    cpu_bots=(bot,) if bot else PARTY_BOTS, **game_settings())
+        # render_game vuelve al terminar el combate: el resultado queda en pantalla y después se vuelve al menú
+        current_view = "result"
+        result_until = pygame.time.get_ticks() + RESULT_SCREEN_MS
+    elif current_view == "result" and pygame.time.get_ticks() >= result_until:
+        current_view = "menu"
+
+    hud = profiler.hud_overlay()
+    if hud is not None:
+        screen.blit(*hud)
+    profiler.lap("render")
 
-    pygame.display.flip()
+    display.present()
+    profiler.lap("flip")
     clock.tick(60)
 
+profiler.dump()
 pygame.quit()
@@ -1,12 +1,16 @@
 class DiagonalPlatform:
-    def __init__(self, x1, y1, x2, y2):
+    def __init__(self, x1, y1, x2, y2, slope=None, y_intercept=None):
         """
         Initialize a diagonal platform defined by two points.
+        Compiled levels pass the precomputed `slope` and `y_intercept`.
         """
         self.x1, self.y1 = x1, y1
         self.x2, self.y2 = x2, y2
-        self.slope = (y2 - y1) / (x2 - x1)  # Calculate the slope
-        self.y_intercept = y1 - self.slope * x1  # Calculate the y-intercept
+        if slope is None:
+            slope = (y2 - y1) / (x2 - x1)  # Calculate the slope
+            y_intercept = y1 - slope * x1  # Calculate the y-intercept
+        self.slope = slope
+        self.y_intercept = y_intercept
 
     def get_y_at_x(self, x):
         """
@@ -0,0 +1,41 @@
+from types import MappingProxyType
+import pygame
+from core.atlas import SpriteAtlas
+
+
+def mirror_frames(frames):
+    """
+    Return the horizontally flipped version of each frame (placeholders without a surface are kept as is).
+    """
+    return [pygame.transform.flip(frame, True, False) if frame is not None else None for frame in frames]
+
+
+class AnimationBanks:
+    __slots__ = ("right", "left", "states", "state_index", "_atlas")
+
+    def __init__(self, right, left=None):
+        """
+        Shared, read-only animation frames of one character: state -> tuple of frames, per facing direction.
+        Left-facing frames are mirrored from the right-facing ones when not given.
+        `state_index` numbers the states so a fighter's animation fits in a packed snapshot.
+        """
+        if left is None:
+            left = {state: mirror_frames(frames) for state, frames in right.items()}
+        self.right = MappingProxyType({state: tuple(frames) for state, frames in right.items()})
+        self.left = MappingProxyType({state: tuple(left[state]) for state in right})
+        self.states = tuple(self.right)
+        self.state_index = MappingProxyType({state: index for index, state in enumerate(self.states)})
+        self._atlas = None
+
+    @property
+    def atlas(self):
+        """
+        Single-texture atlas with both directions, built on first use and shared by every player.
+        """
+        if self._atlas is None:
+            banks = {}
+            for state in self.right:
+                banks[(state, False)] = self.right[state]
+                banks[(state, True)] = self.left[state]
+            self._atlas = SpriteAtlas(banks)
+        return self._atlas
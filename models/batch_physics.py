@@ -0,0 +1,178 @@
+import numpy as np
+from models.controls import UP, LEFT, RIGHT, DEFEND, ATTACK
+
+DAMAGE = 10  # Daño de handle_combat
+
+
+def pygame_round(values):
+    """
+    Round half away from zero, which is what pygame.Rect does with float coordinates.
+    """
+    whole = np.trunc(values)
+    return (whole + np.where(np.abs(values - whole) >= 0.5, np.sign(values), 0)).astype(np.int64)
+
+
+def _first_hit(hits):
+    """
+    For each row, whether any column is True and the index of the first one (0 when there is none).
+    """
+    if hits.shape[1] == 0:
+        return np.zeros(hits.shape[0], dtype=bool), np.zeros(hits.shape[0], dtype=np.int64)
+    return hits.any(axis=1), hits.argmax(axis=1)
+
+
+def _pick(values, index):
+    """
+    values[index], tolerating an empty geometry array (the result is then masked out by the caller).
+    """
+    return values[index] if values.size else np.zeros_like(index)
+
+
+class BatchMatches:
+    def __init__(self, matches):
+        """
+        Many independent two-player matches stepped in lockstep with NumPy.
+        Fighter state is kept as structure-of-arrays (index 2 * match + player) and every
+        tick reproduces Match.step exactly for movement, gravity, floor and slope
+        collision, attacks and damage. Animations are not simulated.
+        All matches must share the stage geometry and tick rate of the first one.
+        """
+        if any(match.swept_collision for match in matches):
+            raise ValueError("BatchMatches only reproduces the overlap landing test, not swept_collision")
+        first = matches[0]
+        self.count = len(matches)
+        self.tick_rate = first.tick_rate
+        self.tick = 0
+
+        players = [player for match in matches for player in match.players]
+        self.x = np.array([player.rect.x for player in players], dtype=np.int64)
+        self.y = np.array([player.rect.y for player in players], dtype=np.int64)
+        self.width = np.array([player.rect.width for player in players], dtype=np.int64)
+        self.height = np.array([player.rect.height for player in players], dtype=np.int64)
+        self.y_velocity = np.array([player.y_velocity for player in players], dtype=np.float64)
+        self.on_ground = np.array([player.on_ground for player in players], dtype=bool)
+        self.facing_left = np.array([player.facing_left for player in players], dtype=bool)
+        self.health = np.array([player.health for player in players], dtype=np.int64)
+        self.is_attacking = np.array([player.is_attacking for player in players], dtype=bool)
+        self.is_defending = np.array([player.is_defending for player in players], dtype=bool)
+        self.last_attack_time = np.array([player.last_attack_time for player in players], dtype=np.int64)
+
+        # Parámetros ajustables por luchador
+        self.velocity = np.array([player.velocity for player in players], dtype=np.float64)
+        self.gravity = np.array([player.gravity for player in players], dtype=np.float64)
+        self.jump_strength = np.array([player.jump_strength for player in players], dtype=np.float64)
+        self.attack_cooldown = np.array([player.attack_cooldown for player in players], dtype=np.float64)
+
+        self.ticks = np.array([match.tick for match in matches], dtype=np.int64)
+        self.winner = np.array([match.winner or 0 for match in matches], dtype=np.int64)  # 0 = en curso
+
+        colliders = [collider for collider in first.colliders if collider.width and collider.height]
+        self.collider_left = np.array([c.left for c in colliders], dtype=np.int64)
+        self.collider_top = np.array([c.top for c in colliders], dtype=np.int64)
+        self.collider_right = np.array([c.right for c in colliders], dtype=np.int64)
+        self.collider_bottom = np.array([c.bottom for c in colliders], dtype=np.int64)
+
+        platforms = first.diagonal_platforms
+        self.platform_x1 = np.array([p.x1 for p in platforms], dtype=np.float64)
+        self.platform_x2 = np.array([p.x2 for p in platforms], dtype=np.float64)
+        self.platform_slope = np.array([p.slope for p in platforms], dtype=np.float64)
+        self.platform_intercept = np.array([p.y_intercept for p in platforms], dtype=np.float64)
+
+    def _colliding(self):
+        """
+        (fighters, colliders) matrix of Rect.colliderect results.
+        """
+        left = self.x[:, None]
+        top = self.y[:, None]
+        return ((left < self.collider_right) & (left + self.width[:, None] > self.collider_left)
+                & (top < self.collider_bottom) & (top + self.height[:, None] > self.collider_top))
+
+    def step(self, masks):
+        """
+        Advance every running match one tick.
+        `masks` has one action bitmask per fighter, shaped (matches, 2) or flat.
+        """
+        masks = np.asarray(masks, dtype=np.int64).reshape(-1)
+        active = np.repeat(self.winner == 0, 2)
+        current_time = np.repeat(self.ticks * 1000 // self.tick_rate, 2)  # Reloj de cada combate, como Match.time_ms
+
+        up = active & ((masks & UP) != 0)
+        left = active & ((masks & LEFT) != 0)
+        right = active & ((masks & RIGHT) != 0)
+        attack = active & ((masks & ATTACK) != 0)
+        defend = (masks & DEFEND) != 0
+
+        # attack()
+        can_attack = attack & (current_time - self.last_attack_time > self.attack_cooldown)
+        self.is_attacking = np.where(active, can_attack, self.is_attacking)
+        self.last_attack_time = np.where(can_attack, current_time, self.last_attack_time)
+
+        # defend()
+        self.is_defending = np.where(active, defend, self.is_defending)
+
+        # jump()
+        self.y_velocity = np.where(up & self.on_ground, self.jump_strength, self.y_velocity)
+
+        # move(): primer collider tocado en el orden original
+        self.x = np.where(left, pygame_round(self.x - self.velocity), self.x)
+        self.facing_left |= left
+        hit, index = _first_hit(self._colliding())
+        self.x = np.where(left & hit, _pick(self.collider_right, index), self.x)
+
+        self.x = np.where(right, pygame_round(self.x + self.velocity), self.x)
+        self.facing_left &= ~right
+        hit, index = _first_hit(self._colliding())
+        self.x = np.where(right & hit, _pick(self.collider_left, index) - self.width, self.x)
+
+        # apply_gravity(): pisos solo al caer
+        self.y_velocity = np.where(active, self.y_velocity + self.gravity, self.y_velocity)
+        self.y = np.where(active, pygame_round(self.y + self.y_velocity), self.y)
+        hit, index = _first_hit(self._colliding() & (self.y_velocity > 0)[:, None])
+        on_floor = active & hit
+        self.y = np.where(on_floor, _pick(self.collider_top, index) - self.height, self.y)
+
+        # Plataformas diagonales: para cada plataforma se prueba el borde izquierdo y luego el derecho
+        on_slope = np.zeros_like(active)
+        airborne = active & ~on_floor
+        if self.platform_x1.size:
+            edges = np.stack([self.x, self.x + self.width], axis=1).astype(np.float64)[:, None, :]  # (N, 1, 2)
+            x1 = self.platform_x1[None, :, None]
+            x2 = self.platform_x2[None, :, None]
+            platform_y = self.platform_slope[None, :, None] * edges + self.platform_intercept[None, :, None]
+            bottom = (self.y + self.height)[:, None, None]
+            touching = (x1 <= edges) & (edges <= x2) & (bottom >= platform_y - 5) & (bottom <= platform_y + 10)
+            touching = touching.reshape(len(self.x), -1)
+            hit, index = _first_hit(touching)
+            on_slope = airborne & hit
+            snapped = pygame_round(platform_y.reshape(len(self.x), -1)[np.arange(len(self.x)), index])
+            self.y = np.where(on_slope, snapped - self.height, self.y)
+
+        landed = on_floor | on_slope
+        self.y_velocity = np.where(landed, 0.0, self.y_velocity)
+        self.on_ground = np.where(active, landed, self.on_ground)
+
+        # handle_combat(): ambos golpes se evalúan con las mismas posiciones
+        pair_x = self.x.reshape(-1, 2)
+        pair_y = self.y.reshape(-1, 2)
+        pair_w = self.width.reshape(-1, 2)
+        pair_h = self.height.reshape(-1, 2)
+        overlap = ((pair_x[:, 0] < pair_x[:, 1] + pair_w[:, 1]) & (pair_x[:, 0] + pair_w[:, 0] > pair_x[:, 1])
+                   & (pair_y[:, 0] < pair_y[:, 1] + pair_h[:, 1]) & (pair_y[:, 0] + pair_h[:, 0] > pair_y[:, 1]))
+        attacking = self.is_attacking.reshape(-1, 2)
+        defending = self.is_defending.reshape(-1, 2)
+        damaged = np.stack([attacking[:, 1], attacking[:, 0]], axis=1) & overlap[:, None] & ~defending
+        damaged &= active.reshape(-1, 2)
+        self.health = np.where(damaged.reshape(-1), np.maximum(self.health - DAMAGE, 0), self.health)
+
+        running = self.winner == 0
+        self.ticks += running
+        health = self.health.reshape(-1, 2)
+        self.winner = np.where(running & (health[:, 0] <= 0), 2,
+                               np.where(running & (health[:, 1] <= 0), 1, self.winner))
+        self.tick += 1
+
+    def is_over(self):
+        """
+        True when every match in the batch has a winner.
+        """
+        return bool((self.winner != 0).all())
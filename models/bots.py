@@ -0,0 +1,336 @@
+import math
+import random
+import time
+from collections import deque
+from functools import partial
+from models.controls import ACTIONS, UP, LEFT, RIGHT, ATTACK, virtual_controls
+from models.match import create_fighter
+
+# Tiempo de búsqueda por tick de SearchBot según la dificultad (a 60 ticks/s cada tick dura 16,7 ms)
+SEARCH_BUDGETS = {"easy": 0.0004, "normal": 0.001, "hard": 0.0018}
+# Pasos simulados por tick en el modo determinista (lo que cabe de media en SEARCH_BUDGETS)
+SEARCH_NODE_BUDGETS = {"easy": 4, "normal": 10, "hard": 18}
+SEARCH_ACTIONS = (0, LEFT, RIGHT, ATTACK, UP | LEFT, UP | RIGHT)  # Entradas que prueba la búsqueda
+SEARCH_STEP_TICKS = 6  # Ticks que se mantiene cada entrada dentro de la búsqueda
+SEARCH_TABLE_SIZE = 50_000  # Entradas de la tabla de transposición antes de vaciarla (no debería llegar a llenarse)
+STEP_COST_SMOOTHING = 0.05  # Peso de cada medida nueva en la media del coste de simular un paso
+STEP_COST_MARGIN = 2  # Un paso solo se simula si caben este número de pasos medios antes del límite
+MODEL_REACH = 60  # Distancia a la que el modelo de los rivales ataca en lugar de acercarse
+WIN_SCORE = 10_000
+
+
+def nearest_opponent(match, index):
+    """
+    Closest fighter still standing (the only other one in a two-player match).
+    """
+    me = match.players[index]
+    others = [player for other, player in enumerate(match.players) if other != index]
+    standing = [player for player in others if not player.is_defeated()] or others
+    return min(standing, key=lambda player: abs(player.rect.centerx - me.rect.centerx))
+
+
+class RandomBot:
+    def __init__(self, seed=None):
+        """
+        Presses a random combination of actions, keeping it for a few ticks.
+        """
+        self.rng = random.Random(seed)
+        self.mask = 0
+        self.hold = 0
+
+    def act(self, match, index):
+        if self.hold <= 0:
+            self.mask = self.rng.getrandbits(len(ACTIONS))
+            self.hold = self.rng.randint(3, 20)
+        self.hold -= 1
+        return self.mask
+
+
+class AggressiveBot:
+    def __init__(self, seed=None, reach=60, jump_chance=0.02):
+        """
+        Walks towards the opponent and attacks when in reach; jumps now and then.
+        """
+        self.rng = random.Random(seed)
+        self.reach = reach
+        self.jump_chance = jump_chance
+
+    def act(self, match, index):
+        me = match.players[index]
+        opponent = nearest_opponent(match, index)
+        distance = opponent.rect.centerx - me.rect.centerx
+
+        mask = 0
+        if abs(distance) > self.reach:
+            mask |= RIGHT if distance > 0 else LEFT
+        else:
+            mask |= ATTACK
+        if self.rng.random() < self.jump_chance:
+            mask |= UP
+        return mask
+
+
+class HitAndRunBot:
+    def __init__(self, seed=None, reach=60, retreat_ticks=30):
+        """
+        Closes in, attacks once and backs off for a while.
+        """
+        self.rng = random.Random(seed)
+        self.reach = reach
+        self.retreat_ticks = retreat_ticks
+        self.retreat = 0
+
+    def act(self, match, index):
+        me = match.players[index]
+        opponent = nearest_opponent(match, index)
+        distance = opponent.rect.centerx - me.rect.centerx
+        toward = RIGHT if distance > 0 else LEFT
+        away = LEFT if distance > 0 else RIGHT
+
+        if self.retreat > 0:
+            self.retreat -= 1
+            return away | (UP if self.rng.random() < 0.05 else 0)
+        if abs(distance) > self.reach:
+            return toward
+        self.retreat = self.rng.randint(self.retreat_ticks // 2, self.retreat_ticks)
+        return ATTACK
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class SearchBot:
+    def __init__(self, difficulty="normal", seed=None, budget=None, max_depth=4, node_budget=None):
+        """
+        CPU fighter that picks its input with a depth-limited lookahead over a private headless copy
+        of the match, spending at most `budget` seconds per tick (SEARCH_BUDGETS[difficulty] by default).
+        The search holds one of SEARCH_ACTIONS per step, with steps aligned to every SEARCH_STEP_TICKS
+        ticks, while the other fighters follow a scripted model (walk up and attack); leaves are scored
+        by health and distance. The bot commits to its input until the next step boundary and spends the
+        ticks in between deepening the search from the state it expects to reach there. Simulated steps
+        and node values are cached by packed state in a transposition table, so that work carries over
+        from tick to tick; entries are dropped a few at a time once the match has passed their tick.
+        A step is only simulated when STEP_COST_MARGIN times its average cost still fits before the deadline.
+        How deep it gets then depends on the machine. With `node_budget` the limit is that many simulated
+        steps per tick instead of a time, so the same match always gets the same inputs (e.g. in a
+        tournament with a seed); `seed` is only there for create_bot().
+        """
+        if difficulty not in SEARCH_BUDGETS:
+            raise ValueError(f"Unknown difficulty '{difficulty}', expected one of: {', '.join(SEARCH_BUDGETS)}")
+        self.difficulty = difficulty
+        self.budget = SEARCH_BUDGETS[difficulty] if budget is None else budget
+        self.max_depth = max_depth
+        self.node_budget = node_budget
+        self.index = 0  # Luchador que controla, fijado en cada act()
+        self.plan = 0  # Entrada mantenida hasta el siguiente límite de paso
+        self.planned = 0  # Mejor entrada encontrada hasta ahora para el siguiente paso
+        self.table = {}  # (estado, profundidad) -> (valor, mejor entrada)
+        self.transitions = {}  # (estado, entrada) -> estado en el siguiente límite de paso
+        self._entries = deque()  # (tabla, clave, tick) en orden de inserción, para descartar las ya pasadas
+        self.steps = self.hits = self.depth = 0
+        self.step_cost = 0.0  # Media móvil de lo que tarda simular un paso, en segundos
+        self._spent = 0  # Pasos simulados en este tick, para `node_budget`
+        self._next_decision = 0
+        self._source = None
+        self._sim = None
+
+    def _simulator(self, match):
+        """
+        Headless copy of `match` for the search: same stage and rules, no listeners, no profiler.
+        The stage is searched without the spatial index, which only pays off on large levels.
+        """
+        if self._source is match:
+            return self._sim
+        players = []
+        for index, player in enumerate(match.players):
+            clone = create_fighter(0, 0, player.banks, virtual_controls(index))
+            for name in ("velocity", "jump_strength", "gravity", "attack_cooldown", "animation_speed"):
+                setattr(clone, name, getattr(player, name))
+            players.append(clone)
+        self._sim = type(match)(players, match.colliders, match.diagonal_platforms, match.tick_rate,
+                                swept_collision=match.swept_collision)
+        self._state = bytearray(match.state_size)
+        self._source = match
+        self._next_decision = 0
+        self._clear()
+        return self._sim
+
+    def _clear(self):
+        self.table.clear()
+        self.transitions.clear()
+        self._entries.clear()
+
+    def _store(self, table, key, value, state):
+        table[key] = value
+        self._entries.append((table, key, int.from_bytes(state[:4], "little")))  # El tick abre el estado
+
+    def _forget_before(self, tick):
+        """
+        Drop the cached states the match has already left behind (the simulation never rewinds).
+        """
+        entries = self._entries
+        while entries and entries[0][2] < tick:
+            table, key, _ = entries.popleft()
+            table.pop(key, None)
+
+    def act(self, match, index):
+        deadline = time.perf_counter() + self.budget
+        self._spent = 0
+        self._simulator(match)
+        self.index = index
+        self._forget_before(match.tick)
+        if len(self._entries) > SEARCH_TABLE_SIZE:
+            self._clear()
+
+        match.pack_into(self._state)
+        root = bytes(self._state)
+        if match.tick >= self._next_decision:
+            # Límite de paso: si todo fue como se esperaba, la búsqueda de este estado ya está avanzada
+            self._deepen(root, deadline)
+            self.plan = self._best(root)
+            self._next_decision = match.tick + SEARCH_STEP_TICKS - match.tick % SEARCH_STEP_TICKS
+
+        # El resto del tiempo se dedica al estado que se espera alcanzar en el siguiente límite
+        if not self._exhausted(deadline):
+            try:
+                boundary = self._child(root, self.plan, deadline)
+            except _OutOfTime:
+                return self.plan
+            self._deepen(boundary, deadline)
+            self.planned = self._best(boundary)
+        return self.plan
+
+    def _deepen(self, state, deadline):
+        """
+        Search `state` one depth further at a time until `max_depth` or the deadline.
+        Completed depths are found in the table, so a later call resumes where this one stopped.
+        """
+        try:
+            for depth in range(1, self.max_depth + 1):
+                self._search(state, depth, deadline)
+        except _OutOfTime:
+            pass
+
+    def _best(self, state):
+        """
+        Input of the deepest finished search of `state`, or the best guess so far.
+        """
+        for depth in range(self.max_depth, 0, -1):
+            entry = self.table.get((state, depth))
+            if entry is not None:
+                self.depth = depth
+                return entry[1]
+        self.depth = 0
+        return self.planned
+
+    def _search(self, state, depth, deadline):
+        """
+        (value, best input) of `state` looking `depth` steps ahead.
+        The deadline is checked on every node, cached or not, so no subtree runs past it.
+        """
+        if self._exhausted(deadline):
+            raise _OutOfTime
+        key = (state, depth)
+        entry = self.table.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        sim = self._sim
+        sim.unpack_from(state)
+        if depth == 0 or sim.is_over():
+            entry = (self.evaluate(sim, self.index), 0)
+        else:
+            entry = (-math.inf, 0)
+            for action in SEARCH_ACTIONS:
+                value = self._search(self._child(state, action, deadline), depth - 1, deadline)[0]
+                if value > entry[0]:
+                    entry = (value, action)
+        self._store(self.table, key, entry, state)
+        return entry
+
+    def _child(self, state, action, deadline):
+        """
+        Packed state at the next step boundary when holding `action` from `state`.
+        """
+        key = (state, action)
+        child = self.transitions.get(key)
+        if child is None:
+            began = time.perf_counter()
+            if self._exhausted(deadline - STEP_COST_MARGIN * self.step_cost, began):
+                raise _OutOfTime
+            sim = self._sim
+            sim.unpack_from(state)
+            masks = self._tick_masks(sim, action)
+            for _ in range(SEARCH_STEP_TICKS - sim.tick % SEARCH_STEP_TICKS):
+                if sim.is_over():
+                    break
+                sim.step(masks)
+            sim.pack_into(self._state)
+            child = bytes(self._state)
+            self._store(self.transitions, key, child, state)
+            self.steps += 1
+            self._spent += 1
+            self.step_cost += (time.perf_counter() - began - self.step_cost) * STEP_COST_SMOOTHING
+        return child
+
+    def _exhausted(self, deadline, now=None):
+        """
+        Whether this tick's search is over: `node_budget` steps simulated, or past `deadline` without one.
+        """
+        if self.node_budget is not None:
+            return self._spent >= self.node_budget
+        return (time.perf_counter() if now is None else now) > deadline
+
+    def _tick_masks(self, sim, action):
+        """
+        Input masks for one search step: `action` for this fighter and the model's input for the others.
+        """
+        return [action if index == self.index else self._model(sim, index) for index in range(len(sim.players))]
+
+    @staticmethod
+    def _model(sim, index):
+        """
+        Expected input of another fighter: walk up to the nearest opponent and attack in reach.
+        """
+        distance = nearest_opponent(sim, index).rect.centerx - sim.players[index].rect.centerx
+        if abs(distance) > MODEL_REACH:
+            return RIGHT if distance > 0 else LEFT
+        return ATTACK
+
+    @staticmethod
+    def evaluate(match, index):
+        """
+        Score of `match` for fighter `index`: winning, then health against the opponents, then closeness.
+        """
+        if match.winner is not None:
+            return 0 if match.winner == 0 else WIN_SCORE if match.winner == index + 1 else -WIN_SCORE
+        me = match.players[index]
+        others = [player for other, player in enumerate(match.players) if other != index and not player.is_defeated()]
+        opponent_health = sum(player.health for player in others) / len(others)
+        distance = abs(nearest_opponent(match, index).rect.centerx - me.rect.centerx)
+        return 10 * (me.health - opponent_health) - 0.05 * max(0, distance - MODEL_REACH)
+
+
+BOTS = {
+    "random": RandomBot,
+    "aggressive": AggressiveBot,
+    "hit-and-run": HitAndRunBot,
+    "cpu-easy": partial(SearchBot, "easy"),
+    "cpu-normal": partial(SearchBot, "normal"),
+    "cpu-hard": partial(SearchBot, "hard"),
+}
+
+
+def create_bot(name, seed=None, deterministic=False):
+    """
+    Build a scripted bot by name (see BOTS). With `deterministic` the CPU bots search a fixed number
+    of steps per tick (SEARCH_NODE_BUDGETS) instead of for a time, so their inputs depend only on the match.
+    """
+    if name not in BOTS:
+        raise ValueError(f"Unknown bot '{name}', expected one of: {', '.join(BOTS)}")
+    bot = BOTS[name](seed=seed)
+    if deterministic and isinstance(bot, SearchBot):
+        bot.node_budget = SEARCH_NODE_BUDGETS[bot.difficulty]
+    return bot
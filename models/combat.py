@@ -0,0 +1,64 @@
+import pygame
+
+DAMAGE = 10  # Daño de un golpe, como en handle_combat
+ATTACK_REACH = 40  # Alcance del golpe por delante del cuerpo, en píxeles
+ATTACK_INSET = 20  # La zona del golpe deja fuera la cabeza y los pies
+HURTBOX_INSET = 16  # El cuerpo vulnerable es algo más estrecho que el rectángulo de colisión
+
+
+def hurtbox(player):
+    """
+    Area where `player` can be hit: the body rect narrowed on both sides.
+    """
+    return player.rect.inflate(-2 * HURTBOX_INSET, 0)
+
+
+def attack_hitbox(player):
+    """
+    Area hit by an attack of `player`: from the middle of the body to ATTACK_REACH past its front edge.
+    """
+    rect = player.rect
+    width = rect.width // 2 + ATTACK_REACH
+    left = rect.centerx - width if player.facing_left else rect.centerx
+    return pygame.Rect(left, rect.top + ATTACK_INSET, width, rect.height - 2 * ATTACK_INSET)
+
+
+def find_hits(players):
+    """
+    (attacker, target) index pairs for this tick, found with sort-and-sweep on the x axis:
+    the boxes are sorted by their left edge and each one is only tested against the boxes
+    still open at that point, so fighters far apart are never compared.
+    Defeated fighters neither hit nor get hit.
+    """
+    boxes = []  # (izquierda, derecha, arriba, abajo, jugador, es_golpe)
+    for index, player in enumerate(players):
+        if player.is_defeated():
+            continue
+        body = hurtbox(player)
+        boxes.append((body.left, body.right, body.top, body.bottom, index, False))
+        if player.is_attacking:
+            hit = attack_hitbox(player)
+            boxes.append((hit.left, hit.right, hit.top, hit.bottom, index, True))
+    boxes.sort()
+
+    hits = []
+    active = []
+    for box in boxes:
+        left, right, top, bottom, index, is_attack = box
+        active = [other for other in active if other[1] > left]
+        for other in active:
+            if other[4] != index and other[5] != is_attack and other[2] < bottom and top < other[3]:
+                hits.append((index, other[4]) if is_attack else (other[4], index))
+        active.append(box)
+    return hits
+
+
+def resolve_hits(players, damage=DAMAGE):
+    """
+    Apply every hit of this tick at once, so the order of the fighters does not matter.
+    """
+    hits = find_hits(players)
+    for attacker, target in hits:
+        players[attacker].emit("hit")
+        players[target].take_damage(damage)
+    return hits
@@ -0,0 +1,75 @@
+import pygame
+
+# Orden fijo de las acciones: define el bit de cada una en las máscaras de entrada
+ACTIONS = ("up", "down", "left", "right", "defend", "attack")
+UP, DOWN, LEFT, RIGHT, DEFEND, ATTACK = (1 << bit for bit in range(len(ACTIONS)))
+
+# Definir controles para los jugadores
+player1_controls = {
+    "up": pygame.K_UP,
+    "down": pygame.K_DOWN,
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+    "defend": pygame.K_o,
+    "attack": pygame.K_p,
+}
+
+player2_controls = {
+    "up": pygame.K_w,
+    "down": pygame.K_s,
+    "left": pygame.K_a,
+    "right": pygame.K_d,
+    "defend": pygame.K_g,
+    "attack": pygame.K_h,
+}
+
+
+player3_controls = {
+    "up": pygame.K_i,
+    "down": pygame.K_k,
+    "left": pygame.K_j,
+    "right": pygame.K_l,
+    "defend": pygame.K_u,
+    "attack": pygame.K_y,
+}
+
+player4_controls = {
+    "up": pygame.K_KP8,
+    "down": pygame.K_KP5,
+    "left": pygame.K_KP4,
+    "right": pygame.K_KP6,
+    "defend": pygame.K_KP7,
+    "attack": pygame.K_KP9,
+}
+
+KEYBOARD_LAYOUTS = [player1_controls, player2_controls, player3_controls, player4_controls]
+
+# Códigos fuera del rango de pygame para jugadores sin teclado (CPU o mando): solo existen en las máscaras
+VIRTUAL_KEY_BASE = 1 << 31
+
+
+def virtual_controls(index):
+    """
+    Controls for fighter `index` made of virtual key codes that no keyboard produces.
+    """
+    base = VIRTUAL_KEY_BASE + index * len(ACTIONS)
+    return {action: base + bit for bit, action in enumerate(ACTIONS)}
+
+
+def controls_from_names(names):
+    """
+    Build a controls dict from key names, e.g. {"up": "w", "attack": "space"} (see pygame.key.key_code).
+    """
+    missing = [action for action in ACTIONS if action not in names]
+    if missing:
+        raise ValueError(f"Missing controls for: {', '.join(missing)}")
+    return {action: pygame.key.key_code(names[action]) for action in ACTIONS}
+
+
+def party_controls(count, keyboard_players=len(KEYBOARD_LAYOUTS)):
+    """
+    Controls for `count` fighters: the first `keyboard_players` get the keyboard layouts, the rest virtual keys.
+    """
+    keyboard_players = min(keyboard_players, len(KEYBOARD_LAYOUTS))
+    return [KEYBOARD_LAYOUTS[index] if index < keyboard_players else virtual_controls(index) for index in range(count)]
+
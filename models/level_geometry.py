@@ -0,0 +1,93 @@
+CELL_SIZE = 128  # Tamaño de celda de la rejilla en píxeles
+
+
+class LevelGeometry:
+    def __init__(self, colliders, diagonal_platforms, cell_size=CELL_SIZE):
+        """
+        Uniform grid over the stage rects and slope segments.
+        Queries return only the geometry near an area, in the original list order,
+        so the first-hit rules of Player.move and Player.apply_gravity are unchanged.
+        """
+        self.colliders = colliders
+        self.diagonal_platforms = diagonal_platforms
+        self.cell_size = cell_size
+        self.collider_cells = {}  # (columna, fila) -> índices de colliders
+        self.platform_cells = {}  # (columna, fila) -> índices de plataformas
+
+        for index, collider in enumerate(colliders):
+            self._insert(self.collider_cells, index, collider.left, collider.top,
+                         max(collider.left, collider.right - 1), max(collider.top, collider.bottom - 1))
+
+        for index, platform in enumerate(diagonal_platforms):
+            self._insert(self.platform_cells, index, platform.x1, min(platform.y1, platform.y2),
+                         platform.x2, max(platform.y1, platform.y2))
+
+    @classmethod
+    def from_cells(cls, colliders, diagonal_platforms, cell_size, collider_cells, platform_cells):
+        """
+        Rebuild an index from cell tables computed ahead of time (e.g. stored in a compiled level).
+        """
+        geometry = cls.__new__(cls)
+        geometry.colliders = colliders
+        geometry.diagonal_platforms = diagonal_platforms
+        geometry.cell_size = cell_size
+        geometry.collider_cells = collider_cells
+        geometry.platform_cells = platform_cells
+        return geometry
+
+    def _cell_range(self, x0, y0, x1, y1):
+        size = self.cell_size
+        return range(int(x0 // size), int(x1 // size) + 1), range(int(y0 // size), int(y1 // size) + 1)
+
+    def _insert(self, cells, index, x0, y0, x1, y1):
+        columns, rows = self._cell_range(x0, y0, x1, y1)
+        for column in columns:
+            for row in rows:
+                cells.setdefault((column, row), []).append(index)
+
+    def _gather(self, cells, x0, y0, x1, y1):
+        columns, rows = self._cell_range(x0, y0, x1, y1)
+        found = set()
+        for column in columns:
+            for row in rows:
+                indices = cells.get((column, row))
+                if indices:
+                    found.update(indices)
+        return sorted(found)
+
+    def query(self, x0, y0, x1, y1):
+        """
+        Colliders and diagonal platforms whose bounds may touch the inclusive area (x0, y0)-(x1, y1).
+        """
+        colliders = [self.colliders[i] for i in self._gather(self.collider_cells, x0, y0, x1, y1)]
+        platforms = [self.diagonal_platforms[i] for i in self._gather(self.platform_cells, x0, y0, x1, y1)]
+        return colliders, platforms
+
+    def near_move(self, player):
+        """
+        Colliders Player.move can hit this tick: the body swept one step left and right.
+        A hit pushes the body to the far edge of the collider, so the area grows until
+        it also covers every position a push can leave the player in.
+        """
+        rect = player.rect
+        speed = abs(player.velocity) + 1
+        x0, x1 = rect.left - speed, rect.right + speed
+        while True:
+            # move() no cambia la altura: solo cuentan los colliders que cruzan la franja del cuerpo
+            colliders = [collider for collider in self.query(x0, rect.top, x1, rect.bottom - 1)[0]
+                         if collider.top < rect.bottom and collider.bottom > rect.top]
+            new_x0 = min([x0] + [collider.left - rect.width - speed for collider in colliders])
+            new_x1 = max([x1] + [collider.right + rect.width + speed for collider in colliders])
+            if (new_x0, new_x1) == (x0, x1):
+                return colliders
+            x0, x1 = new_x0, new_x1
+
+    def near_fall(self, player):
+        """
+        Geometry Player.apply_gravity can touch this tick, including the slope snapping window below the feet.
+        """
+        rect = player.rect
+        fall = player.y_velocity + player.gravity
+        top = rect.top + min(0, fall) - 1
+        bottom = rect.bottom + max(0, fall) + 11
+        return self.query(rect.left, top, rect.right, bottom)
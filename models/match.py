@@ -0,0 +1,244 @@
+import struct
+from models.player import Player
+from models.animation import AnimationBanks
+from models.controls import player1_controls, player2_controls
+from models import stage
+from models.level_geometry import LevelGeometry
+
+TICK_RATE = 60  # Ticks de simulación por segundo
+
+# Fotogramas de cada animación del samurái (ancho de la hoja / 96 px)
+SAMURAI_FRAME_COUNTS = {"idle": 10, "running": 16, "jumping": 16, "attacking": 7, "hurt": 4}
+
+# Cabecera del estado empaquetado de un combate: tick y ganador (-1 mientras sigue, 0 si hubo empate)
+MATCH_STATE = struct.Struct("<Ib")
+
+_headless_banks = None
+
+
+def handle_combat(player1, player2):
+    """
+    Manejar las interacciones de combate entre los dos jugadores.
+    """
+    if player1.is_attacking and player1.rect.colliderect(player2.rect):
+        player1.emit("hit")
+        player2.take_damage(10)  # Reduce la salud del jugador 2
+
+    if player2.is_attacking and player2.rect.colliderect(player1.rect):
+        player2.emit("hit")
+        player1.take_damage(10)  # Reduce la salud del jugador 1
+
+
+def headless_animations(frame_counts=SAMURAI_FRAME_COUNTS):
+    """
+    Placeholder animations with the right frame counts and no surfaces, for simulation without a display.
+    """
+    return {state: [None] * count for state, count in frame_counts.items()}
+
+
+def headless_banks():
+    """
+    AnimationBanks of placeholders for the samurai, built once and shared by every headless player.
+    """
+    global _headless_banks
+    if _headless_banks is None:
+        _headless_banks = AnimationBanks(headless_animations())
+    return _headless_banks
+
+
+def create_fighter(x, y, banks, controls, use_atlas=False):
+    """
+    Create one samurai from shared AnimationBanks; without banks it gets headless placeholders
+    and `use_atlas` only applies to fighters with sprites.
+    """
+    atlas = None
+    if banks is None:
+        banks = headless_banks()
+    elif use_atlas:
+        atlas = banks.atlas
+    return Player(
+        x=x,
+        y=y,
+        sprite_sheets=None,
+        controls=controls,
+        frame_width=96,  # Ancho de un fotograma
+        frame_height=96,  # Alto de un fotograma
+        animation_speed=5,  # Velocidad de animación
+        banks=banks,
+        atlas=atlas,
+    )
+
+
+def create_players(player1_animations=None, player2_animations=None, use_atlas=False, spawns=None):
+    """
+    Create both samurais at their starting positions (or a level's `spawns`) from shared AnimationBanks.
+    Players without animations get headless placeholders; `use_atlas` only applies to players with sprites.
+    """
+    if spawns is None:
+        spawns = stage.default_level.spawns
+    return [create_fighter(x, y, banks, controls, use_atlas)
+            for (x, y), banks, controls in zip(spawns, (player1_animations, player2_animations),
+                                               (player1_controls, player2_controls))]
+
+
+class Match:
+    def __init__(self, players, colliders, diagonal_platforms, tick_rate=TICK_RATE, geometry=None,
+                 swept_collision=False):
+        """
+        Fixed-timestep fight simulation. Owns the players and the stage geometry
+        and never touches the display, the event queue or the wall clock.
+        With a LevelGeometry index the collision checks only see nearby geometry.
+        `swept_collision` lands players with Player.apply_gravity_swept instead of the overlap test.
+        """
+        self.players = players
+        self.colliders = colliders
+        self.diagonal_platforms = diagonal_platforms
+        self.geometry = geometry
+        self.swept_collision = swept_collision
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000 / tick_rate
+        self.tick = 0
+        self.profiler = None  # FrameProfiler opcional para medir las fases del tick
+        self.winner = None  # Número del jugador ganador (1 o 2) al terminar
+
+    @property
+    def time_ms(self):
+        """
+        Simulation clock in milliseconds, derived from the tick count.
+        """
+        return self.tick * 1000 // self.tick_rate
+
+    def is_over(self):
+        """
+        Checks if one of the players has been defeated.
+        """
+        return self.winner is not None
+
+    @property
+    def state_size(self):
+        """
+        Bytes taken by the packed match state.
+        """
+        return MATCH_STATE.size + Player.STATE.size * len(self.players)
+
+    def pack_into(self, buffer, offset=0):
+        """
+        Write the whole match state into `buffer` at `offset` without allocating.
+        """
+        MATCH_STATE.pack_into(buffer, offset, self.tick, -1 if self.winner is None else self.winner)
+        offset += MATCH_STATE.size
+        for player in self.players:
+            player.pack_into(buffer, offset)
+            offset += Player.STATE.size
+
+    def unpack_from(self, buffer, offset=0):
+        """
+        Rewind the match to a state written by pack_into().
+        """
+        self.tick, winner = MATCH_STATE.unpack_from(buffer, offset)
+        self.winner = None if winner < 0 else winner
+        offset += MATCH_STATE.size
+        for player in self.players:
+            player.unpack_from(buffer, offset)
+            offset += Player.STATE.size
+
+    def snapshot(self):
+        """
+        Compact copy of the whole match state as bytes, cheap enough to take every tick.
+        Use a StateRing to keep many of them without allocating.
+        """
+        state = bytearray(self.state_size)
+        self.pack_into(state)
+        return bytes(state)
+
+    def restore(self, state):
+        """
+        Rewind the match to a state taken with snapshot().
+        """
+        self.unpack_from(state)
+
+    def step(self, masks):
+        """
+        Advance the fight by exactly one tick.
+        `masks` has one action bitmask per player (bit i = models.controls.ACTIONS[i]).
+        """
+        if self.is_over():
+            return
+        if len(masks) != len(self.players):
+            raise ValueError(f"Expected {len(self.players)} input masks, got {len(masks)}")
+
+        current_time = self.time_ms
+        for player, mask in zip(self.players, masks):
+            self.update_player(player, mask, current_time)
+
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.lap("update")
+
+        self.resolve_combat()
+        if profiler is not None:
+            profiler.lap("combat")
+
+        # El bucle original también avanzaba la animación dentro de draw(); se conserva el ritmo
+        for player in self.players:
+            player.update_animation()
+
+        self.tick += 1
+        self.check_winner()
+
+    def update_player(self, player, mask, current_time):
+        """
+        Input, movement and collision of one player for this tick.
+        """
+        player.update_state(mask)
+        player.attack(mask, current_time)
+        player.defend(mask)
+        player.jump(mask)
+        apply_gravity = player.apply_gravity_swept if self.swept_collision else player.apply_gravity
+        if self.geometry is None:
+            player.move(mask, self.colliders)
+            apply_gravity(self.colliders, self.diagonal_platforms)
+        else:
+            player.move(mask, self.geometry.near_move(player))
+            apply_gravity(*self.geometry.near_fall(player))
+        player.update_animation()
+
+    def resolve_combat(self):
+        handle_combat(*self.players)
+
+    def check_winner(self):
+        player1, player2 = self.players
+        if player1.is_defeated():
+            self.winner = 2
+        elif player2.is_defeated():
+            self.winner = 1
+
+    def run(self, input_source, max_ticks):
+        """
+        Simulate as fast as possible until the fight ends or `max_ticks` is reached.
+        `input_source(match)` returns the input masks for the next tick.
+        """
+        while not self.is_over() and self.tick < max_ticks:
+            self.step(input_source(self))
+        return self.winner
+
+
+def create_match(player1_animations=None, player2_animations=None, colliders=None, diagonal_platforms=None,
+                 spatial_index=False, level=None, swept_collision=False):
+    """
+    Build a match on the default stage, or on a loaded `level`. Without animations the match is fully headless.
+    `spatial_index` indexes the stage geometry in a LevelGeometry grid (a level brings its own, precomputed).
+    `swept_collision` selects the swept landing test.
+    """
+    if level is None:
+        level = stage.default_level
+    custom = colliders is not None or diagonal_platforms is not None
+    if colliders is None:
+        colliders = level.colliders
+    if diagonal_platforms is None:
+        diagonal_platforms = level.diagonal_platforms
+    geometry = None
+    if spatial_index:
+        geometry = LevelGeometry(colliders, diagonal_platforms) if custom else level.geometry
+    return Match(create_players(player1_animations, player2_animations, spawns=level.spawns), colliders,
+                 diagonal_platforms, geometry=geometry, swept_collision=swept_collision)
@@ -0,0 +1,56 @@
+from models.match import Match, create_fighter
+from models.controls import party_controls
+from models.combat import resolve_hits
+from models import stage
+
+MIN_FIGHTERS = 2
+MAX_FIGHTERS = 16
+
+
+class FreeForAllMatch(Match):
+    """
+    Match between any number of fighters. Hits use attack hitboxes against hurtboxes with a
+    sort-and-sweep broad phase (models.combat); the last fighter standing wins, and `winner`
+    is 0 when the last ones fall on the same tick.
+    """
+
+    def update_player(self, player, mask, current_time):
+        # Los luchadores derrotados ya no reciben entradas
+        super().update_player(player, 0 if player.is_defeated() else mask, current_time)
+
+    def resolve_combat(self):
+        resolve_hits(self.players)
+
+    def check_winner(self):
+        standing = [index for index, player in enumerate(self.players) if not player.is_defeated()]
+        if len(standing) == 1:
+            self.winner = standing[0] + 1
+        elif not standing:
+            self.winner = 0
+
+
+def party_spawns(count, level):
+    """
+    The level's spawn points when there are enough, otherwise `count` points spread along the stage.
+    """
+    if count <= len(level.spawns):
+        return level.spawns[:count]
+    left, right = 100, 1130
+    return [(left + (right - left) * index // (count - 1), 300) for index in range(count)]
+
+
+def create_party(count, animations=None, use_atlas=False, level=None, controls=None, **options):
+    """
+    Free-for-all between `count` samurais sharing the same AnimationBanks.
+    `controls` gives one controls dict per fighter (default: keyboard layouts, then virtual keys).
+    Extra keyword arguments go to the match (e.g. swept_collision).
+    """
+    if not MIN_FIGHTERS <= count <= MAX_FIGHTERS:
+        raise ValueError(f"A party needs {MIN_FIGHTERS} to {MAX_FIGHTERS} fighters, got {count}")
+    if level is None:
+        level = stage.default_level
+    if controls is None:
+        controls = party_controls(count)
+    players = [create_fighter(x, y, animations, fighter_controls, use_atlas)
+               for (x, y), fighter_controls in zip(party_spawns(count, level), controls)]
+    return FreeForAllMatch(players, level.colliders, level.diagonal_platforms, geometry=level.geometry, **options)
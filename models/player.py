@@ -1,9 +1,32 @@
+import struct
 import pygame
+from models.animation import AnimationBanks, mirror_frames
+from models.controls import UP, LEFT, RIGHT, DEFEND, ATTACK
+from models.sweep import SNAP_DISTANCE, landing_height
+
+LAND_EVENT_SPEED = 4  # Velocidad mínima de caída (px/tick) para avisar de un aterrizaje
+
 
 class Player:
-    def __init__(self, x, y, sprite_sheets, controls, frame_width, frame_height, animation_speed):
+    # Estado de simulación empaquetado: x, y, velocidad vertical, vida, último ataque, en el suelo,
+    # atacando, defendiendo, mirando a la izquierda, animación (índice), fotograma y contador de animación
+    STATE = struct.Struct("<iidiq????BHH")
+
+    __slots__ = ("rect", "controls", "health", "is_attacking", "is_defending", "attack_cooldown", "last_attack_time",
+                 "velocity", "y_velocity", "gravity", "jump_strength", "on_ground", "facing_left", "sprite_sheets",
+                 "frame_width", "frame_height", "banks", "atlas", "current_animation", "current_frame",
+                 "animation_speed", "frame_counter", "listener")
+
+    def __init__(self, x, y, sprite_sheets, controls, frame_width, frame_height, animation_speed, animations=None,
+                 animations_left=None, use_atlas=False, atlas=None, banks=None):
         """
         Initialize the player object with animations for different states.
+        Sprites live in an AnimationBanks shared by every player of the same character; pass `banks`
+        to reuse one, or `animations` (state -> list of frames) to skip slicing the sprite sheets,
+        e.g. placeholders for headless simulation. The player itself only holds simulation state.
+        `use_atlas` draws from the banks' single-texture atlas and `atlas` reuses an already packed one.
+        The per-tick methods read the player's action bitmask (models.controls.ACTIONS); `controls` only
+        maps those actions to keys for whoever builds the masks.
         """
         self.rect = pygame.Rect(x, y, frame_width - 10, frame_height)
         self.controls = controls
@@ -24,7 +47,13 @@ class Player:
         self.sprite_sheets = sprite_sheets
         self.frame_width = frame_width
         self.frame_height = frame_height
-        self.animations = {state: self._load_frames(sheet) for state, sheet in sprite_sheets.items()}
+        if banks is None:
+            if animations is None:
+                loaded = {state: self._load_frames(sheet) for state, sheet in sprite_sheets.items()}
+                animations = {state: right for state, (right, left) in loaded.items()}
+                animations_left = {state: left for state, (right, left) in loaded.items()}
+            banks = AnimationBanks(animations, animations_left)
+        self.banks = banks
 
         # Validar que cada animación tiene fotogramas
         for state, frames in self.animations.items():
@@ -36,10 +65,31 @@ class Player:
         self.animation_speed = animation_speed
         self.frame_counter = 0
 
+        self.atlas = atlas
+        if self.atlas is None and use_atlas:
+            self.atlas = banks.atlas
+
+        # Gancho opcional listener(evento, jugador) para sonidos y efectos: "jump", "land", "hit", "hurt", "block"
+        self.listener = None
+
+    @property
+    def animations(self):
+        """
+        Right-facing frames per state (shared, read-only).
+        """
+        return self.banks.right
+
+    @property
+    def animations_left(self):
+        """
+        Left-facing frames per state (shared, read-only).
+        """
+        return self.banks.left
 
     def _load_frames(self, sprite_sheet):
         """
         Extract individual frames from a sprite sheet and scale them up to twice their size.
+        Returns the right-facing frames and their mirrored, left-facing copies.
         """
         sheet_width = sprite_sheet.get_width()
         frames = []
@@ -53,7 +103,7 @@ class Player:
 
             frames.append(scaled_frame)
 
-        return frames
+        return frames, mirror_frames(frames)
 
     def update_animation(self):
         """
@@ -65,29 +115,29 @@ class Player:
             self.frame_counter = 0
 
             # Validar que la animación actual tiene fotogramas
-            if len(self.animations[self.current_animation]) > 0:
+            if len(self.banks.right[self.current_animation]) > 0:
                 if self.current_animation in ["attacking", "jumping"]:
                     # Animaciones no cíclicas
-                    if self.current_frame + 1 >= len(self.animations[self.current_animation]):
+                    if self.current_frame + 1 >= len(self.banks.right[self.current_animation]):
                         self.current_frame = 0
                         self.current_animation = "idle"  # Cambiar a "idle" al finalizar
                     else:
                         self.current_frame += 1
                 else:
                     # Animaciones cíclicas (idle, running)
-                    self.current_frame = (self.current_frame + 1) % len(self.animations[self.current_animation])
+                    self.current_frame = (self.current_frame + 1) % len(self.banks.right[self.current_animation])
             else:
                 self.current_frame = 0  # Reiniciar fotograma si no hay fotogramas disponibles
 
-    def update_state(self, keys):
+    def update_state(self, mask):
         """
         Update the player's state based on input and conditions.
         Handle transitions between animations.
         """
         new_animation = None
-        if keys[self.controls["attack"]]:
+        if mask & ATTACK:
             new_animation = "attacking"
-        elif keys[self.controls["left"]] or keys[self.controls["right"]]:
+        elif mask & (LEFT | RIGHT):
             new_animation = "running"
         elif not self.on_ground:
             new_animation = "jumping"
@@ -99,11 +149,11 @@ class Player:
             self.current_animation = new_animation
             self.current_frame = 0  # Reiniciar al primer fotograma de la nueva animación
 
-    def move(self, keys, colliders):
+    def move(self, mask, colliders):
         """
         Handles player movement and wall collision.
         """
-        if keys[self.controls["left"]]:
+        if mask & LEFT:
             self.rect.x -= self.velocity
             self.facing_left = True  # Actualiza la dirección del jugador
             for collider in colliders:
@@ -111,7 +161,7 @@ class Player:
                     self.rect.left = collider.right
                     break
 
-        if keys[self.controls["right"]]:
+        if mask & RIGHT:
             self.rect.x += self.velocity
             self.facing_left = False  # Actualiza la dirección del jugador
             for collider in colliders:
@@ -129,6 +179,7 @@ class Player:
         # Check for collisions with floors (only when falling)
         for collider in colliders:
             if self.rect.colliderect(collider) and self.y_velocity > 0:
+                self._report_landing()
                 self.rect.bottom = collider.top
                 self.y_velocity = 0
                 self.on_ground = True
@@ -143,6 +194,7 @@ class Player:
                     and self.rect.bottom >= platform_y_left - 5
                     and self.rect.bottom <= platform_y_left + 10
             ):
+                self._report_landing()
                 self.rect.bottom = platform_y_left
                 self.y_velocity = 0
                 self.on_ground = True
@@ -155,6 +207,7 @@ class Player:
                     and self.rect.bottom >= platform_y_right - 5
                     and self.rect.bottom <= platform_y_right + 10
             ):
+                self._report_landing()
                 self.rect.bottom = platform_y_right
                 self.y_velocity = 0
                 self.on_ground = True
@@ -162,29 +215,61 @@ class Player:
 
         self.on_ground = False
 
-    def jump(self, keys):
+    def apply_gravity_swept(self, colliders, diagonal_platforms):
+        """
+        Applies gravity with a swept test: the whole fall of this tick is checked at once and the player
+        stops on the first floor or diagonal platform the feet cross, so no speed tunnels through thin floors.
+        Standing players also look SNAP_DISTANCE above and below their feet to follow slopes and step down
+        small drops (a raised floor is still a wall for move()).
+        """
+        self.y_velocity += self.gravity
+        landing = None
+        if self.y_velocity >= 0:
+            snap = SNAP_DISTANCE if self.on_ground else 0
+            landing = landing_height(self.rect, self.y_velocity, colliders, diagonal_platforms, snap)
+
+        if landing is None:
+            self.rect.y += self.y_velocity
+            self.on_ground = False
+        else:
+            self._report_landing()
+            self.rect.bottom = landing
+            self.y_velocity = 0
+            self.on_ground = True
+
+    def _report_landing(self):
+        """
+        Emit "land" when the player reaches the ground falling at LAND_EVENT_SPEED or faster.
+        """
+        if not self.on_ground and self.y_velocity >= LAND_EVENT_SPEED:
+            self.emit("land")
+
+    def jump(self, mask):
         """
         Allows the player to jump if on the ground.
         """
-        if keys[self.controls["up"]] and self.on_ground:
+        if mask & UP and self.on_ground:
             self.y_velocity = self.jump_strength
+            self.emit("jump")
 
-    def attack(self, keys):
+    def attack(self, mask, current_time=None):
         """
         Handles the player's attack action with cooldown.
+        `current_time` is in milliseconds; defaults to the wall clock (pygame.time.get_ticks()).
         """
-        current_time = pygame.time.get_ticks()
-        if keys[self.controls["attack"]] and current_time - self.last_attack_time > self.attack_cooldown:
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
+        if mask & ATTACK and current_time - self.last_attack_time > self.attack_cooldown:
             self.is_attacking = True
             self.last_attack_time = current_time
         else:
             self.is_attacking = False
 
-    def defend(self, keys):
+    def defend(self, mask):
         """
         Handles the player's defend action.
         """
-        self.is_defending = keys[self.controls["defend"]]
+        self.is_defending = bool(mask & DEFEND)
 
     def take_damage(self, amount):
         """
@@ -194,6 +279,49 @@ class Player:
             self.health -= amount
             if self.health < 0:
                 self.health = 0
+            self.emit("hurt")
+        else:
+            self.emit("block")
+
+    def emit(self, event):
+        """
+        Report a gameplay event to the listener, if any. Listeners must not change the simulation state.
+        """
+        if self.listener is not None:
+            self.listener(event, self)
+
+    def pack_into(self, buffer, offset=0):
+        """
+        Write the simulation state (no sprites, controls or tuning values) into `buffer` at `offset`,
+        e.g. a slot of a preallocated StateRing, without allocating.
+        """
+        rect = self.rect
+        self.STATE.pack_into(buffer, offset, rect.x, rect.y, self.y_velocity, self.health, self.last_attack_time,
+                             self.on_ground, self.is_attacking, self.is_defending, self.facing_left,
+                             self.banks.state_index[self.current_animation], self.current_frame, self.frame_counter)
+
+    def unpack_from(self, buffer, offset=0):
+        """
+        Read back a state written by pack_into().
+        """
+        (self.rect.x, self.rect.y, self.y_velocity, self.health, self.last_attack_time, self.on_ground,
+         self.is_attacking, self.is_defending, self.facing_left, animation, self.current_frame,
+         self.frame_counter) = self.STATE.unpack_from(buffer, offset)
+        self.current_animation = self.banks.states[animation]
+
+    def snapshot(self):
+        """
+        Compact, immutable copy of the simulation state, as Player.STATE.size bytes.
+        """
+        state = bytearray(self.STATE.size)
+        self.pack_into(state)
+        return bytes(state)
+
+    def restore(self, state):
+        """
+        Return to a state taken with snapshot().
+        """
+        self.unpack_from(state)
 
     def is_defeated(self):
         """
@@ -203,33 +331,61 @@ class Player:
 
     def draw(self, screen):
         """
-        Draw the current animation frame at the player's position.
+        Advance the animation and draw the current frame at the player's position.
         """
         self.update_animation()
+        self.render(screen)
 
-        # Verificar que hay fotogramas para la animación actual
-        if len(self.animations[self.current_animation]) > 0:
-            frame = self.animations[self.current_animation][self.current_frame]
+    def render_bounds(self, scale=1):
+        """
+        Screen areas covered by render(): the sprite frame and the health bar.
+        """
+        if self.atlas is not None:
+            width, height = self.atlas.frame_width, self.atlas.frame_height
         else:
+            width, height = self.banks.right[self.current_animation][self.current_frame].get_size()
+        anchor_x, anchor_y = self._sprite_anchor(scale)
+        sprite = pygame.Rect(anchor_x - width // 2, anchor_y - height, width, height)
+        return [sprite, self._health_bar(scale)]
+
+    def _sprite_anchor(self, scale):
+        """
+        Screen point where the bottom centre of the sprite goes (the feet sit 40 px above it).
+        """
+        return round(self.rect.centerx * scale), round((self.rect.bottom + 40) * scale)
+
+    def _health_bar(self, scale):
+        bar = (self.rect.centerx - 25, self.rect.top - 13, 50, 8)
+        return pygame.Rect(*(round(value * scale) for value in bar))
+
+    def render(self, screen, scale=1):
+        """
+        Draw the current animation frame at the player's position without advancing it.
+        `scale` maps stage coordinates to the pixels of `screen`; the banks must already hold
+        frames of that scale (core.assets.samurai_animations_at).
+        """
+        # Usar el banco ya espejado si el jugador está mirando hacia la izquierda
+        banks = self.banks
+        frames = (banks.left if self.facing_left else banks.right)[self.current_animation]
+
+        # Verificar que hay fotogramas para la animación actual
+        if len(frames) == 0:
             print(f"Warning: No frames available for animation state '{self.current_animation}'")
             return  # Evitar dibujar si no hay fotogramas disponibles
 
-        # Hacer espejo si el jugador está mirando hacia la izquierda
-        if self.facing_left:
-            frame = pygame.transform.flip(frame, True, False)
-
         # Dibujar el fotograma
-        sprite_x = self.rect.centerx - frame.get_width() // 2
-        sprite_y = self.rect.bottom - frame.get_height() + 40
-        screen.blit(frame, (sprite_x, sprite_y))
+        anchor_x, anchor_y = self._sprite_anchor(scale)
+        if self.atlas is not None:
+            area = self.atlas.area((self.current_animation, self.facing_left), self.current_frame)
+            screen.blit(self.atlas.surface, (anchor_x - area.width // 2, anchor_y - area.height), area)
+        else:
+            frame = frames[self.current_frame]
+            screen.blit(frame, (anchor_x - frame.get_width() // 2, anchor_y - frame.get_height()))
 
         # Dibujar barra de vida
-        health_bar_width = 50
-        health_bar_height = 8
+        bar = self._health_bar(scale)
         health_ratio = self.health / 100
-        bar_x = self.rect.centerx - health_bar_width // 2
-        bar_y = self.rect.top - health_bar_height - 5
-        pygame.draw.rect(screen, (255, 0, 0), (bar_x, bar_y, health_bar_width, health_bar_height))
-        pygame.draw.rect(screen, (0, 255, 0), (bar_x, bar_y, health_bar_width * health_ratio, health_bar_height))
+        pygame.draw.rect(screen, (255, 0, 0), bar)
+        pygame.draw.rect(screen, (0, 255, 0), (bar.x, bar.y, bar.width * health_ratio, bar.height))
         # Dibujar la hitbox (opcional, para depuración)
         #  pygame.draw.rect(screen, (255, 0, 0), self.rect, 2)  # Borde rojo
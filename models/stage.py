@@ -0,0 +1,8 @@
+from core.levels import load_level
+
+# Escenario por defecto, definido en assets/levels/dojo.json
+DEFAULT_LEVEL = "dojo"
+
+default_level = load_level(DEFAULT_LEVEL)
+colliders = default_level.colliders
+diagonal_platforms = default_level.diagonal_platforms
@@ -0,0 +1,40 @@
+from array import array
+
+
+class StateRing:
+    def __init__(self, match, capacity):
+        """
+        Preallocated ring of packed match states, one slot per tick (tick % capacity).
+        Saving writes straight into the slot and loading reads straight from it,
+        so rewinding never allocates, however often it happens.
+        """
+        self.match = match
+        self.capacity = capacity
+        self.slot_size = match.state_size
+        self.buffer = bytearray(self.slot_size * capacity)
+        self.ticks = array("q", [-1] * capacity)  # Tick guardado en cada ranura (-1 si está vacía)
+
+    def save(self):
+        """
+        Store the current state of the match under its tick; returns that tick.
+        """
+        tick = self.match.tick
+        slot = tick % self.capacity
+        self.match.pack_into(self.buffer, slot * self.slot_size)
+        self.ticks[slot] = tick
+        return tick
+
+    def has(self, tick):
+        """
+        True while the state of `tick` has not been overwritten.
+        """
+        return self.ticks[tick % self.capacity] == tick
+
+    def load(self, tick):
+        """
+        Rewind the match to the state saved for `tick`.
+        """
+        slot = tick % self.capacity
+        if self.ticks[slot] != tick:
+            raise KeyError(f"No state saved for tick {tick}")
+        self.match.unpack_from(self.buffer, slot * self.slot_size)
@@ -0,0 +1,34 @@
+SNAP_DISTANCE = 10  # Píxeles que un luchador en el suelo sube o baja para seguir rampas y bajar escalones
+
+
+def landing_height(rect, fall, colliders, diagonal_platforms, snap=0):
+    """
+    Swept test of the feet of `rect` moving down by `fall` pixels in one step.
+    Returns the height of the first floor top or slope the bottom edge crosses, or None.
+
+    A floor is crossed when it overlaps the body horizontally and its top lies between the
+    feet before and after the move. A slope is clipped to the width of the feet; since it is
+    a straight segment, its first contact is one of the two ends of that clipped part, so
+    each platform costs two evaluations whatever the speed. `snap` widens the sweep above
+    and below the feet (for fighters already standing, so they follow slopes and steps).
+    """
+    start = rect.bottom - snap
+    end = rect.bottom + fall + snap
+    left, right = rect.left, rect.right
+    best = None
+
+    for collider in colliders:
+        top = collider.top
+        if start <= top <= end and collider.left < right and collider.right > left and (best is None or top < best):
+            best = top
+
+    for platform in diagonal_platforms:
+        low, high = max(left, platform.x1), min(right, platform.x2)
+        if low > high:
+            continue
+        for x in (low, high):
+            y = platform.slope * x + platform.y_intercept
+            if start <= y <= end and (best is None or y < best):
+                best = y
+
+    return best
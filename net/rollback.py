@@ -0,0 +1,144 @@
+import zlib
+from models.state_ring import StateRing
+
+
+class RollbackSession:
+    def __init__(self, match, local_index, input_delay=2, max_rollback=8):
+        """
+        GGPO-style rollback over a two-player Match.
+        Local inputs are scheduled `input_delay` ticks ahead; missing remote inputs are
+        predicted by repeating the last confirmed one. When a remote input arrives and
+        differs from the prediction, the match is restored to that tick and re-simulated.
+        The session stalls rather than run more than `max_rollback` ticks past the last
+        confirmed remote input.
+        This is network plumbing only: the fight loop in views/game.py does not drive a
+        session yet, so the only caller is tools.netplay_loopback.
+        """
+        self.match = match
+        self.local_index = local_index
+        self.remote_index = 1 - local_index
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+
+        # Entradas confirmadas por jugador: tick -> máscara. Los primeros ticks sin entrada valen 0 en ambos lados
+        self.inputs = [{frame: 0 for frame in range(input_delay)} for _ in range(2)]
+        self.predicted = {}  # tick -> máscara remota usada al simular
+        self.confirmed_remote = input_delay - 1  # Último tick remoto confirmado sin huecos
+        self.remote_ack = 0  # El par ya tiene nuestras entradas anteriores a este tick
+        self.rollback_to = None
+
+        self.snapshots = StateRing(match, max_rollback + 2)
+        self.rollbacks = 0
+        self.resimulated_ticks = 0
+
+    @property
+    def frame(self):
+        """
+        Next tick to simulate.
+        """
+        return self.match.tick
+
+    def add_local_input(self, mask):
+        """
+        Schedule the local input for tick frame + input_delay; returns that tick.
+        """
+        target = self.frame + self.input_delay
+        self.inputs[self.local_index][target] = mask
+        return target
+
+    def local_inputs_since(self, frame, limit=64):
+        """
+        Local inputs from `frame` on, to (re)send to the peer.
+        """
+        local = self.inputs[self.local_index]
+        result = []
+        while frame in local and len(result) < limit:
+            result.append((frame, local[frame]))
+            frame += 1
+        return result
+
+    def acknowledge(self, frame):
+        """
+        The peer has every local input before `frame`; they no longer need to be resent.
+        """
+        self.remote_ack = max(self.remote_ack, frame)
+
+    def add_remote_input(self, frame, mask):
+        """
+        Register a confirmed remote input, scheduling a rollback if it contradicts a prediction.
+        """
+        remote = self.inputs[self.remote_index]
+        if frame in remote or frame <= self.confirmed_remote:
+            return
+        remote[frame] = mask
+        if frame < self.frame and self.predicted.get(frame) != mask:
+            self.rollback_to = frame if self.rollback_to is None else min(self.rollback_to, frame)
+        while self.confirmed_remote + 1 in remote:
+            self.confirmed_remote += 1
+
+    def is_settled(self):
+        """
+        True when every simulated tick used confirmed inputs only (no prediction left to correct).
+        """
+        return self.rollback_to is None and self.confirmed_remote >= self.frame - 1
+
+    def can_advance(self):
+        return self.frame - self.confirmed_remote <= self.max_rollback
+
+    def _remote_input(self, frame):
+        remote = self.inputs[self.remote_index]
+        if frame in remote:
+            return remote[frame]
+        return remote.get(self.confirmed_remote, 0)  # Predicción: repetir la última entrada confirmada
+
+    def _simulate(self):
+        frame = self.frame
+        self.snapshots.save()
+        masks = [0, 0]
+        masks[self.local_index] = self.inputs[self.local_index].get(frame, 0)
+        masks[self.remote_index] = self.predicted[frame] = self._remote_input(frame)
+        self.match.step(masks)
+
+    def resolve(self):
+        """
+        Apply a pending rollback: restore the first mispredicted tick and re-simulate up to the present.
+        """
+        if self.rollback_to is None:
+            return
+        target, present = self.rollback_to, self.frame
+        self.rollback_to = None
+        if not self.snapshots.has(target):
+            raise RuntimeError(f"No snapshot for tick {target}; max_rollback is too small")
+        self.snapshots.load(target)
+        self.rollbacks += 1
+        while self.frame < present:
+            self._simulate()
+            self.resimulated_ticks += 1
+
+    def advance(self):
+        """
+        Resolve pending rollbacks and simulate one new tick; returns False while stalled waiting for the peer.
+        """
+        self.resolve()
+        if not self.can_advance():
+            return False
+        self._simulate()
+        self._forget(self.frame - self.max_rollback - 2)
+        return True
+
+    def _forget(self, before):
+        # Descartar entradas y predicciones que ya no pueden provocar un rollback;
+        # las locales además deben haber llegado al par
+        for frame in (before - 1, before):
+            self.predicted.pop(frame, None)
+            if frame < self.confirmed_remote:
+                self.inputs[self.remote_index].pop(frame, None)
+        local = self.inputs[self.local_index]
+        for frame in [frame for frame in local if frame < min(before, self.remote_ack)]:
+            del local[frame]
+
+    def checksum(self):
+        """
+        CRC of the match state, to compare both peers once the same ticks are confirmed.
+        """
+        return zlib.crc32(self.match.snapshot())
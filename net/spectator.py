@@ -0,0 +1,445 @@
+import asyncio
+import base64
+import hashlib
+import os
+import socket
+import struct
+import threading
+from core.pipeline import FighterFrame, fighter_frames
+
+SPECTATOR_VERSION = 1
+HELLO = b"SWSP"  # Lo primero que envía un cliente TCP; un cliente WebSocket empieza con "GET "
+KEYFRAME_INTERVAL = 60  # Ticks entre fotogramas completos
+MAX_CLIENT_BUFFER = 64 * 1024  # Bytes pendientes por cliente antes de empezar a descartar deltas
+
+# Mensajes: 0 = configuración, 1 = fotograma completo, 2 = delta respecto al último fotograma completo.
+# Por TCP cada mensaje va precedido de su longitud; por WebSocket va en una trama binaria
+LENGTH = struct.Struct("<H")
+SETUP = struct.Struct("<BBHB")  # tipo, versión, ticks por segundo, número de animaciones (y sus nombres)
+KEYFRAME = struct.Struct("<BIbB")  # tipo, tick, ganador (-1 si sigue), luchadores
+DELTA = struct.Struct("<BIIbH")  # tipo, tick, tick del fotograma completo, ganador, luchadores cambiados
+FIGHTER = struct.Struct("<iiBBBB")  # x, y, animación, fotograma, mirando a la izquierda, vida
+SETUP_MESSAGE, KEYFRAME_MESSAGE, DELTA_MESSAGE = range(3)
+
+# Campos de un luchador en un delta: cada bit de la máscara indica un campo presente, en este orden
+FIELD_FORMATS = "iiBBBB"
+FIELD_STRUCTS = [struct.Struct("<B" + "".join(code for bit, code in enumerate(FIELD_FORMATS) if mask & (1 << bit)))
+                 for mask in range(1 << len(FIELD_FORMATS))]
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class StateEncoder:
+    def __init__(self, state_names, keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Turns the fighters of each tick into keyframes and deltas.
+        A delta only carries the fields that changed since the last keyframe (not since the last delta),
+        so any delta can be decoded with just the keyframe before it and a client may skip deltas.
+        """
+        self.state_index = {state: index for index, state in enumerate(state_names)}
+        self.keyframe_interval = keyframe_interval
+        self.keyframe_tick = None
+        self.base = None  # Filas del último fotograma completo
+
+    def encode(self, tick, winner, fighters):
+        """
+        Encode one tick of FighterFrames; returns (message, is_keyframe).
+        """
+        rows = [(fighter.x, fighter.y, self.state_index[fighter.animation], fighter.frame, fighter.facing_left,
+                 fighter.health) for fighter in fighters]
+        winner = -1 if winner is None else winner
+        base = self.base
+        if (base is None or len(rows) != len(base) or not 0 <= tick - self.keyframe_tick < self.keyframe_interval):
+            self.base, self.keyframe_tick = rows, tick
+            message = bytearray(KEYFRAME.pack(KEYFRAME_MESSAGE, tick, winner, len(rows)))
+            for row in rows:
+                message += FIGHTER.pack(*row)
+            return bytes(message), True
+
+        changed = 0
+        body = bytearray()
+        for index, (row, old) in enumerate(zip(rows, base)):
+            if row == old:
+                continue
+            mask = 0
+            values = []
+            for bit, (value, old_value) in enumerate(zip(row, old)):
+                if value != old_value:
+                    mask |= 1 << bit
+                    values.append(value)
+            changed |= 1 << index
+            body += FIELD_STRUCTS[mask].pack(mask, *values)
+        return DELTA.pack(DELTA_MESSAGE, tick, self.keyframe_tick, winner, changed) + body, False
+
+
+def setup_message(state_names, tick_rate):
+    message = bytearray(SETUP.pack(SETUP_MESSAGE, SPECTATOR_VERSION, tick_rate, len(state_names)))
+    for name in state_names:
+        encoded = name.encode()
+        message += bytes((len(encoded),)) + encoded
+    return bytes(message)
+
+
+class StateDecoder:
+    def __init__(self):
+        """
+        Client side of StateEncoder: rebuilds the fighters of each tick as FighterFrames.
+        """
+        self.state_names = None
+        self.tick_rate = None
+        self.keyframe_tick = None
+        self.base = None
+        self.tick = None
+        self.winner = None
+        self.fighters = None
+
+    def feed(self, message):
+        """
+        Decode one message; returns the fighters when it carried a tick, otherwise None.
+        Raises ValueError for deltas whose keyframe never arrived.
+        """
+        kind = message[0]
+        if kind == SETUP_MESSAGE:
+            _, version, self.tick_rate, count = SETUP.unpack_from(message)
+            if version != SPECTATOR_VERSION:
+                raise ValueError(f"Unsupported spectator stream version {version}")
+            names, offset = [], SETUP.size
+            for _ in range(count):
+                length = message[offset]
+                names.append(message[offset + 1:offset + 1 + length].decode())
+                offset += 1 + length
+            self.state_names = names
+            return None
+
+        if kind == KEYFRAME_MESSAGE:
+            _, tick, winner, count = KEYFRAME.unpack_from(message)
+            self.base = [FIGHTER.unpack_from(message, KEYFRAME.size + index * FIGHTER.size) for index in range(count)]
+            self.keyframe_tick = tick
+            rows = self.base
+        elif kind == DELTA_MESSAGE:
+            _, tick, keyframe_tick, winner, changed = DELTA.unpack_from(message)
+            if keyframe_tick != self.keyframe_tick:
+                raise ValueError(f"Delta for keyframe {keyframe_tick}, but the last keyframe is {self.keyframe_tick}")
+            rows, offset = [], DELTA.size
+            for index, old in enumerate(self.base):
+                if not changed & (1 << index):
+                    rows.append(old)
+                    continue
+                fields = FIELD_STRUCTS[message[offset]]
+                mask, *values = fields.unpack_from(message, offset)
+                offset += fields.size
+                values = iter(values)
+                rows.append(tuple(next(values) if mask & (1 << bit) else value for bit, value in enumerate(old)))
+        else:
+            raise ValueError(f"Unknown spectator message type {kind}")
+
+        self.tick = tick
+        self.winner = None if winner < 0 else winner
+        self.fighters = tuple(FighterFrame(x, y, bool(facing_left), self.state_names[animation], frame, health)
+                              for x, y, animation, frame, facing_left, health in rows)
+        return self.fighters
+
+
+def websocket_frame(payload):
+    """
+    Unmasked binary WebSocket frame, as sent by a server.
+    """
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x82, length))
+    elif length < 1 << 16:
+        header = bytes((0x82, 126)) + length.to_bytes(2, "big")
+    else:
+        header = bytes((0x82, 127)) + length.to_bytes(8, "big")
+    return header + payload
+
+
+async def read_websocket_frame(reader):
+    """
+    (opcode, payload) of the next frame, unmasking it when the sender is a client.
+    """
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), "big")
+    elif length == 127:
+        length = int.from_bytes(await reader.readexactly(8), "big")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None:
+        payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+    return first & 0x0F, payload
+
+
+def websocket_accept(key):
+    return base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+
+
+class _Spectator:
+    def __init__(self, writer, websocket):
+        """
+        One connected viewer. Holds at most the keyframe it still needs and the newest delta:
+        while its socket is backed up, older deltas are replaced (and counted as dropped).
+        """
+        self.writer = writer
+        self.websocket = websocket
+        self.keyframe = None
+        self.latest = None
+        self.wakeup = asyncio.Event()
+        self.sent_bytes = 0
+        self.sent_messages = 0
+        self.dropped = 0
+
+    def offer(self, message, keyframe=False):
+        if self.latest is not None:
+            self.dropped += 1
+            self.latest = None
+        if keyframe:
+            if self.keyframe is not None:
+                self.dropped += 1
+            self.keyframe = message
+        else:
+            self.latest = message
+        self.wakeup.set()
+
+    def send(self, message):
+        data = websocket_frame(message) if self.websocket else LENGTH.pack(len(message)) + message
+        self.writer.write(data)
+        self.sent_bytes += len(data)
+        self.sent_messages += 1
+
+    async def run(self):
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            for message in (self.keyframe, self.latest):
+                if message is not None:
+                    self.send(message)
+            self.keyframe = self.latest = None
+            await self.writer.drain()  # Espera solo a este cliente si su búfer supera MAX_CLIENT_BUFFER
+
+
+class SpectatorServer:
+    def __init__(self, state_names, tick_rate, keyframe_interval=KEYFRAME_INTERVAL,
+                 max_client_buffer=MAX_CLIENT_BUFFER):
+        """
+        Broadcasts the fighters of a live match to any number of viewers over TCP or WebSocket,
+        on the same port. `state_names` are the animation states of the fighters (AnimationBanks.states).
+        Each tick is encoded once and fanned out; a slow viewer only ever delays itself.
+        """
+        self.encoder = StateEncoder(state_names, keyframe_interval)
+        self.setup = setup_message(state_names, tick_rate)
+        self.max_client_buffer = max_client_buffer
+        self.keyframe = None  # Último fotograma completo, para los que se conectan a mitad
+        self.clients = set()
+        self.server = None
+        self.loop = None
+        self.port = None
+        self.broadcasts = 0
+        self.encode_seconds = 0.0
+        self.closed_sent_bytes = 0
+        self.closed_dropped = 0
+        self._thread = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._handle, host, port, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def broadcast(self, tick, winner, fighters):
+        """
+        Send one tick to every viewer. Must run on the server's event loop (see publish()).
+        """
+        began = self.loop.time()
+        message, keyframe = self.encoder.encode(tick, winner, fighters)
+        if keyframe:
+            self.keyframe = message
+        for client in self.clients:
+            client.offer(message, keyframe)
+        self.encode_seconds += self.loop.time() - began
+        self.broadcasts += 1
+
+    def publish(self, match):
+        """
+        Sample the fighters of `match` after a tick and broadcast them; safe to call from the game
+        thread when the server runs with start_in_thread().
+        """
+        if self.loop is None:
+            return
+        fighters = fighter_frames(match)
+        if self._thread is threading.current_thread() or self._thread is None:
+            self.broadcast(match.tick, match.winner, fighters)
+        else:
+            self.loop.call_soon_threadsafe(self.broadcast, match.tick, match.winner, fighters)
+
+    def start_in_thread(self, host="127.0.0.1", port=0):
+        """
+        Run the server on its own event loop thread (for a game loop that is not asyncio); returns the port.
+        """
+        started = threading.Event()
+
+        def serve():
+            async def main():
+                await self.start(host, port)
+                started.set()
+                await self.server.serve_forever()
+
+            try:
+                asyncio.run(main())
+            except asyncio.CancelledError:
+                pass
+
+        self._thread = threading.Thread(target=serve, name="spectators", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.port
+
+    async def close(self, timeout=1.0):
+        """
+        Stop accepting viewers and disconnect the current ones.
+        """
+        self.server.close()
+        for client in list(self.clients):
+            client.writer.close()
+        deadline = self.loop.time() + timeout
+        while self.clients and self.loop.time() < deadline:
+            await asyncio.sleep(0.01)
+
+    def stop(self):
+        """
+        Stop a server started with start_in_thread().
+        """
+        if self._thread is not None and self.server is not None:
+            asyncio.run_coroutine_threadsafe(self.close(), self.loop).result(timeout=2)
+            self._thread.join(timeout=1)
+
+    def stats(self):
+        """
+        Viewers, bytes sent, messages dropped by backpressure and encode time per tick.
+        """
+        return {
+            "clients": len(self.clients),
+            "sent_bytes": self.closed_sent_bytes + sum(client.sent_bytes for client in self.clients),
+            "dropped": self.closed_dropped + sum(client.dropped for client in self.clients),
+            "broadcasts": self.broadcasts,
+            "encode_us": self.encode_seconds / max(1, self.broadcasts) * 1e6,
+        }
+
+    async def _handle(self, reader, writer):
+        writer.transport.set_write_buffer_limits(high=self.max_client_buffer)
+        # Sin límite el núcleo amplía su búfer de envío hasta megabytes y un espectador lento acumularía
+        # minutos de fotogramas viejos antes de que drain() llegue a esperar y empiecen los descartes
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.max_client_buffer)
+        try:
+            websocket = await self._handshake(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+            return
+
+        client = _Spectator(writer, websocket)
+        client.send(self.setup)
+        if self.keyframe is not None:
+            client.offer(self.keyframe, keyframe=True)
+        self.clients.add(client)
+        sender = asyncio.ensure_future(client.run())
+        try:
+            await self._wait_for_close(reader, websocket)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.clients.discard(client)
+            self.closed_sent_bytes += client.sent_bytes
+            self.closed_dropped += client.dropped
+            sender.cancel()
+            writer.close()
+
+    @staticmethod
+    async def _handshake(reader, writer):
+        """
+        Tell TCP viewers (HELLO) from WebSocket ones and answer the WebSocket upgrade; returns True for WebSocket.
+        """
+        start = await reader.readexactly(4)
+        if start == HELLO:
+            return False
+        if start != b"GET ":
+            raise ValueError("Not a spectator client")
+        request = start + await reader.readuntil(b"\r\n\r\n")
+        headers = {}
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get("sec-websocket-key")
+        if key is None:
+            raise ValueError("Missing Sec-WebSocket-Key")
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {websocket_accept(key)}\r\n\r\n").encode())
+        return True
+
+    @staticmethod
+    async def _wait_for_close(reader, websocket):
+        """
+        Viewers have nothing to say: just wait for the connection (or a WebSocket close frame) to end.
+        """
+        while True:
+            if websocket:
+                opcode, _ = await read_websocket_frame(reader)
+                if opcode == 0x8:
+                    return
+            elif not await reader.read(1024):
+                return
+
+
+class SpectatorClient:
+    def __init__(self, reader, writer, websocket):
+        """
+        Headless viewer connection; iterate over frames() to get the decoder after every tick.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.websocket = websocket
+        self.decoder = StateDecoder()
+        self.received_bytes = 0
+        self.received_messages = 0
+
+    @classmethod
+    async def connect(cls, host, port, websocket=False):
+        reader, writer = await asyncio.open_connection(host, port)
+        if websocket:
+            key = base64.b64encode(os.urandom(16)).decode()
+            writer.write((f"GET / HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                          f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+            response = await reader.readuntil(b"\r\n\r\n")
+            if websocket_accept(key).encode() not in response:
+                writer.close()
+                raise ConnectionError("The server did not accept the WebSocket upgrade")
+        else:
+            writer.write(HELLO)
+        return cls(reader, writer, websocket)
+
+    async def read_message(self):
+        if self.websocket:
+            _, message = await read_websocket_frame(self.reader)
+            self.received_bytes += len(message) + (2 if len(message) < 126 else 4)
+        else:
+            (length,) = LENGTH.unpack(await self.reader.readexactly(LENGTH.size))
+            message = await self.reader.readexactly(length)
+            self.received_bytes += LENGTH.size + length
+        self.received_messages += 1
+        return message
+
+    async def frames(self):
+        """
+        Yield the decoder every time a tick arrives, until the server closes the connection.
+        """
+        try:
+            while True:
+                if self.decoder.feed(await self.read_message()) is not None:
+                    yield self.decoder
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+
+    def close(self):
+        self.writer.close()
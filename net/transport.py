@@ -0,0 +1,94 @@
+import asyncio
+import random
+import struct
+
+# Paquete de entradas: primer tick incluido, último tick remoto recibido sin huecos (+1), cantidad
+INPUT_HEADER = struct.Struct("<IIB")
+MAX_INPUTS_PER_PACKET = 64
+
+
+class LinkConditions:
+    def __init__(self, delay_ms=0, jitter_ms=0, loss=0.0, seed=None):
+        """
+        Simulated network on the sending side: fixed delay, uniform jitter and packet loss (0..1).
+        """
+        self.delay_ms = delay_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.rng = random.Random(seed)
+
+    def schedule(self):
+        """
+        Seconds until delivery, or None if the packet is dropped.
+        """
+        if self.loss and self.rng.random() < self.loss:
+            return None
+        return max(0.0, self.delay_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+
+class InputChannel(asyncio.DatagramProtocol):
+    def __init__(self, session, remote_addr, conditions=None):
+        """
+        UDP link carrying the rollback inputs of one peer.
+        Every packet repeats all local inputs the peer has not acknowledged yet,
+        so a lost packet is covered by the next one.
+        """
+        self.session = session
+        self.remote_addr = remote_addr
+        self.conditions = conditions or LinkConditions()
+        self.transport = None
+        self.remote_ack = 0  # El par tiene todas nuestras entradas anteriores a este tick
+        self.sent_packets = 0
+        self.received_packets = 0
+        self.sent_bytes = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        try:
+            first, ack, count = INPUT_HEADER.unpack_from(data)
+        except struct.error:
+            return  # Paquete corrupto o ajeno
+        masks = data[INPUT_HEADER.size:INPUT_HEADER.size + count]
+        self.received_packets += 1
+        if ack > self.remote_ack:
+            self.remote_ack = ack
+            self.session.acknowledge(ack)
+        for offset, mask in enumerate(masks):
+            self.session.add_remote_input(first + offset, mask)
+
+    def send_inputs(self):
+        """
+        Send the unacknowledged local inputs together with our own acknowledgement.
+        """
+        if self.transport is None:
+            return
+        inputs = self.session.local_inputs_since(self.remote_ack, MAX_INPUTS_PER_PACKET)
+        first = inputs[0][0] if inputs else self.remote_ack
+        packet = INPUT_HEADER.pack(first, self.session.confirmed_remote + 1, len(inputs))
+        packet += bytes(mask for frame, mask in inputs)
+
+        delay = self.conditions.schedule()
+        self.sent_packets += 1
+        self.sent_bytes += len(packet)
+        if delay is None:
+            return
+        if delay == 0:
+            self.transport.sendto(packet, self.remote_addr)
+        else:
+            asyncio.get_running_loop().call_later(delay, self._deliver, packet)
+
+    def _deliver(self, packet):
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.sendto(packet, self.remote_addr)
+
+
+async def open_input_channel(session, local_addr, remote_addr, conditions=None):
+    """
+    Bind a UDP socket on `local_addr` and connect the session to the peer at `remote_addr`.
+    """
+    loop = asyncio.get_running_loop()
+    transport, channel = await loop.create_datagram_endpoint(
+        lambda: InputChannel(session, remote_addr, conditions), local_addr=local_addr)
+    return channel
@@ -0,0 +1,29 @@
+import os
+import sys
+import pytest
+
+# Las pruebas corren sin ventana ni audio, desde la raíz del repositorio
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def face_to_face():
+    """
+    Factory of headless matches with both fighters standing on the same spot, past the first
+    attack cooldown, so any attack connects.
+    """
+    from models.match import create_match
+
+    def build():
+        match = create_match()
+        player1, player2 = match.players
+        player2.rect.topleft = player1.rect.topleft
+        for _ in range(60):
+            match.step([0, 0])
+        assert player1.on_ground and player2.on_ground
+        return match
+
+    return build
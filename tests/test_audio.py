@@ -0,0 +1,58 @@
+import pygame
+import pytest
+from core.audio import MIXER_BUFFER, MIXER_CHANNELS, MIXER_FREQUENCY, MIXER_SIZE, AudioManager
+
+
+@pytest.fixture
+def mixer():
+    try:
+        pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+    except pygame.error as error:
+        pytest.skip(f"no mixer on the dummy audio driver: {error}")
+    yield
+    pygame.mixer.quit()
+
+
+def play(audio, *frames):
+    """
+    Trigger and flush each frame's effects in turn; returns the effect now on every voice.
+    """
+    sounds = audio.sfx.get()
+    for names in frames:
+        for name in names:
+            audio.trigger(name)
+        audio.flush()
+    by_sound = {sound: name for name, sound in sounds.items()}
+    return [by_sound.get(channel.get_sound()) if channel.get_busy() else None for channel in audio.channels]
+
+
+def test_free_voices_are_used_first(mixer):
+    audio = AudioManager(voices=3)
+    assert play(audio, ["jump"], ["hurt"]) == ["jump", "hurt", None]
+    assert (audio.played, audio.stolen, audio.dropped) == (2, 0, 0)
+
+
+def test_same_effect_plays_once_per_frame(mixer):
+    audio = AudioManager(voices=2)
+    assert play(audio, ["hit", "hit"]) == ["hit", None]
+    assert audio.played == 1
+
+
+def test_full_pool_steals_the_lowest_priority_voice(mixer):
+    audio = AudioManager(voices=2)
+    assert play(audio, ["hit"], ["jump"], ["hurt"]) == ["hit", "hurt"]
+    assert (audio.played, audio.stolen, audio.dropped) == (3, 1, 0)
+
+
+def test_equal_priority_steals_the_oldest_voice(mixer):
+    audio = AudioManager(voices=2)
+    assert play(audio, ["hit"], ["block"], ["hit"]) == ["hit", "block"]
+    assert audio.playing[0][1] > audio.playing[1][1]  # La voz 0 se volvió a usar la última
+    assert audio.stolen == 1
+
+
+def test_lower_priority_is_dropped_when_every_voice_matters_more(mixer):
+    audio = AudioManager(voices=2)
+    assert play(audio, ["hit"], ["block"], ["jump", "hurt"]) == ["hit", "block"]
+    assert (audio.played, audio.stolen, audio.dropped) == (2, 0, 2)
+    assert len(audio.latencies) == 2 and not audio.pending
@@ -0,0 +1,30 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+from benchmarks.bench_batch_physics import batch_state, make_matches, random_masks, scalar_state
+from models.batch_physics import BatchMatches
+
+
+def run_side_by_side(scalar, batched, ticks, seed):
+    masks = random_masks(np.random.default_rng(seed), len(scalar), ticks)
+    batch = BatchMatches(batched)
+    for tick in range(ticks):
+        for index, match in enumerate(scalar):
+            match.step(masks[tick, index].tolist())
+        batch.step(masks[tick])
+        for index, match in enumerate(scalar):
+            assert scalar_state(match) == batch_state(batch, index), f"match {index} diverged at tick {tick}"
+
+
+def test_batch_matches_scalar_step():
+    run_side_by_side(make_matches(20, 1), make_matches(20, 1), 300, 1)
+
+
+def test_batch_keeps_each_match_clock():
+    # Combates que entran en el lote con relojes distintos: los enfriamientos de ataque van por su tick
+    scalar, batched = make_matches(12, 2), make_matches(12, 2)
+    for index, (match, twin) in enumerate(zip(scalar, batched)):
+        for _ in range(index * 7):
+            match.step([0, 0])
+            twin.step([0, 0])
+    run_side_by_side(scalar, batched, 300, 2)
@@ -0,0 +1,28 @@
+from models.bots import SEARCH_NODE_BUDGETS, create_bot
+from models.match import create_match
+
+
+def search_game(ticks=120):
+    """
+    Inputs of a deterministic cpu-easy against the aggressive bot, and the most steps it simulated in a tick.
+    """
+    match = create_match()
+    bots = [create_bot("cpu-easy", seed=0, deterministic=True), create_bot("aggressive", seed=1)]
+    inputs, most = [], 0
+    for _ in range(ticks):
+        steps = bots[0].steps
+        masks = [bot.act(match, index) for index, bot in enumerate(bots)]
+        most = max(most, bots[0].steps - steps)
+        inputs.append(masks[0])
+        match.step(masks)
+    return inputs, most
+
+
+def test_node_budget_search_is_reproducible():
+    inputs, most = search_game()
+    assert search_game()[0] == inputs
+    assert most <= SEARCH_NODE_BUDGETS["easy"]
+
+
+def test_search_bot_knows_its_fighter_before_acting():
+    assert create_bot("cpu-normal").index == 0
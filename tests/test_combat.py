@@ -0,0 +1,37 @@
+import numpy as np
+from models.batch_physics import BatchMatches
+from models.controls import ATTACK, DEFEND
+
+
+def test_attack_hurts_without_defend(face_to_face):
+    match = face_to_face()
+    events = []
+    match.players[1].listener = lambda event, player: events.append(event)
+    match.step([ATTACK, 0])
+    assert match.players[1].health == 90
+    assert events == ["hurt"]
+
+
+def test_holding_defend_blocks(face_to_face):
+    match = face_to_face()
+    defender = match.players[1]
+    events = []
+    defender.listener = lambda event, player: events.append(event)
+    match.step([ATTACK, DEFEND])
+    assert defender.is_defending
+    assert defender.health == 100
+    assert events == ["block"]
+
+    match.step([0, 0])
+    assert not defender.is_defending
+
+
+def test_batch_physics_blocks_like_match(face_to_face):
+    scalar = face_to_face()
+    batch = BatchMatches([face_to_face()])
+    for masks in [(ATTACK, DEFEND), (0, 0)] * 20 + [(ATTACK, 0)] * 40:
+        scalar.step(masks)
+        batch.step(masks)
+        assert batch.is_defending.tolist() == [player.is_defending for player in scalar.players]
+        assert batch.health.tolist() == [player.health for player in scalar.players]
+    assert np.any(batch.health < 100)
@@ -0,0 +1,60 @@
+import json
+import os
+import pygame
+import pytest
+from core import levels
+from models.bots import RandomBot
+from models.level_geometry import LevelGeometry
+from models.match import Match, create_players
+
+
+def test_merged_rect_takes_the_place_of_its_first_part():
+    rects = levels.merge_rects([(0, 0, 10, 10), (50, 50, 5, 5), (10, 0, 10, 10)])
+    assert rects == [pygame.Rect(0, 0, 20, 10), pygame.Rect(50, 50, 5, 5)]
+
+
+def test_stale_compiled_level_is_rebuilt_outside_the_assets(tmp_path, monkeypatch):
+    assets, cache = tmp_path / "levels", tmp_path / "cache"
+    assets.mkdir()
+    source = assets / "dojo.json"
+    source.write_text(open(os.path.join(levels.LEVELS_DIR, "dojo.json"), encoding="utf-8").read(), encoding="utf-8")
+    monkeypatch.setattr(levels, "LEVELS_DIR", str(assets))
+    monkeypatch.setattr(levels, "LEVEL_CACHE_DIR", str(cache))
+    monkeypatch.setattr(levels, "_levels", {})
+    level = levels.load_level("dojo")
+    assert sorted(os.listdir(assets)) == ["dojo.json"]
+    assert os.listdir(cache) == ["dojo.lvl"]
+    monkeypatch.setattr(levels, "_levels", {})
+    assert levels.load_level("dojo").colliders == level.colliders
+
+
+def unmerged(name):
+    """
+    The stage as authored: every collider of the JSON, in its order, without merge_rects().
+    """
+    with open(os.path.join(levels.LEVELS_DIR, name + ".json"), encoding="utf-8") as file:
+        source = json.load(file)
+    level = levels.build_level(source)
+    colliders = [pygame.Rect(rect) for rect in source["colliders"]]
+    level.colliders = colliders
+    level.geometry = LevelGeometry(colliders, level.diagonal_platforms, level.geometry.cell_size)
+    return level
+
+
+def fighters_path(level, swept_collision, seed, ticks=900):
+    match = Match(create_players(spawns=level.spawns), level.colliders, level.diagonal_platforms,
+                  geometry=level.geometry, swept_collision=swept_collision)
+    bots = [RandomBot(seed), RandomBot(seed + 1)]
+    path = []
+    for _ in range(ticks):
+        match.step([bot.act(match, index) for index, bot in enumerate(bots)])
+        path.append([(tuple(player.rect), player.health) for player in match.players])
+    return path
+
+
+@pytest.mark.parametrize("name", levels.level_names())
+@pytest.mark.parametrize("swept_collision", [False, True])
+def test_merged_colliders_resolve_like_the_authored_ones(name, swept_collision):
+    for seed in range(0, 8, 2):
+        assert (fighters_path(levels.load_level(name), swept_collision, seed)
+                == fighters_path(unmerged(name), swept_collision, seed))
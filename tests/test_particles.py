@@ -0,0 +1,64 @@
+import pygame
+from core.particles import EFFECT_NAMES, EFFECTS, KIND, LIFE, X, Y, ParticleSystem
+
+
+class Emitter:
+    """
+    Stand-in for a Player: just the rect and facing the listener reads.
+    """
+    def __init__(self, facing_left=False):
+        self.rect = pygame.Rect(300, 400, 86, 96)
+        self.facing_left = facing_left
+
+
+def test_bursts_past_capacity_are_dropped():
+    particles = ParticleSystem(capacity=30, seed=0)
+    particles.trigger("hit", Emitter())
+    particles.trigger("block", Emitter())
+    particles.update(0)
+    overflow = EFFECTS["hit"].count + EFFECTS["block"].count - 30
+    assert (particles.count, particles.spawned, particles.dropped) == (30, 30, overflow)
+    particles.trigger("jump", Emitter())
+    particles.update(0)
+    assert (particles.count, particles.dropped) == (30, overflow + EFFECTS["jump"].count)
+    assert particles.state.shape[1] == 30  # El depósito no crece
+
+
+def test_dead_particles_are_compacted_away():
+    particles = ParticleSystem(seed=0)
+    particles.trigger("hit", Emitter())
+    particles.trigger("land", Emitter())
+    particles.update(0)
+    lives = particles.state[LIFE, :particles.count].copy()
+    kinds = particles.state[KIND, :particles.count].copy()
+    ticks = EFFECTS["hit"].lifetime[1]  # Ninguna chispa de golpe vive tanto
+    particles.update(ticks)
+    survivors = lives > ticks
+    assert particles.count == survivors.sum()
+    assert (particles.state[KIND, :particles.count] == EFFECT_NAMES.index("land")).all()
+    assert sorted(particles.state[LIFE, :particles.count]) == sorted(lives[survivors])
+    assert (kinds[survivors] == EFFECT_NAMES.index("land")).all()
+
+
+def test_freed_slots_are_reused_after_overflow():
+    particles = ParticleSystem(capacity=EFFECTS["hit"].count, seed=0)
+    particles.trigger("hit", Emitter())
+    particles.trigger("hit", Emitter())
+    particles.update(EFFECTS["hit"].lifetime[1])
+    assert particles.count == 0 and particles.dropped == EFFECTS["hit"].count
+    particles.trigger("block", Emitter())
+    particles.update(0)
+    assert particles.count == EFFECTS["block"].count
+
+
+def test_update_of_several_ticks_matches_single_ticks():
+    batched, stepped = ParticleSystem(seed=3), ParticleSystem(seed=3)
+    for particles in (batched, stepped):
+        particles.trigger("hurt", Emitter(facing_left=True))
+        particles.update(0)
+    batched.update(5)
+    for _ in range(5):
+        stepped.update(1)
+    assert batched.count == stepped.count
+    for row in (X, Y):
+        assert abs(batched.state[row, :batched.count] - stepped.state[row, :stepped.count]).max() < 1e-3
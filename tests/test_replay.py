@@ -0,0 +1,60 @@
+import pytest
+from core.levels import load_level
+from core.replay import Replay, ReplayRecorder, replay_match, run_replay
+from models.bots import create_bot
+from models.match import create_match
+from models.party import FreeForAllMatch, create_party
+
+
+def record(match, level, path):
+    """
+    Play `match` between scripted bots, save its replay to `path` and return the final state.
+    """
+    recorder = ReplayRecorder.for_match(match, level)
+    bots = [create_bot(("aggressive", "hit-and-run")[index % 2], seed=index) for index in range(len(match.players))]
+    while not match.is_over() and match.tick < 1200:
+        masks = [bot.act(match, index) for index, bot in enumerate(bots)]
+        recorder.record(masks)
+        match.step(masks)
+    recorder.save(path)
+    return match.winner, match.tick, [(tuple(player.rect), player.health) for player in match.players]
+
+
+def replayed(path):
+    replay = Replay.load(path)
+    match = replay_match(replay)
+    winner = run_replay(replay, match)
+    return winner, match.tick, [(tuple(player.rect), player.health) for player in match.players]
+
+
+def test_versus_replay_rebuilds_level(tmp_path):
+    level = load_level("entrenamiento")
+    path = tmp_path / "versus.swr"
+    result = record(create_match(level=level), level, path)
+    replay = Replay.load(path)
+    assert (replay.level, replay.player_count, replay.swept_collision) == ("entrenamiento", 2, False)
+    assert replayed(path) == result
+
+
+def test_party_replay_rebuilds_fighters(tmp_path):
+    level = load_level("dojo")
+    path = tmp_path / "party.swr"
+    result = record(create_party(4, level=level, swept_collision=True), level, path)
+    replay = Replay.load(path)
+    assert (replay.player_count, replay.swept_collision) == (4, True)
+    assert isinstance(replay_match(replay), FreeForAllMatch)
+    assert replayed(path) == result
+
+
+def test_replay_rejects_other_fighter_count(tmp_path):
+    level = load_level("dojo")
+    path = tmp_path / "party.swr"
+    record(create_party(3, level=level), level, path)
+    with pytest.raises(ValueError):
+        run_replay(Replay.load(path), create_match())
+
+
+def test_recorder_rejects_missing_masks():
+    recorder = ReplayRecorder(60, 3)
+    with pytest.raises(ValueError):
+        recorder.record([0, 0])
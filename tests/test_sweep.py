@@ -0,0 +1,118 @@
+import pygame
+import pytest
+from models.DiagonalPlatform import DiagonalPlatform
+from models.controls import LEFT, RIGHT
+from models.match import create_match
+from models.sweep import SNAP_DISTANCE, landing_height
+
+FLOOR = pygame.Rect(0, 600, 400, 20)
+UPPER_FLOOR = pygame.Rect(800, 400, 480, 20)
+RAMP = DiagonalPlatform(400, 600, 800, 400)  # Sube hacia la derecha, media unidad por píxel
+
+
+def stage(colliders, diagonal_platforms=(), x=100):
+    """
+    A swept-collision match on custom geometry with player 1 standing at `x` on its floor.
+    """
+    match = create_match(colliders=list(colliders), diagonal_platforms=list(diagonal_platforms),
+                         swept_collision=True)
+    player = match.players[0]
+    player.rect.x = x
+    player.rect.bottom = landing_height(player.rect, 2000, match.colliders, match.diagonal_platforms, 2000)
+    player.y_velocity = 0
+    player.on_ground = True
+    match.players[1].rect.topleft = (-5000, 0)  # Fuera del escenario, cayendo sin molestar
+    return match, player
+
+
+def walk(match, mask, ticks):
+    """
+    Hold `mask` on player 1 for `ticks` ticks; returns (on_ground, bottom) after each tick.
+    """
+    player = match.players[0]
+    path = []
+    for _ in range(ticks):
+        match.step([mask, 0])
+        path.append((player.on_ground, player.rect.bottom))
+    return path
+
+
+@pytest.mark.parametrize("speed", [60, 61, 90, 120, 400])
+def test_fast_falls_land_on_thin_floor(speed):
+    _, player = stage([FLOOR])
+    player.rect.height = 10
+    player.rect.bottom = 100
+    player.gravity = 0
+    player.y_velocity = speed
+    player.on_ground = False
+    for _ in range(1000 // speed + 2):
+        player.apply_gravity_swept([FLOOR], [])
+    assert player.on_ground
+    assert player.rect.bottom == FLOOR.top
+
+
+@pytest.mark.parametrize("speed", [60, 90, 400])
+def test_fast_falls_land_on_slopes(speed):
+    rect = pygame.Rect(500, 0, 86, 96)
+    height = None
+    while height is None:
+        height = landing_height(rect, speed, [], [RAMP])
+        if height is None:
+            rect.y += speed
+        assert rect.bottom < 1000, "tunnelled through the ramp"
+    assert height == pytest.approx(RAMP.slope * rect.right + RAMP.y_intercept)
+
+
+def test_walking_up_a_slope_never_leaves_the_ground():
+    match, player = stage([FLOOR, UPPER_FLOOR], [RAMP], x=250)
+    path = walk(match, RIGHT, 150)
+    assert all(on_ground for on_ground, _ in path)
+    bottoms = [bottom for _, bottom in path]
+    assert bottoms == sorted(bottoms, reverse=True)  # Solo sube
+    assert bottoms[-1] == UPPER_FLOOR.top
+
+
+def test_walking_down_a_slope_never_leaves_the_ground():
+    match, player = stage([FLOOR, UPPER_FLOOR], [RAMP], x=950)
+    path = walk(match, LEFT, 150)
+    assert all(on_ground for on_ground, _ in path)
+    bottoms = [bottom for _, bottom in path]
+    assert bottoms == sorted(bottoms)  # Solo baja
+    assert bottoms[-1] == FLOOR.top
+
+
+@pytest.mark.parametrize("drop", [1, SNAP_DISTANCE // 2, SNAP_DISTANCE])
+def test_snap_follows_drops_within_snap_distance(drop):
+    lower = pygame.Rect(400, FLOOR.top + drop, 400, 20)
+    match, player = stage([FLOOR, lower], x=300)
+    path = walk(match, RIGHT, 40)
+    assert all(on_ground for on_ground, _ in path)
+    assert player.rect.bottom == lower.top
+
+
+def test_drop_past_snap_distance_falls():
+    lower = pygame.Rect(400, FLOOR.top + SNAP_DISTANCE + 1, 400, 20)
+    match, player = stage([FLOOR, lower], x=300)
+    path = walk(match, RIGHT, 40)
+    assert not all(on_ground for on_ground, _ in path)
+    assert player.on_ground and player.rect.bottom == lower.top
+
+
+def test_standing_still_keeps_contact():
+    match, player = stage([FLOOR], [RAMP], x=500)
+    bottom = player.rect.bottom
+    path = walk(match, 0, 60)
+    assert all(on_ground for on_ground, _ in path)
+    assert player.rect.bottom == bottom
+
+
+def test_stepping_off_a_ledge_falls():
+    match, player = stage([FLOOR], x=300)
+    path = walk(match, RIGHT, 30)
+    airborne = [index for index, (on_ground, _) in enumerate(path) if not on_ground]
+    assert airborne
+    # Se cae en el tick en que el cuerpo deja de solaparse con el suelo, ni antes ni después
+    first = airborne[0]
+    assert 300 + player.velocity * (first + 1) == FLOOR.right
+    assert all(not on_ground for on_ground, _ in path[first:])
+    assert path[-1][1] > FLOOR.top
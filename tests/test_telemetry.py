@@ -0,0 +1,93 @@
+import threading
+import pytest
+from core.telemetry import EVENT_CODES, MatchTelemetry, TelemetryStore, connect
+from models.combat import DAMAGE
+from models.controls import ATTACK, DEFEND
+from models.match import create_match
+from tools import tournament
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TelemetryStore(str(tmp_path / "telemetry.db"), flush_interval=0.05)
+    yield store
+    store.close()
+
+
+def results(store):
+    store.flush()
+    connection = connect(store.path)
+    try:
+        return connection.execute("SELECT winner, ticks FROM matches").fetchall()
+    finally:
+        connection.close()
+
+
+def test_time_limit_is_a_draw(store):
+    match = create_match()
+    match_telemetry = MatchTelemetry(store, match, ["random", "random"], "tournament")
+    assert match.run(lambda match: [0, 0], 30) is None
+    match_telemetry.finish(timed_out=True)
+    assert results(store) == [(0, 30)]
+
+
+def test_closed_match_stays_unfinished(store):
+    match = create_match()
+    match_telemetry = MatchTelemetry(store, match, ["human", "human"])
+    match.run(lambda match: [0, 0], 30)
+    match_telemetry.finish()
+    assert results(store) == [(None, 30)]
+
+
+def test_tournament_timeouts_are_draws(store, monkeypatch):
+    monkeypatch.setattr(tournament, "telemetry", store)
+    row = tournament.play_match((0, 1, 0, 1, "random", "random", 30))
+    assert row["winner"] == "draw"
+    assert results(store) == [(0, 30)]
+
+
+def test_blocked_hit_is_recorded(store, face_to_face):
+    match = face_to_face()
+    match_telemetry = MatchTelemetry(store, match, ["human", "human"])
+    for player in match.players:
+        player.listener = match_telemetry.listener
+    match.step([ATTACK, DEFEND])
+    match_telemetry.finish()
+    store.flush()
+    connection = connect(store.path)
+    events = connection.execute("SELECT event, player, value FROM events").fetchall()
+    connection.close()
+    assert sorted(events) == sorted([(EVENT_CODES["hit"], 0, 0), (EVENT_CODES["block"], 1, DAMAGE)])
+
+
+def test_unplayed_match_leaves_no_row(store):
+    MatchTelemetry(store, create_match(), ["human", "human"]).finish()
+    assert results(store) == []
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_game_records_one_row_per_match(store, monkeypatch, pipelined):
+    import pygame
+    from core.assets import load_samurai
+    from views import game
+
+    def create_players(*args):
+        players = create_players_before(*args)
+        for player in players:
+            player.health = 10  # KO al primer golpe para que el combate dure poco
+        return players
+
+    create_players_before = game.create_players
+    monkeypatch.setattr(game, "create_players", create_players)
+    monkeypatch.setattr(game, "telemetry", store)
+    pygame.init()
+    screen = pygame.display.set_mode((640, 360))
+    samurai = load_samurai()
+    game.start_game()
+    game.render_game(screen, samurai, samurai, humans=0, pipelined=pipelined, cpu_bots=("aggressive",))
+    # Tras el combate main.py puede volver a llamar a render_game antes de pasar al menú
+    for _ in range(5):
+        game.render_game(screen, samurai, samurai, humans=0, pipelined=pipelined, cpu_bots=("aggressive",))
+    [(winner, ticks)] = results(store)
+    assert winner in (1, 2) and ticks > 0
+    assert not any(thread.name == "simulation" for thread in threading.enumerate())
@@ -0,0 +1,25 @@
+import itertools
+import json
+from tools import tournament
+
+
+def test_duplicate_specs_are_separate_entries():
+    jobs = list(tournament.schedule(["aggressive", "aggressive", "random"], 1, 0, 60))
+    assert [job[2:4] for job in jobs] == list(itertools.permutations(range(3), 2))
+    assert [job[4:6] for job in jobs[:2]] == [("aggressive", "aggressive"), ("aggressive", "random")]
+
+
+def test_wins_are_counted_per_entry(tmp_path, capsys):
+    output = tmp_path / "results.jsonl"
+    tournament.main(["aggressive", "aggressive", "--rounds", "2", "--workers", "1", "--max-seconds", "20",
+                     "--output", str(output)])
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    wins = [sum(row["winner_entry"] == entry for row in rows) for entry in range(2)]
+    report = capsys.readouterr().err
+    assert f"aggressive (#1): {wins[0]} wins" in report
+    assert f"aggressive (#2): {wins[1]} wins" in report
+
+
+def test_search_bots_are_reproducible():
+    job = (0, 7, 0, 1, "cpu-easy", "aggressive", 300)
+    assert tournament.play_match(job) == tournament.play_match(job)
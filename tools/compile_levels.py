@@ -0,0 +1,32 @@
+"""
+Compile the authoring JSON stages in assets/levels into their memory-mappable binary form.
+
+    python -m tools.compile_levels            # every stage
+    python -m tools.compile_levels dojo       # only some of them
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from core.levels import LEVELS_DIR, compile_level, level_names, read_compiled_level
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile stage JSON files into .lvl files.")
+    parser.add_argument("levels", nargs="*", help="stage names (default: every stage)")
+    args = parser.parse_args(argv)
+
+    for name in args.levels or level_names():
+        source = os.path.join(LEVELS_DIR, name + ".json")
+        compiled = os.path.join(LEVELS_DIR, name + ".lvl")
+        level = compile_level(source, compiled)
+        start = time.perf_counter()
+        read_compiled_level(compiled)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {len(level.colliders)} colliders, {len(level.diagonal_platforms)} slopes, "
+              f"{os.path.getsize(compiled)} bytes, loads in {elapsed * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Two rollback peers talking over real UDP sockets on localhost, with simulated delay, jitter and loss.
+
+    python -m tools.netplay_loopback --seconds 30 --delay 60 --jitter 20 --loss 0.05
+
+Both peers are driven by scripted bots. At the end every input is confirmed on both
+sides and the match checksums must match.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from models.bots import create_bot, BOTS
+from models.match import TICK_RATE, create_match
+from net.rollback import RollbackSession
+from net.transport import LinkConditions, open_input_channel
+
+LOCALHOST = "127.0.0.1"
+
+
+def finished(session, frames):
+    """
+    The peer reached the end (time limit or a confirmed KO) and has nothing left to correct.
+    """
+    return (session.frame >= frames or session.match.is_over()) and session.is_settled()
+
+
+async def run_loopback(frames, bots, input_delay, max_rollback, delay_ms, jitter_ms, loss, seed, speed):
+    sessions = [RollbackSession(create_match(), index, input_delay, max_rollback) for index in range(2)]
+    channels = []
+    for index, session in enumerate(sessions):
+        conditions = LinkConditions(delay_ms, jitter_ms, loss, seed=seed * 2 + index)
+        channels.append(await open_input_channel(session, (LOCALHOST, 0), None, conditions))
+    channels[0].remote_addr = channels[1].transport.get_extra_info("sockname")
+    channels[1].remote_addr = channels[0].transport.get_extra_info("sockname")
+    players = [create_bot(name, seed=seed * 2 + index) for index, name in enumerate(bots)]
+
+    tick = 1 / (TICK_RATE * speed)
+    stalls = [0, 0]
+    rollback_time = 0.0
+    next_tick = time.perf_counter()
+    try:
+        while not all(finished(session, frames) for session in sessions):
+            for index, (session, channel, bot) in enumerate(zip(sessions, channels, players)):
+                started = time.perf_counter()
+                session.resolve()
+                rollback_time += time.perf_counter() - started
+                if session.frame < frames and not session.match.is_over():
+                    if session.can_advance():
+                        session.add_local_input(bot.act(session.match, session.local_index))
+                        session.advance()
+                    else:
+                        stalls[index] += 1
+                channel.send_inputs()
+            next_tick += tick
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+        for session in sessions:
+            session.resolve()
+    finally:
+        for channel in channels:
+            channel.transport.close()
+    return sessions, channels, stalls, rollback_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rollback netcode over localhost UDP with a lossy link.")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--bots", nargs=2, default=["aggressive", "hit-and-run"], choices=list(BOTS))
+    parser.add_argument("--input-delay", type=int, default=2, help="ticks")
+    parser.add_argument("--max-rollback", type=int, default=8, help="ticks")
+    parser.add_argument("--delay", type=float, default=50, help="one-way latency in ms")
+    parser.add_argument("--jitter", type=float, default=10, help="ms")
+    parser.add_argument("--loss", type=float, default=0.02, help="packet loss ratio")
+    parser.add_argument("--speed", type=float, default=1, help="simulation speed relative to real time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    frames = int(args.seconds * TICK_RATE)
+    sessions, channels, stalls, rollback_time = asyncio.run(run_loopback(
+        frames, args.bots, args.input_delay, args.max_rollback, args.delay, args.jitter, args.loss, args.seed,
+        args.speed))
+
+    per_tick = rollback_time / max(1, sum(session.resimulated_ticks for session in sessions)) * 1e6
+    for index, (session, channel) in enumerate(zip(sessions, channels)):
+        print(f"peer {index}: {session.rollbacks} rollbacks, {session.resimulated_ticks} re-simulated ticks, "
+              f"{stalls[index]} stalled ticks, {channel.sent_packets} packets / {channel.sent_bytes} bytes sent")
+    print(f"rollback cost: {per_tick:.1f} us per re-simulated tick")
+    checksums = [session.checksum() for session in sessions]
+    status = "in sync" if checksums[0] == checksums[1] else "DESYNC"
+    winner = sessions[0].match.winner
+    print(f"winner: {f'Player {winner}' if winner else 'none'}")
+    print(f"tick {sessions[0].frame}: checksums {checksums[0]:08x} / {checksums[1]:08x} -> {status}")
+    if checksums[0] != checksums[1]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
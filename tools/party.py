@@ -0,0 +1,59 @@
+"""
+Free-for-all between 2 to 16 samurais; the fighters without a player are controlled by the CPU.
+
+    python -m tools.party --fighters 8 --humans 2 --level entrenamiento
+"""
+import argparse
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+from models.party import MIN_FIGHTERS, MAX_FIGHTERS
+from models.bots import BOTS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a free-for-all match.")
+    parser.add_argument("--fighters", type=int, default=4, help=f"{MIN_FIGHTERS} to {MAX_FIGHTERS}")
+    parser.add_argument("--humans", type=int, default=2, help="keyboard players (up to 4 layouts)")
+    parser.add_argument("--level", default=None, help="stage name from assets/levels")
+    parser.add_argument("--pipelined", action="store_true", help="run the simulation on its own thread")
+    parser.add_argument("--swept-collision", action="store_true", help="land with the swept test (models.sweep)")
+    parser.add_argument("--spectate", type=int, metavar="PORT", help="broadcast the match to spectators on PORT")
+    parser.add_argument("--record", metavar="PATH", help="save a replay of the match (see tools.replay)")
+    parser.add_argument("--telemetry", metavar="PATH", help="save match events to this SQLite database")
+    parser.add_argument("--bots", nargs="+", choices=list(BOTS), default=None,
+                        help="bots taking turns for the CPU fighters (default: aggressive, hit-and-run)")
+    args = parser.parse_args(argv)
+    if not MIN_FIGHTERS <= args.fighters <= MAX_FIGHTERS:
+        parser.error(f"--fighters must be between {MIN_FIGHTERS} and {MAX_FIGHTERS}")
+
+    pygame.init()
+    from core.display import Display, display_settings
+    display = Display.open(*display_settings())
+    pygame.display.set_caption("Fighting Game - Todos contra todos")
+    from core.assets import load_samurai
+    from core.levels import load_level
+    from views.game import render_game, default_level, PARTY_BOTS
+    level = load_level(args.level) if args.level else default_level
+    if args.telemetry:
+        from core.telemetry import telemetry
+        telemetry.open(args.telemetry)
+    samurai = load_samurai(display.scale)
+    spectators = None
+    if args.spectate is not None:
+        from net.spectator import SpectatorServer
+        from models.match import TICK_RATE
+        spectators = SpectatorServer(samurai.states, TICK_RATE)
+        print(f"spectators: python -m tools.spectate --port {spectators.start_in_thread('0.0.0.0', args.spectate)}")
+    render_game(display.surface, samurai, samurai, level=level, fighters=args.fighters, humans=args.humans,
+                pipelined=args.pipelined, display=display, cpu_bots=args.bots or PARTY_BOTS,
+                spectators=spectators, record_path=args.record, swept_collision=args.swept_collision)
+    pygame.time.wait(2000)
+    if spectators is not None:
+        spectators.stop()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
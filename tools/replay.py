@@ -0,0 +1,55 @@
+"""
+Inspect or watch a recorded match.
+
+    python -m tools.replay match.swr            # re-simulate headless, as fast as possible
+    python -m tools.replay match.swr --watch    # play it back in a window at real time
+
+The match is rebuilt from the replay header: the same level, number of fighters and collision mode.
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from core.replay import Replay, replay_match, run_replay
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-simulate or watch a recorded match.")
+    parser.add_argument("replay", help="replay file written by render_game(record_path=...)")
+    parser.add_argument("--watch", action="store_true", help="open a window and play it at real time")
+    parser.add_argument("--pipelined", action="store_true", help="with --watch, simulate on its own thread")
+    args = parser.parse_args(argv)
+
+    try:
+        replay = Replay.load(args.replay)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    if args.watch:
+        import pygame
+        from core.assets import load_samurai
+        from core.display import Display, display_settings
+        pygame.init()
+        display = Display.open(*display_settings())
+        from views.game import render_game
+        samurai = load_samurai(display.scale)
+        render_game(display.surface, samurai, samurai, replay_path=args.replay, pipelined=args.pipelined,
+                    display=display)
+        pygame.time.wait(2000)
+        pygame.quit()
+        return
+
+    match = replay_match(replay)
+    start = time.perf_counter()
+    winner = run_replay(replay, match)
+    elapsed = time.perf_counter() - start
+    health = ", ".join(str(player.health) for player in match.players)
+    print(f"level {replay.level}, {replay.player_count} fighters"
+          f"{', swept collision' if replay.swept_collision else ''}")
+    print(f"winner: {f'Player {winner}' if winner else 'none'} after {match.tick} ticks "
+          f"({match.tick / replay.tick_rate:.1f} s), health: {health}")
+    print(f"simulated {replay.ticks} ticks in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
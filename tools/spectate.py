@@ -0,0 +1,51 @@
+"""
+Headless spectator: follows a match broadcast with `python -m tools.party --spectate PORT`.
+
+    python -m tools.spectate --host 127.0.0.1 --port 8765 [--websocket]
+
+Prints the tick, each fighter's position, animation and health, and the bandwidth received
+about once per second, until the match ends or the server goes away.
+"""
+import argparse
+import asyncio
+import time
+from net.spectator import SpectatorClient
+
+
+async def watch(host, port, websocket):
+    client = await SpectatorClient.connect(host, port, websocket)
+    began = last_report = time.perf_counter()
+    reported_bytes = 0
+    decoder = None
+    async for decoder in client.frames():
+        now = time.perf_counter()
+        if now - last_report >= 1 or decoder.winner is not None:
+            rate = (client.received_bytes - reported_bytes) / (now - last_report) / 1024
+            fighters = "  ".join(f"P{index + 1} ({fighter.x},{fighter.y}) {fighter.animation} {fighter.health}"
+                                 for index, fighter in enumerate(decoder.fighters))
+            print(f"tick {decoder.tick:>6}  {rate:6.2f} kB/s  {fighters}")
+            last_report, reported_bytes = now, client.received_bytes
+        if decoder.winner is not None:
+            break
+    client.close()
+
+    elapsed = time.perf_counter() - began
+    if decoder is not None and decoder.winner is not None:
+        print(f"Winner: {'draw' if decoder.winner == 0 else f'P{decoder.winner}'}")
+    print(f"{client.received_messages} messages, {client.received_bytes / 1024:.1f} kB in {elapsed:.1f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Follow a broadcast match without a window.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--websocket", action="store_true", help="connect over WebSocket instead of plain TCP")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(watch(args.host, args.port, args.websocket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Aggregate the match telemetry recorded by the game (core.telemetry).
+
+    python -m tools.telemetry telemetry.db [summary|winrates|damage] [--mode party]
+
+summary: matches, events by type and time to KO; winrates: wins, draws and win rate per fighter
+(a bot name or "human"); damage: distribution of the damage taken per fighter and match, and the
+hits, blocks and damage per fighter. Everything is aggregated inside SQLite, so millions of events
+take seconds; the database may be queried while the game is still writing to it (WAL mode).
+"""
+import argparse
+import os
+import statistics
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from core.telemetry import EVENT_CODES, EVENT_NAMES, connect
+
+DAMAGE_BUCKET = 10  # Ancho de las barras del histograma de daño
+
+# Daño recibido, bloqueado y golpes dados por cada luchador en cada combate
+PER_FIGHTER = f"""
+SELECT events.match AS match, events.player AS player,
+       SUM(CASE WHEN event = {EVENT_CODES["hurt"]} THEN value ELSE 0 END) AS taken,
+       SUM(CASE WHEN event = {EVENT_CODES["block"]} THEN value ELSE 0 END) AS blocked,
+       SUM(event = {EVENT_CODES["hit"]}) AS hits,
+       SUM(event = {EVENT_CODES["jump"]}) AS jumps
+FROM events JOIN matches ON matches.id = events.match {{where}}
+GROUP BY events.match, events.player
+"""
+
+
+def mode_filter(mode, prefix="WHERE"):
+    return (f"{prefix} matches.mode = ?", (mode,)) if mode else ("", ())
+
+
+def summary(connection, mode):
+    where, params = mode_filter(mode)
+    total, finished = connection.execute(
+        f"SELECT COUNT(*), COUNT(winner) FROM matches {where}", params).fetchone()
+    print(f"{total} matches ({finished} finished)")
+    counts = connection.execute(f"SELECT event, COUNT(*) FROM events JOIN matches ON matches.id = events.match "
+                                f"{where} GROUP BY event", params).fetchall()
+    print(f"{sum(count for _, count in counts)} events: "
+          + ", ".join(f"{EVENT_NAMES[event]} {count}" for event, count in sorted(counts)))
+
+    where, params = mode_filter(mode, "AND")
+    knockouts = [ticks / tick_rate for ticks, tick_rate in connection.execute(
+        f"SELECT ticks, tick_rate FROM matches WHERE winner > 0 {where}", params)]
+    if knockouts:
+        knockouts.sort()
+        print(f"time to KO: mean {statistics.mean(knockouts):.1f} s, median {statistics.median(knockouts):.1f} s, "
+              f"p90 {knockouts[int(len(knockouts) * 0.9)]:.1f} s over {len(knockouts)} matches")
+
+
+def winrates(connection, mode):
+    where, params = mode_filter(mode, "AND")
+    rows = connection.execute(f"""
+        SELECT fighters.name, COUNT(*), SUM(matches.winner = fighters.player + 1), SUM(matches.winner = 0)
+        FROM fighters JOIN matches ON matches.id = fighters.match
+        WHERE matches.winner IS NOT NULL {where}
+        GROUP BY fighters.name
+    """, params).fetchall()
+    print(f"{'fighter':<16} {'matches':>8} {'wins':>8} {'draws':>7} {'win %':>6}")
+    for name, played, wins, draws in sorted(rows, key=lambda row: -row[2] / row[1]):
+        print(f"{name:<16} {played:>8} {wins:>8} {draws:>7} {100 * wins / played:>6.1f}")
+
+
+def damage(connection, mode):
+    where, params = mode_filter(mode)
+    connection.execute("DROP TABLE IF EXISTS temp.per_fighter")
+    connection.execute(f"CREATE TEMP TABLE per_fighter AS {PER_FIGHTER.format(where=where)}", params)
+
+    rows = connection.execute(f"SELECT taken / {DAMAGE_BUCKET} * {DAMAGE_BUCKET}, COUNT(*) FROM per_fighter "
+                              f"GROUP BY 1 ORDER BY 1").fetchall()
+    most = max((count for _, count in rows), default=0)
+    print("damage taken per fighter and match")
+    for bucket, count in rows:
+        print(f"{bucket:>4}-{bucket + DAMAGE_BUCKET - 1:<4} {count:>9} {'#' * round(40 * count / most)}")
+
+    print(f"\n{'fighter':<16} {'rows':>8} {'taken':>7} {'blocked':>8} {'hits':>6} {'jumps':>6}   (mean per match)")
+    for name, count, taken, blocked, hits, jumps in connection.execute("""
+        SELECT fighters.name, COUNT(*), AVG(taken), AVG(blocked), AVG(hits), AVG(jumps)
+        FROM per_fighter JOIN fighters ON fighters.match = per_fighter.match AND fighters.player = per_fighter.player
+        GROUP BY fighters.name ORDER BY fighters.name
+    """):
+        print(f"{name:<16} {count:>8} {taken:>7.1f} {blocked:>8.1f} {hits:>6.1f} {jumps:>6.1f}")
+
+
+REPORTS = {"summary": summary, "winrates": winrates, "damage": damage}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate recorded match telemetry.")
+    parser.add_argument("database", help="SQLite file written with FIGHTING_GAME_TELEMETRY or --telemetry")
+    parser.add_argument("report", nargs="?", choices=list(REPORTS), default="summary")
+    parser.add_argument("--mode", help="only matches of this mode (versus, party, tournament)")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.database):
+        parser.error(f"no telemetry database at {args.database}")
+
+    connection = connect(args.database)
+    try:
+        REPORTS[args.report](connection, args.mode)
+    except BrokenPipeError:
+        sys.stderr.close()
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
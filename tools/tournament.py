@@ -0,0 +1,185 @@
+"""
+Round-robin tournament between scripted fighters, run headless on a process pool.
+
+    python -m tools.tournament aggressive random "aggressive:velocity=6,attack_cooldown=400" \\
+        --rounds 20 --workers 8 --seed 1 --output results.jsonl
+
+Each fighter is `bot[:param=value,...]`, where the params override Player attributes
+(velocity, jump_strength, attack_cooldown, gravity). Results are streamed one line per
+match as they finish, to JSONL or CSV depending on the output extension. Fighters are told
+apart by their position on the command line (entry1, entry2 and winner_entry, from 0), so the
+same spec may be entered more than once. The CPU bots (cpu-*) search a fixed number of steps per
+tick instead of for a time, so a run with the same --seed always gives the same results.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Un solo saludo de pygame por proceso sobra
+from models.bots import BOTS, create_bot
+from models.match import TICK_RATE, create_match
+from core.telemetry import MatchTelemetry, telemetry
+
+TUNABLE = {"velocity": int, "jump_strength": float, "attack_cooldown": int, "gravity": float}
+
+RESULT_FIELDS = ["match", "seed", "entry1", "entry2", "fighter1", "fighter2", "winner", "winner_entry", "frames",
+                 "damage1", "damage2", "health1", "health2"]
+
+
+def parse_fighter(spec):
+    """
+    Split `bot:param=value,...` into the bot name and its Player overrides.
+    """
+    name, _, params = spec.partition(":")
+    overrides = {}
+    for item in filter(None, params.split(",")):
+        key, _, value = item.partition("=")
+        if key not in TUNABLE:
+            raise ValueError(f"Unknown fighter parameter '{key}' in '{spec}'")
+        overrides[key] = TUNABLE[key](value)
+    return name, overrides
+
+
+def play_match(job):
+    """
+    Play one headless match and return its result row. Runs inside a worker process.
+    """
+    match_id, seed, entry1, entry2, fighter1, fighter2, max_ticks = job
+    match = create_match()
+    bots = []
+    for index, (player, spec) in enumerate(zip(match.players, (fighter1, fighter2))):
+        name, overrides = parse_fighter(spec)
+        for key, value in overrides.items():
+            setattr(player, key, value)
+        bots.append(create_bot(name, seed=seed * 2 + index, deterministic=True))
+    match_telemetry = None
+    if telemetry.enabled:
+        match_telemetry = MatchTelemetry(telemetry, match, [fighter1, fighter2], "tournament")
+        for player in match.players:
+            player.listener = match_telemetry.listener
+
+    def inputs(match):
+        return [bot.act(match, index) for index, bot in enumerate(bots)]
+
+    winner = match.run(inputs, max_ticks)
+    if match_telemetry is not None:
+        match_telemetry.finish(timed_out=winner is None)  # Sin ganador al llegar al límite es empate
+    player1, player2 = match.players
+    return {
+        "match": match_id,
+        "seed": seed,
+        "entry1": entry1,
+        "entry2": entry2,
+        "fighter1": fighter1,
+        "fighter2": fighter2,
+        "winner": {1: fighter1, 2: fighter2}.get(winner, "draw"),
+        "winner_entry": {1: entry1, 2: entry2}.get(winner),  # None en un empate
+        "frames": match.tick,
+        "damage1": 100 - player2.health,  # Daño causado por el jugador 1
+        "damage2": 100 - player1.health,
+        "health1": player1.health,
+        "health2": player2.health,
+    }
+
+
+def play_batch(jobs):
+    """
+    Play several matches in one worker call; their telemetry, if any, is on disk when it returns.
+    """
+    results = [play_match(job) for job in jobs]
+    telemetry.flush()
+    return results
+
+
+def schedule(fighters, rounds, seed, max_ticks):
+    """
+    Every ordered pair of distinct entries plays `rounds` matches, so each side of the stage is covered.
+    Entries are indices into `fighters`: a spec given twice is two different entries.
+    """
+    match_id = 0
+    for round_index in range(rounds):
+        for entry1, entry2 in itertools.permutations(range(len(fighters)), 2):
+            yield (match_id, seed * 1_000_003 + match_id, entry1, entry2, fighters[entry1], fighters[entry2],
+                   max_ticks)
+            match_id += 1
+
+
+class ResultWriter:
+    def __init__(self, file, output_format):
+        """
+        Stream result rows to a JSONL or CSV file, flushing each line.
+        """
+        self.file = file
+        self.csv = None
+        if output_format == "csv":
+            self.csv = csv.DictWriter(file, fieldnames=RESULT_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, result):
+        if self.csv is not None:
+            self.csv.writerow(result)
+        else:
+            self.file.write(json.dumps(result) + "\n")
+        self.file.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless round-robin tournament between scripted fighters.")
+    parser.add_argument("fighters", nargs="+", help=f"bot[:param=value,...], bots: {', '.join(BOTS)}")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-seconds", type=float, default=99, help="match time limit before a draw")
+    parser.add_argument("--output", default="-", help="results file (.jsonl or .csv), '-' for stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="defaults to the output extension")
+    parser.add_argument("--telemetry", metavar="PATH", help="also save every match's events to this SQLite database")
+    args = parser.parse_args(argv)
+
+    if len(args.fighters) < 2:
+        parser.error("at least two fighters are needed")
+    for spec in args.fighters:
+        try:
+            name, _ = parse_fighter(spec)
+            create_bot(name)
+        except ValueError as error:
+            parser.error(str(error))
+
+    output_format = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+    max_ticks = int(args.max_seconds * TICK_RATE)
+    jobs = list(schedule(args.fighters, args.rounds, args.seed, max_ticks))
+
+    wins = [0] * len(args.fighters)  # Por entrada: el mismo bot puede inscribirse varias veces
+    file = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        writer = ResultWriter(file, output_format)
+        # Cada proceso escribe la telemetría de sus combates desde su propio hilo de fondo
+        initializer, initargs = (telemetry.open, (args.telemetry,)) if args.telemetry else (None, ())
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=initializer, initargs=initargs) as executor:
+            # Lotes por tarea para amortizar el envío entre procesos
+            chunk = max(1, len(jobs) // (args.workers * 8))
+            batches = [jobs[i:i + chunk] for i in range(0, len(jobs), chunk)]
+            futures = [executor.submit(play_batch, batch) for batch in batches]
+            for future in as_completed(futures):
+                for result in future.result():
+                    writer.write(result)
+                    if result["winner_entry"] is not None:
+                        wins[result["winner_entry"]] += 1
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+    total = len(jobs)
+    for entry, count in sorted(enumerate(wins), key=lambda item: -item[1]):
+        spec = args.fighters[entry]
+        if args.fighters.count(spec) > 1:
+            spec = f"{spec} (#{entry + 1})"
+        print(f"{spec}: {count} wins", file=sys.stderr)
+    print(f"{total} matches", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+class DirtyRectRenderer:
+    def __init__(self, background, scale=1):
+        """
+        Fight renderer that only repaints what moved.
+        Keeps the areas drawn in the previous frame, restores the background there,
+        draws the players again and returns the changed rects for pygame.display.update().
+        `scale` is the render scale of the screen (see core.display.Display).
+        """
+        self.background = background
+        self.scale = scale
+        self.previous_rects = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """
+        Force a full-screen redraw on the next frame (e.g. after another view drew on the screen).
+        """
+        self.full_redraw = True
+
+    def draw(self, screen, players, overlays=(), particles=None):
+        """
+        Draw one frame and return the list of dirty rects.
+        `overlays` are (surface, rect) pairs drawn on top, such as the winner text.
+        `particles` (core.particles.ParticleSystem) are drawn over the players as one area.
+        """
+        current_rects = []
+        for player in players:
+            current_rects.extend(player.render_bounds(self.scale))
+        particle_bounds = particles.bounds() if particles is not None else None
+        if particle_bounds is not None:
+            current_rects.append(particle_bounds.clip(screen.get_rect()))
+        current_rects.extend(rect for surface, rect in overlays)
+
+        if self.full_redraw:
+            screen.blit(self.background, (0, 0))
+            dirty = [screen.get_rect()]
+            self.full_redraw = False
+        else:
+            # Restaurar el fondo donde estaban los sprites en el fotograma anterior
+            for rect in self.previous_rects:
+                screen.blit(self.background, rect, rect)
+            # Los jugadores se redibujan completos, así que basta con limpiar también su área actual
+            for rect in current_rects:
+                screen.blit(self.background, rect, rect)
+            dirty = self.previous_rects + current_rects
+
+        for player in players:
+            player.render(screen, self.scale)
+        if particles is not None:
+            particles.draw(screen)
+        for surface, rect in overlays:
+            screen.blit(surface, rect)
+
+        self.previous_rects = current_rects
+        return dirty
@@ -1,157 +1,417 @@
+import copy
+import threading
+import time
 import pygame
 import os
-from models.player import Player
-from models.DiagonalPlatform import DiagonalPlatform
+from models.controls import party_controls
+from models.stage import default_level
+from models.match import Match, create_players
+from models.party import create_party
+from models.bots import create_bot
+from views.dirty_renderer import DirtyRectRenderer
+from core.replay import Replay, ReplayRecorder, replay_match
+from core.input import player_input
+from core.audio import audio
+from core.particles import ParticleSystem
+from core.telemetry import MatchTelemetry, telemetry
+from core.profiler import profiler
+from core.pipeline import SimulationThread, interpolate
+from core.assets import LazyAsset, ScaledFont, asset_path, load_scaled_image, samurai_animations_at
+from core.levels import load_level
+from core.display import LOGICAL_SIZE, Display, scale_rect, view_scale
 
-# Cargar fondo del juego
 current_dir = os.path.dirname(__file__)
-game_background_path = os.path.join(current_dir, "../assets/game/background.png")
-game_background = pygame.image.load(game_background_path)
-game_background = pygame.transform.scale(game_background, (1280, 720))
 
-game_active = True
+# Fondos de los escenarios por resolución: se decodifican y escalan en segundo plano una sola vez
+# y se convierten al formato de la pantalla al usarlos
+_backgrounds = {}  # (imagen, tamaño) -> LazyAsset
+
+
+def level_background(level, size=LOGICAL_SIZE):
+    """
+    LazyAsset with the background of a level at `size`, shared by every level that uses the same image.
+    """
+    key = (level.background, size)
+    background = _backgrounds.get(key)
+    if background is None:
+        path = asset_path(level.background)
+        background = LazyAsset(lambda: load_scaled_image(path, size), finalize=lambda surface: surface.convert())
+        _backgrounds[key] = background
+    return background
+
+
+game_background = level_background(default_level)
+
+game_active = True  # Falso desde que termina el combate hasta que start_game() prepara otro
+
+MAX_FRAME_TIME = 250  # ms máximos de simulación acumulados por fotograma
+
+PARTY_BOTS = ("aggressive", "hit-and-run")  # Se alternan para los luchadores que no controla nadie
+
+# Opciones de render_game por entorno para main.py, como las de core.display
+RECORD_DIR_ENV = "FIGHTING_GAME_RECORD_DIR"  # Carpeta donde se guarda la repetición de cada combate
+SWEPT_COLLISION_ENV = "FIGHTING_GAME_SWEPT_COLLISION"  # 1 para aterrizar con el barrido de models.sweep
+PIPELINED_ENV = "FIGHTING_GAME_PIPELINED"  # 1 para simular en un hilo aparte (render_pipelined)
+ATLAS_ENV = "FIGHTING_GAME_ATLAS"  # 1 para dibujar los sprites desde una textura por jugador
+DIRTY_RECTS_ENV = "FIGHTING_GAME_DIRTY_RECTS"  # 1 para repintar solo las zonas que cambian
 
 font_path = os.path.join(current_dir, "../assets/fonts/Tiny5/Tiny5-Regular.ttf")
-title_font = pygame.font.Font(font_path, 80)
+title_font = ScaledFont(font_path, 80)
 
-# Definir controles para los jugadores
-player1_controls = {
-    "up": pygame.K_UP,
-    "down": pygame.K_DOWN,
-    "left": pygame.K_LEFT,
-    "right": pygame.K_RIGHT,
-    "defend": pygame.K_o,
-    "attack": pygame.K_p,
-}
 
-player2_controls = {
-    "up": pygame.K_w,
-    "down": pygame.K_s,
-    "left": pygame.K_a,
-    "right": pygame.K_d,
-    "defend": pygame.K_g,
-    "attack": pygame.K_h,
-}
+def game_settings(environ=os.environ):
+    """
+    Opciones de render_game tomadas del entorno (ver las constantes *_ENV), para cada combate de main.py.
+    Con FIGHTING_GAME_RECORD_DIR cada combate se graba en un archivo nuevo de esa carpeta.
+    """
+    settings = {}
+    record_dir = environ.get(RECORD_DIR_ENV)
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+        settings["record_path"] = os.path.join(record_dir, time.strftime("combate-%Y%m%d-%H%M%S.swr"))
+    settings["swept_collision"] = _enabled(environ, SWEPT_COLLISION_ENV)
+    settings["pipelined"] = _enabled(environ, PIPELINED_ENV)
+    settings["use_atlas"] = _enabled(environ, ATLAS_ENV)
+    settings["dirty_rects"] = _enabled(environ, DIRTY_RECTS_ENV)
+    return settings
+
+
+def _enabled(environ, name):
+    # Cualquier valor salvo vacío o 0 activa la opción
+    return environ.get(name, "") not in ("", "0")
 
-# Definir paredes, pisos y plataformas diagonales
-colliders = [
-    pygame.Rect(200, 600, 119, 20),
-    pygame.Rect(450, 550, 219, 20),
-    pygame.Rect(60, 630, 26, 20),
-    pygame.Rect(800, 500, 260, 20),
-    pygame.Rect(1200, 550, 10, 20),
-    pygame.Rect(0, 0, 10, 720),  # Pared izquierda
-    pygame.Rect(1270, 0, 10, 720),  # Pared derecha
-]
 
-diagonal_platforms = [
-    DiagonalPlatform(70, 730, 200, 600),
-    DiagonalPlatform(350, 650, 450, 550),
-    DiagonalPlatform(570, 730, 800, 500),
-    DiagonalPlatform(0, 700, 60, 630),
-    DiagonalPlatform(1060, 500, 1170, 600),
-]
+def game_assets(level, size):
+    """
+    Recursos del combate en `level` dibujado a una resolución `size`.
+    """
+    return level_background(level, size), title_font, samurai_animations_at(view_scale(size))
 
 
-def handle_combat(player1, player2):
+def prefetch_game_assets(level=default_level, size=LOGICAL_SIZE):
     """
-    Manejar las interacciones de combate entre los dos jugadores.
+    Empezar a cargar en segundo plano todo lo que necesita el combate en `level`.
     """
-    if player1.is_attacking and player1.rect.colliderect(player2.rect):
-        player2.take_damage(10)  # Reduce la salud del jugador 2
+    for asset in game_assets(level, size):
+        asset.prefetch()
+    audio.prefetch()  # Los efectos no bloquean el combate: se omiten mientras no estén listos
 
-    if player2.is_attacking and player2.rect.colliderect(player1.rect):
-        player1.take_damage(10)  # Reduce la salud del jugador 1
 
+def game_assets_ready(level=default_level, size=LOGICAL_SIZE):
+    """
+    Indica si el combate en `level` puede empezar sin bloquear el bucle.
+    """
+    return all(asset.ready() for asset in game_assets(level, size))
 
 
-def render_colliders(screen, colliders, diagonal_platforms):
+def render_colliders(screen, colliders, diagonal_platforms, scale=1):
     """
     Renderizar colisionadores para propósitos de depuración.
     """
     for collider in colliders:
-        pygame.draw.rect(screen, (0, 255, 0), collider, 1)
+        pygame.draw.rect(screen, (0, 255, 0), scale_rect(collider, scale), 1)
 
     for platform in diagonal_platforms:
-        pygame.draw.line(screen, (0, 255, 255), (platform.x1, platform.y1), (platform.x2, platform.y2), 1)
+        pygame.draw.line(screen, (0, 255, 255), (platform.x1 * scale, platform.y1 * scale),
+                         (platform.x2 * scale, platform.y2 * scale), 1)
 
 
-def render_game(screen, player1_sprites, player2_sprites):
+def start_game():
+    """
+    Preparar un combate nuevo: render_game() no hace nada mientras no se llame a esta función
+    después de que termine el anterior.
+    """
+    global game_active
+    game_active = True
+
+
+def render_game(screen, player1_animations, player2_animations, use_atlas=False, dirty_rects=False,
+                record_path=None, replay_path=None, level=default_level, fighters=2, humans=2, pipelined=False,
+                display=None, cpu_bots=PARTY_BOTS, spectators=None, swept_collision=False):
     """
     Renderizar la vista del juego.
+    La simulación avanza en ticks fijos con un acumulador; el dibujo va a la velocidad de la pantalla.
+    Con `use_atlas` los sprites se dibujan desde una única textura por jugador.
+    Con `dirty_rects` solo se repintan y envían a la pantalla las zonas que cambiaron.
+    Con `record_path` se graban las entradas de cada tick; con `replay_path` se reproducen en tiempo real
+    en el mismo escenario y con los mismos luchadores con que se grabaron (`level` y `fighters` se ignoran).
+    `level` es el escenario cargado (colisiones, índice espacial ya calculado y fondo).
+    Los primeros `humans` luchadores usan el teclado o un mando y el resto los controla la CPU con los bots
+    de `cpu_bots` (nombres de models.bots.BOTS, por turnos). Con más de dos `fighters` es un todos contra
+    todos y todos usan las animaciones del jugador 1.
+    Con `pipelined` la simulación corre en su propio hilo y el dibujo interpola entre sus ticks.
+    Con `display` (core.display.Display) se dibuja a su resolución interna y se escala a la ventana;
+    las animaciones deben ser las de su escala (samurai_animations_at(display.scale)).
+    Con `spectators` (net.spectator.SpectatorServer) cada tick se retransmite a los espectadores.
+    Con `swept_collision` los luchadores aterrizan con el barrido de models.sweep, que no atraviesa suelos
+    a ninguna velocidad (una repetición usa el modo con que se grabó).
+    Si la telemetría está activa (core.telemetry) se guardan los eventos y el resultado del combate,
+    salvo al ver una repetición.
+    Vuelve cuando el combate termina; si ya terminó (sin start_game() de por medio) vuelve sin hacer nada.
     """
     global game_active  # Acceder a la variable global
 
-    player1 = Player(
-        x=1130,
-        y=300,
-        sprite_sheets=player1_sprites,
-        controls=player1_controls,
-        frame_width=96,  # Ancho de un fotograma
-        frame_height=96,  # Alto de un fotograma
-        animation_speed=5  # Velocidad de animación
-    )
-
-    player2 = Player(
-        x=100,
-        y=300,
-        sprite_sheets=player2_sprites,
-        controls=player2_controls,
-        frame_width=96,  # Ancho de un fotograma
-        frame_height=96,  # Alto de un fotograma
-        animation_speed=5  # Velocidad de animación
-    )
+    if not game_active:
+        return
+
+    replay = Replay.load(replay_path) if replay_path else None
+    if replay is not None:
+        level = load_level(replay.level)
+        match = replay_match(replay, player1_animations, player2_animations, use_atlas)
+    elif fighters == 2:
+        players = create_players(player1_animations, player2_animations, use_atlas, level.spawns)
+        match = Match(players, level.colliders, level.diagonal_platforms, geometry=level.geometry,
+                      swept_collision=swept_collision)
+    else:
+        match = create_party(fighters, player1_animations, use_atlas, level, party_controls(fighters, humans),
+                             swept_collision=swept_collision)
+    humans = min(humans, len(match.players))
+    cpu = {index: create_bot(cpu_bots[index % len(cpu_bots)], seed=index)
+           for index in range(humans, len(match.players))}
+    match.profiler = profiler
+
+    recorder = ReplayRecorder.for_match(match, level) if record_path else None
+
+    if display is None:
+        display = Display(screen)
+    background = level_background(level, display.render_size).get()
+    if level.show_geometry:
+        # Escenario sin arte propio: la geometría se dibuja una vez sobre una copia del fondo
+        background = background.copy()
+        render_colliders(background, level.colliders, level.diagonal_platforms, display.scale)
+    renderer = DirtyRectRenderer(background, display.scale) if dirty_rects else None
+
+    # Los eventos de los luchadores suenan, sueltan partículas y quedan en la telemetría
+    particles = ParticleSystem(display.scale)
+    listeners = [audio.trigger, particles.trigger]
+    match_telemetry = None
+    if telemetry.enabled and replay is None:
+        names = ["human"] * humans + [cpu_bots[index % len(cpu_bots)] for index in range(humans, len(match.players))]
+        match_telemetry = MatchTelemetry(telemetry, match, names, "versus" if fighters == 2 else "party", level.name)
+        listeners.append(match_telemetry.listener)
+
+    def listener(event, player):
+        for callback in listeners:
+            callback(event, player)
+
+    for player in match.players:
+        player.listener = listener
+
+    # Entradas por eventos: se parte de las teclas que ya estuvieran pulsadas al entrar
+    player_input.rebind([player.controls for player in match.players[:humans]])
+    player_input.sync_keyboard()
+
+    def next_masks():
+        """
+        Máscaras de entrada del siguiente tick, o None cuando la repetición se ha terminado.
+        """
+        if replay is not None:
+            return replay.next_masks(match) if match.tick < replay.ticks else None
+        masks = player_input.tick()
+        masks += [cpu[index].act(match, index) for index in range(humans, len(match.players))]
+        if recorder is not None:
+            recorder.record(masks)
+        return masks
+
+    if pipelined:
+        render_pipelined(display, match, next_masks, background, renderer, recorder, record_path, spectators,
+                         particles, match_telemetry)
+        if match_telemetry is not None:
+            match_telemetry.finish()
+        return
 
     clock = pygame.time.Clock()
+    accumulator = 0.0
     while game_active:
+        profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
+                quit_game(recorder, record_path, match_telemetry)
+            if not player_input.handle_event(event):
+                profiler.handle_event(event)
+        profiler.lap("events")
+
+        # Evitar la espiral de la muerte si un fotograma tarda demasiado
+        accumulator += min(clock.tick(60), MAX_FRAME_TIME)
+        profiler.skip()
+
+        # Avanzar la simulación los ticks que correspondan
+        ticks = match.tick
+        while accumulator >= match.tick_ms and not match.is_over():
+            masks = next_masks()
+            if masks is None:
+                game_active = False  # La repetición terminó sin ganador
+                break
+            match.step(masks)
+            if spectators is not None:
+                spectators.publish(match)
+            accumulator -= match.tick_ms
+        audio.flush()
+        profiler.lap("audio")
+        particles.update(match.tick - ticks)
+        profiler.lap("particles")
+
+        # Mensaje de victoria si alguno de los jugadores ha sido derrotado
+        overlays = []
+        if match.winner is not None:
+            overlays.append(winner_overlay(match.winner, display.scale))
+            game_active = False
+        if not game_active and recorder is not None:
+            recorder.save(record_path)
 
-        # Dibujar el fondo
-        screen.blit(game_background, (0, 0))
+        draw_frame(display, match.players, background, renderer, overlays, particles)
 
-        # Obtener teclas presionadas
-        keys = pygame.key.get_pressed()
+    if match_telemetry is not None:
+        match_telemetry.finish()
 
-        # Actualizar jugadores
-        player1.update_state(keys)
-        player1.attack(keys)  # Detectar ataque
-        player1.jump(keys)
-        player1.move(keys, colliders)
-        player1.apply_gravity(colliders, diagonal_platforms)
 
-        player1.update_animation()
-        player2.update_animation()
+def render_pipelined(display, match, next_masks, background, renderer, recorder, record_path, spectators=None,
+                     particles=None, match_telemetry=None):
+    """
+    Bucle de render_game con la simulación en su propio hilo (core.pipeline).
+    Los ticks llegan a su hora aunque un fotograma se retrase, pero la latencia de entrada no es constante:
+    SDL solo entrega los eventos en el hilo principal, que los lee aquí entre fotograma y fotograma, y el
+    hilo de simulación muestrea en cada tick el estado de entrada que deja. Una tecla pulsada durante un
+    fotograma lento espera a que termine: como mucho lo que dura ese fotograma más un tick (ver
+    benchmarks.bench_pipeline). Se dibujan copias de los jugadores colocadas en la posición interpolada
+    entre los dos últimos ticks publicados.
+    """
+    global game_active
+
+    match.profiler = None  # El perfilador mide los fotogramas del hilo principal
+    puppets = []
+    for player in match.players:
+        puppet = copy.copy(player)
+        puppet.rect = player.rect.copy()
+        puppet.listener = None
+        puppets.append(puppet)
+
+    input_lock = threading.Lock()
+    simulation = SimulationThread(match, next_masks, input_lock, spectators.publish if spectators else None)
+    simulation.start()
+    try:
+        tick_seconds = match.tick_ms / 1000
+        drawn_tick = match.tick
+        clock = pygame.time.Clock()
+        while game_active:
+            profiler.begin_frame()
+            events = pygame.event.get()
+            if any(event.type == pygame.QUIT for event in events):
+                simulation.stop()
+                simulation.join()
+                quit_game(recorder, record_path, match_telemetry)
+            with input_lock:
+                for event in events:
+                    if not player_input.handle_event(event):
+                        profiler.handle_event(event)
+            profiler.lap("events")
+
+            clock.tick(60)
+            profiler.skip()
+
+            # Si el hilo ya terminó, este es el último fotograma publicado y se dibuja completo
+            finished = simulation.finished
+            snapshot = simulation.buffer.latest()
+            since = time.perf_counter() - snapshot.published
+            alpha = 1.0 if finished else min(max(since / tick_seconds, 0.0), 1.0)
+            for puppet, fighter in zip(puppets, interpolate(snapshot.previous, snapshot.fighters, alpha)):
+                puppet.rect.x, puppet.rect.y = fighter.x, fighter.y
+                puppet.facing_left = fighter.facing_left
+                puppet.current_animation = fighter.animation
+                puppet.current_frame = fighter.frame
+                puppet.health = fighter.health
+            profiler.lap("interpolate")
+            audio.flush()
+            profiler.lap("audio")
+            if particles is not None:
+                particles.update(snapshot.tick - drawn_tick)
+                profiler.lap("particles")
+            drawn_tick = snapshot.tick
+
+            # La partida termina cuando la simulación se detiene (ganador o fin de la repetición)
+            overlays = []
+            if snapshot.winner is not None:
+                overlays.append(winner_overlay(snapshot.winner, display.scale))
+            if finished:
+                game_active = False
+            if not game_active and recorder is not None:
+                recorder.save(record_path)
+
+            draw_frame(display, puppets, background, renderer, overlays, particles)
+    finally:
+        # El hilo no sobrevive al combate, se salga como se salga
+        simulation.stop()
+        simulation.join()
+
+
+def quit_game(recorder, record_path, match_telemetry=None):
+    """
+    Cerrar el juego desde el combate guardando la grabación en curso y, con telemetría,
+    el combate como no terminado (core.telemetry la escribe al salir).
+    """
+    if recorder is not None:
+        recorder.save(record_path)
+    if match_telemetry is not None:
+        match_telemetry.finish()
+    profiler.dump()
+    pygame.quit()
+    exit()
 
-        player2.update_state(keys)
-        player2.attack(keys)  # Detectar ataque
-        player2.jump(keys)
-        player2.move(keys, colliders)
-        player2.apply_gravity(colliders, diagonal_platforms)
 
-        # Manejar combate
-        handle_combat(player1, player2)
+def draw_frame(display, players, background, renderer, overlays, particles=None):
+    """
+    Dibujar un fotograma del combate (con el HUD del perfilador si está activo) y presentarlo en la ventana.
+    Las partículas se dibujan sobre los luchadores y bajo los textos.
+    """
+    screen = display.surface
+    hud = profiler.hud_overlay()
+    if hud is not None:
+        overlays.append(hud)
 
-        # Dibujar jugadores
-        player1.draw(screen)
-        player2.draw(screen)
+    if renderer is not None:
+        dirty = renderer.draw(screen, players, overlays, particles)
+        profiler.lap("draw")
+        display.present(dirty)
+        profiler.lap("flip")
+        return
 
-        # Dibujar colisionadores (depuración)
-        # render_colliders(screen, colliders, diagonal_platforms)
+    # Dibujar el fondo
+    screen.blit(background, (0, 0))
+    profiler.lap("background")
 
-        # Verificar si alguno de los jugadores ha sido derrotado
-        if player1.is_defeated():
-            game_active = False
-            draw_text(screen, "Player 2 Wins!", title_font, (0, 0, 255), 640, 360)
+    # Dibujar jugadores
+    for player in players:
+        player.render(screen, display.scale)
+    if particles is not None:
+        particles.draw(screen)
 
-        elif player2.is_defeated():
-            game_active = False
-            draw_text(screen, "Player 1 Wins!", title_font, (255, 0, 0), 640, 360)
+    # Los colisionadores (depuración) ya van dibujados en el fondo cuando el escenario tiene show_geometry
 
-        pygame.display.flip()
-        clock.tick(60)
+    for surface, rect in overlays:
+        screen.blit(surface, rect)
+    profiler.lap("draw")
+
+    display.present()
+    profiler.lap("flip")
+
+
+def winner_overlay(winner, scale=1):
+    """
+    Texto de fin de combate para el número de jugador ganador (0 si fue empate).
+    """
+    font, center_x, center_y = title_font.get(scale), round(640 * scale), round(360 * scale)
+    if winner == 0:
+        return text_overlay("Draw!", font, (255, 255, 255), center_x, center_y)
+    color = {1: (255, 0, 0), 2: (0, 0, 255)}.get(winner, (255, 255, 255))
+    return text_overlay(f"Player {winner} Wins!", font, color, center_x, center_y)
+
+
+def text_overlay(text, font, color, x, y):
+    """
+    Texto prerenderizado y su rectángulo centrado en (x, y).
+    """
+    text_surface = font.render(text, True, color)
+    return text_surface, text_surface.get_rect(center=(x, y))
 
 
 def draw_text(screen, text, font, color, x, y):
@@ -1,5 +1,8 @@
 import pygame
 import os
+from core.assets import ScaledFont
+from core.display import scale_rect, view_scale
+from views.retained import RetainedView
 
 # Setup colors and font
 WHITE = (255, 255, 255)
@@ -10,8 +13,8 @@ pygame.font.init()
 # Load font
 current_dir = os.path.dirname(__file__)
 font_path = os.path.join(current_dir, "../assets/fonts/Tiny5/Tiny5-Regular.ttf")
-instruction_font = pygame.font.Font(font_path, 36)
-title_font = pygame.font.Font(font_path, 50)
+instruction_font = ScaledFont(font_path, 36)
+title_font = ScaledFont(font_path, 50)
 
 
 def draw_text(surface, text, font, color, x, y):
@@ -23,31 +26,54 @@ def draw_text(surface, text, font, color, x, y):
     surface.blit(text_surface, text_rect)
 
 
-def render_instructions(screen):
+def build_instructions(surface, hit_map):
     """
-    Renders the instructions view.
+    Draws the static instructions view once and registers the "Back" button.
+    The layout is in 1280x720 coordinates, scaled to the size of `surface`.
     """
+    scale = view_scale(surface.get_size())
+    font = instruction_font.get(scale)
+
+    def text(line, text_font, x, y):
+        draw_text(surface, line, text_font, BLACK, x * scale, y * scale)
+
     # Fill the screen with a gray background
-    screen.fill(GRAY)
+    surface.fill(GRAY)
 
     # Draw the title
-    draw_text(screen, "Instrucciones", title_font, BLACK, 640, 100)
+    text("Instrucciones", title_font.get(scale), 640, 100)
 
     # Display instructions for player.py 1
-    draw_text(screen, "Jugador 1:", instruction_font, BLACK, 320, 200)
-    draw_text(screen, "- \u2191, \u2190, \u2193, \u2192: Moverse", instruction_font, BLACK, 320, 250)
-    draw_text(screen, "- O: Defenderse", instruction_font, BLACK, 320, 300)
-    draw_text(screen, "- P: Atacar", instruction_font, BLACK, 320, 350)
+    text("Jugador 1:", font, 320, 200)
+    text("- \u2191, \u2190, \u2193, \u2192: Moverse", font, 320, 250)
+    text("- O: Defenderse", font, 320, 300)
+    text("- P: Atacar", font, 320, 350)
 
     # Display instructions for player.py 2
-    draw_text(screen, "Jugador 2:", instruction_font, BLACK, 960, 200)
-    draw_text(screen, "- W, A, S, D: Moverse", instruction_font, BLACK, 960, 250)
-    draw_text(screen, "- G: Defenderse", instruction_font, BLACK, 960, 300)
-    draw_text(screen, "- H: Atacar", instruction_font, BLACK, 960, 350)
+    text("Jugador 2:", font, 960, 200)
+    text("- W, A, S, D: Moverse", font, 960, 250)
+    text("- G: Defenderse", font, 960, 300)
+    text("- H: Atacar", font, 960, 350)
 
     # Draw a "Back" button
-    back_button = pygame.Rect(540, 500, 200, 50)
-    pygame.draw.rect(screen, BLACK, back_button)
-    draw_text(screen, "Volver", instruction_font, WHITE, back_button.centerx, back_button.centery)
+    back_button = scale_rect((540, 500, 200, 50), scale)
+    pygame.draw.rect(surface, BLACK, back_button)
+    draw_text(surface, "Volver", font, WHITE, back_button.centerx, back_button.centery)
+    hit_map.add(back_button, "Volver")
+
 
-    return back_button
+instructions_view = RetainedView(build_instructions)
+
+
+def render_instructions(screen):
+    """
+    Renders the instructions view from its cached layer.
+    """
+    return instructions_view.render(screen)
+
+
+def instructions_button_at(screen, pos):
+    """
+    Action of the button under `pos` ("Volver"), or None.
+    """
+    return instructions_view.hit(screen.get_size(), pos)
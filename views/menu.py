@@ -1,5 +1,10 @@
 import pygame
 import os
+from core.assets import LazyAsset, ScaledFont, load_scaled_image
+from core.display import scale_rect, view_scale
+from core.levels import level_names, load_level
+from models.stage import DEFAULT_LEVEL
+from views.retained import RetainedView
 
 # Setup
 pygame.font.init()
@@ -7,17 +12,36 @@ pygame.font.init()
 # Load font and set paths
 current_dir = os.path.dirname(__file__)
 font_path = os.path.join(current_dir, "../assets/fonts/Tiny5/Tiny5-Regular.ttf")
-title_font = pygame.font.Font(font_path, 80)
-button_font = pygame.font.Font(font_path, 36)
+title_font = ScaledFont(font_path, 80)
+button_font = ScaledFont(font_path, 36)
+loading_font = ScaledFont(font_path, 28)
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GRAY = (200, 200, 200)
 
-# Load background image
+# Background image, loaded when the menu is first drawn at each resolution
 background_image_path = os.path.join(current_dir, "../assets/menu/background.png")
-background_image = pygame.image.load(background_image_path)
-background_image = pygame.transform.scale(background_image, (1280, 720))
+_background_images = {}  # tamaño -> LazyAsset
+
+
+def background_image(size):
+    """
+    LazyAsset with the menu background scaled to `size`.
+    """
+    image = _background_images.get(size)
+    if image is None:
+        image = _background_images[size] = LazyAsset(lambda: load_scaled_image(background_image_path, size))
+    return image
+
+# Escenarios disponibles (assets/levels) y el elegido con el botón "Escenario"
+stage_names = level_names()
+selected_stage = stage_names.index(DEFAULT_LEVEL)
+
+# Rivales del jugador 1 que se eligen con el botón "Rival": otro jugador o la CPU (bot de models.bots)
+OPPONENTS = (("Jugador 2", None), ("CPU fácil", "cpu-easy"), ("CPU normal", "cpu-normal"),
+             ("CPU difícil", "cpu-hard"))
+selected_opponent = 0
 
 
 def draw_text(surface, text, font, color, x, y):
@@ -29,14 +53,16 @@ def draw_text(surface, text, font, color, x, y):
     surface.blit(text_surface, text_rect)
 
 
-def create_button(x, y, width, height, text, font, bg_color, text_color):
+def create_button(x, y, width, height, text, font, bg_color, text_color, action=None):
     """
     Create a button dictionary with scalable size and position.
+    `action` is reported on click instead of the text, for buttons whose label changes.
     """
     button_rect = pygame.Rect(x, y, width, height)
     return {
         "rect": button_rect,
         "text": text,
+        "action": action or text,
         "font": font,
         "bg_color": bg_color,
         "text_color": text_color,
@@ -58,25 +84,106 @@ def render_button(surface, button):
     )
 
 
-def render_menu(screen):
+def build_menu(surface, hit_map):
     """
-    Renders the view with a background image, a title, and buttons.
+    Draw the static menu (background, title and buttons) once and register the buttons.
+    The layout is in 1280x720 coordinates, scaled to the size of `surface`.
     """
+    scale = view_scale(surface.get_size())
+    font = button_font.get(scale)
+
     # Draw the background image
-    screen.blit(background_image, (0, 0))
+    surface.blit(background_image(surface.get_size()).get(), (0, 0))
 
     # Draw the title
-    draw_text(screen, "SAMURAIS WARS", title_font, WHITE, 600, 140)  # Centered title
+    draw_text(surface, "SAMURAIS WARS", title_font.get(scale), WHITE, 600 * scale, 140 * scale)  # Centered title
 
     # Define buttons
     buttons = [
-        create_button(480, 300, 300, 70, "Jugar", button_font, GRAY, BLACK),
-        create_button(480, 400, 300, 70, "Cómo se juega", button_font, GRAY, BLACK),
-        create_button(480, 500, 300, 70, "Salir", button_font, GRAY, BLACK),
+        create_button(*scale_rect((480, 220, 300, 70), scale), "Jugar", font, GRAY, BLACK),
+        create_button(*scale_rect((400, 300, 460, 70), scale), f"Escenario: {selected_level().name}", font, GRAY,
+                      BLACK, action="Escenario"),
+        create_button(*scale_rect((400, 380, 460, 70), scale), f"Rival: {OPPONENTS[selected_opponent][0]}", font,
+                      GRAY, BLACK, action="Rival"),
+        create_button(*scale_rect((480, 460, 300, 70), scale), "Cómo se juega", font, GRAY, BLACK),
+        create_button(*scale_rect((480, 540, 300, 70), scale), "Salir", font, GRAY, BLACK),
     ]
 
     # Draw all buttons
     for button in buttons:
-        render_button(screen, button)
+        render_button(surface, button)
+        hit_map.add(button["rect"], button["action"])
+
+
+menu_view = RetainedView(build_menu)
+
+
+def render_menu(screen):
+    """
+    Renders the view with a background image, a title, and buttons from its cached layer.
+    """
+    return menu_view.render(screen)  # Return the hit map for interaction
+
+
+def menu_button_at(screen, pos):
+    """
+    Text of the menu button under `pos` (in pixels of `screen`, see Display.to_render), or None.
+    """
+    return menu_view.hit(screen.get_size(), pos)
+
+
+def selected_level():
+    """
+    The stage chosen in the menu, loaded from its compiled form.
+    """
+    return load_level(stage_names[selected_stage])
+
+
+def next_stage():
+    """
+    Cycle the stage button to the next level and return it.
+    """
+    global selected_stage
+    selected_stage = (selected_stage + 1) % len(stage_names)
+    menu_view.invalidate()
+    loading_view.invalidate()
+    return selected_level()
+
+
+def opponent_bot():
+    """
+    Bot chosen as the rival of player 1, or None when player 2 is a human.
+    """
+    return OPPONENTS[selected_opponent][1]
+
+
+def next_opponent():
+    """
+    Cycle the rival button to the next option and return its bot (None for a second human).
+    """
+    global selected_opponent
+    selected_opponent = (selected_opponent + 1) % len(OPPONENTS)
+    menu_view.invalidate()
+    loading_view.invalidate()
+    return opponent_bot()
+
+
+def build_loading(surface, hit_map):
+    """
+    Draw the menu with a "loading" notice over the play button.
+    """
+    build_menu(surface, hit_map)
+    scale = view_scale(surface.get_size())
+    box = scale_rect((430, 625, 420, 50), scale)
+    pygame.draw.rect(surface, BLACK, box)
+    draw_text(surface, "Cargando...", loading_font.get(scale), WHITE, box.centerx, box.centery)
 
-    return buttons  # Return the buttons for interaction
+
+loading_view = RetainedView(build_loading)
+
+
+def render_loading(screen):
+    """
+    Renders the menu with the loading indicator, shown while the fight assets finish loading.
+    """
+    return loading_view.render(screen)
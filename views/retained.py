@@ -0,0 +1,66 @@
+import pygame
+
+
+class ButtonHitMap:
+    def __init__(self):
+        """
+        Hit-test structure for the clickable areas of a view, independent from drawing.
+        """
+        self.targets = []  # (rect, acción)
+
+    def add(self, rect, action):
+        self.targets.append((pygame.Rect(rect), action))
+
+    def hit(self, pos):
+        """
+        Return the action under `pos`, or None.
+        """
+        for rect, action in self.targets:
+            if rect.collidepoint(pos):
+                return action
+        return None
+
+
+class RetainedView:
+    def __init__(self, build):
+        """
+        Static view prerendered into one cached surface per resolution.
+        `build(surface, hit_map)` draws the static content once and registers its buttons.
+        """
+        self._build = build
+        self._layers = {}  # tamaño -> (superficie, hit_map)
+
+    def layer(self, size):
+        """
+        Cached surface and hit map for a resolution, built on first use.
+        """
+        layer = self._layers.get(size)
+        if layer is None:
+            surface = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            hit_map = ButtonHitMap()
+            self._build(surface, hit_map)
+            layer = (surface, hit_map)
+            self._layers[size] = layer
+        return layer
+
+    def render(self, screen):
+        """
+        Draw the whole view with a single blit.
+        """
+        surface, hit_map = self.layer(screen.get_size())
+        screen.blit(surface, (0, 0))
+        return hit_map
+
+    def hit(self, size, pos):
+        """
+        Action of the button under `pos` without rendering anything.
+        """
+        return self.layer(size)[1].hit(pos)
+
+    def invalidate(self):
+        """
+        Drop every cached layer, e.g. after changing fonts or texts.
+        """
+        self._layers.clear()